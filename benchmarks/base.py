@@ -0,0 +1,68 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Each script is run from the root of the project, e.g.
+
+    > python -m benchmarks.bench_fast_serializers
+
+and works on a throwaway test database so `db.sqlite3` is never touched.
+"""
+import os
+import statistics
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'catDB.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (setup_test_environment,  # noqa: E402
+                               teardown_test_environment)
+
+
+class BenchmarkDatabase:
+    """
+    Context manager creating (and destroying) a test database.
+    """
+
+    def __enter__(self):
+        setup_test_environment()
+        self.old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0)
+        return connection
+
+    def __exit__(self, *exc_info):
+        connection.creation.destroy_test_db(self.old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat=5, number=1):
+    """
+    Run `func` `number` times per round for `repeat` rounds and return the
+    per call timings (in seconds) of each round.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def report(title, timings):
+    print("%-40s median %9.3f ms  min %9.3f ms" % (
+        title,
+        statistics.median(timings) * 1000,
+        min(timings) * 1000,
+    ))
+
+
+def percentile(values, p):
+    """
+    Return the `p`-th percentile (nearest rank) of `values`.
+    """
+    values = sorted(values)
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
@@ -0,0 +1,351 @@
+"""
+Load benchmark of the endpoints.
+
+For each dataset size (number of cats), a database is seeded with
+`catapp.seeding.Seeder` and every route of the API router (list, detail,
+filter, search, export, create, update, delete), the HTML views and
+`api-token-auth` are requested in process. The throughput, the p50 / p99
+latency and the number of queries of each scenario are written to a
+JSON report, which can be compared against a stored baseline:
+
+    > python -m benchmarks.bench_endpoints --output report.json
+    > python -m benchmarks.bench_endpoints --baseline report.json
+
+The HTML views call the API over HTTP with `requests`; here those calls
+are routed to the same in-process client.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sqlite3
+import sys
+import time
+from unittest import mock
+from urllib.parse import urlsplit
+
+from benchmarks.base import BenchmarkDatabase, percentile
+
+import django  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from catapp.models import Breed, Cat, Home, Human  # noqa: E402
+from catapp.seeding import Seeder  # noqa: E402
+
+SIZES = [1000, 10000]
+NUM_OF_REQUESTS = 50
+# Relative increase of the p50 latency reported as a regression
+THRESHOLD = 0.2
+
+USERNAME = 'benchmark'
+PASSWORD = 'benchmark-password'
+
+MODELS = {
+    'home': Home,
+    'breed': Breed,
+    'human': Human,
+    'cat': Cat,
+}
+
+
+def get_counts(size):
+    """
+    Return the number of rows of each model for `size` cats.
+    """
+    return {
+        'homes': max(1, size // 100),
+        'breeds': max(5, min(1000, size // 200)),
+        'humans': max(1, size // 10),
+        'cats': size,
+    }
+
+
+class InProcessRequests:
+    """
+    Stand-in of the `requests` module used by `catapp.views`, sending the
+    requests to the Django test client with the token of the benchmark.
+    """
+
+    def __init__(self, client, authorization):
+        self.client = client
+        self.authorization = authorization
+
+    def get(self, url, headers=None, **kwargs):
+        return self.client.get(
+            urlsplit(url).path, follow=True,
+            HTTP_AUTHORIZATION=self.authorization
+        )
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        return self.client.post(
+            urlsplit(url).path, data,
+            HTTP_AUTHORIZATION=self.authorization
+        )
+
+
+class Benchmark:
+    """
+    Scenarios of one seeded database.
+    """
+
+    def __init__(self, num_of_requests, seed=0):
+        self.num_of_requests = num_of_requests
+        self.rnd = random.Random(seed)
+        user = User.objects.create_user(USERNAME, password=PASSWORD)
+        self.authorization = 'Token %s' % Token.objects.create(user=user).key
+        self.client = Client(HTTP_AUTHORIZATION=self.authorization)
+        self.ids = {
+            name: list(model.objects.values_list('id', flat=True))
+            for name, model in MODELS.items()
+        }
+
+    def url(self, view_name, **kwargs):
+        return reverse('catapp:' + view_name, kwargs=kwargs or None)
+
+    def pick(self, name):
+        return self.rnd.choice(self.ids[name])
+
+    def run(self, name, request, expected_status):
+        """
+        Send `request(i)` `num_of_requests` times (after one request not
+        measured) and return the statistics of the scenario.
+        """
+        timings, queries = [], []
+        request(-1)
+        for i in range(self.num_of_requests):
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = request(i)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                timings.append(time.perf_counter() - start)
+            queries.append(len(context.captured_queries))
+            if response.status_code != expected_status:
+                raise AssertionError("%s: status %d instead of %d" % (
+                    name, response.status_code, expected_status
+                ))
+        total = sum(timings)
+        return {
+            'requests': len(timings),
+            'throughput': len(timings) / total if total else 0,
+            'p50_ms': percentile(timings, 50) * 1000,
+            'p99_ms': percentile(timings, 99) * 1000,
+            'queries': sum(queries) / len(queries),
+            'max_queries': max(queries),
+        }
+
+    def get_payloads(self):
+        """
+        Return a function building the data of a new object, per model.
+        """
+        breed = self.url('breed-detail', pk=self.pick('breed'))
+        owner = self.url('human-detail', pk=self.pick('human'))
+        home = self.url('home-detail', pk=self.pick('home'))
+        return {
+            'home': lambda i: {'name': 'Home %d' % i,
+                               'address': '1 Benchmark Street',
+                               'hometype': 'landed'},
+            'breed': lambda i: {'name': 'Benchmark %d' % i,
+                                'origin': 'Benchmark'},
+            'human': lambda i: {'name': 'Human %d' % i, 'gender': 'F',
+                                'date_of_birth': '1990-01-01',
+                                'home': home},
+            'cat': lambda i: {'name': 'Cat %d' % i, 'gender': 'F',
+                              'date_of_birth': '2015-01-01',
+                              'breed': breed, 'owner': owner},
+        }
+
+    def get_filters(self):
+        names = list(Breed.objects.values_list('name', flat=True))
+        return {
+            'home': lambda: {'hometype': 'landed'},
+            'breed': lambda: {
+                'name__startswith': self.rnd.choice(names)[:2]
+            },
+            'human': lambda: {'gender': 'F', 'home': self.pick('home')},
+            'cat': lambda: {'gender': 'F', 'breed': self.pick('breed')},
+        }
+
+    def iter_results(self):
+        """
+        Yield the name and the statistics of every scenario.
+        """
+        client = self.client
+        get = client.get
+        yield 'api-root', self.run(
+            'api-root', lambda i: get(self.url('api-root')), 200
+        )
+
+        payloads = self.get_payloads()
+        filters = self.get_filters()
+        for name, model in MODELS.items():
+            list_url = self.url(name + '-list')
+            scenarios = [
+                ('list', lambda i: get(list_url), 200),
+                ('list-last-page', lambda i: get(list_url, {
+                    'page': max(1, -(-len(self.ids[name]) // 10))
+                }), 200),
+                ('detail', lambda i: get(self.url(
+                    name + '-detail', pk=self.pick(name))), 200),
+                ('filter', lambda i: get(list_url, filters[name]()), 200),
+                ('search', lambda i: get(list_url, {
+                    'search': self.rnd.choice('aeiou')
+                }), 200),
+                ('export', lambda i: get(self.url(name + '-export'), {
+                    'format': 'csv'
+                }), 200),
+            ]
+            for scenario, request, expected_status in scenarios:
+                scenario = '%s-%s' % (name, scenario)
+                yield scenario, self.run(scenario, request, expected_status)
+
+            last_id = max(self.ids[name], default=0)
+            yield name + '-create', self.run(
+                name + '-create',
+                lambda i: client.post(list_url, payloads[name](i),
+                                      content_type='application/json'),
+                201
+            )
+            created = list(model.objects.filter(
+                pk__gt=last_id).values_list('pk', flat=True))
+            yield name + '-update', self.run(
+                name + '-update',
+                lambda i: client.patch(
+                    self.url(name + '-detail', pk=created[i]),
+                    {'name': 'Updated %d' % i},
+                    content_type='application/json'
+                ),
+                200
+            )
+            yield name + '-delete', self.run(
+                name + '-delete',
+                lambda i: client.delete(
+                    self.url(name + '-detail', pk=created[i])
+                ),
+                204
+            )
+
+        yield 'export-jobs-list', self.run(
+            'export-jobs-list', lambda i: get(self.url('exportjob-list')), 200
+        )
+
+        views = InProcessRequests(Client(), self.authorization)
+        html_client = Client()
+
+        def get_html(url):
+            # The views print their context
+            with mock.patch('catapp.views.requests', views), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                return html_client.get(url)
+
+        for name in ('index', 'homes', 'breeds', 'humans', 'cats'):
+            url = self.url(name)
+            yield 'html-' + name, self.run(
+                'html-' + name, lambda i: get_html(url), 200
+            )
+
+        token_url = self.url('index') + 'api-token-auth/'
+        yield 'api-token-auth', self.run(
+            'api-token-auth',
+            lambda i: Client().post(token_url, {
+                'username': USERNAME, 'password': PASSWORD
+            }),
+            200
+        )
+
+
+def get_metadata(args):
+    return {
+        'created': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'sizes': args.sizes,
+        'requests': args.requests,
+        'seed': args.seed,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the scenarios of `results` next to those of `baseline` and
+    return the number of regressions: a p50 latency higher by more than
+    `threshold`, or more queries.
+    """
+    regressions = 0
+    for size, scenarios in results.items():
+        for name, stats in scenarios.items():
+            old = baseline.get(size, {}).get(name)
+            if old is None:
+                continue
+            change = stats['p50_ms'] / old['p50_ms'] - 1 \
+                if old['p50_ms'] else 0
+            regressed = change > threshold \
+                or stats['max_queries'] > old['max_queries']
+            regressions += regressed
+            print("%8s %-24s p50 %8.2f -> %8.2f ms (%+5.0f%%)  "
+                  "queries %4d -> %4d%s" % (
+                      size, name, old['p50_ms'], stats['p50_ms'],
+                      change * 100, old['max_queries'], stats['max_queries'],
+                      "  REGRESSION" if regressed else ""
+                  ))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help="Numbers of cats of the datasets.")
+    parser.add_argument('--requests', type=int, default=NUM_OF_REQUESTS,
+                        help="Requests per scenario.")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Seed of the datasets and of the requests.")
+    parser.add_argument('--output', help="Path of the JSON report.")
+    parser.add_argument('--baseline',
+                        help="JSON report to compare the results against.")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="Relative p50 increase seen as a regression.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = {}
+    for size in args.sizes:
+        scenarios = results[str(size)] = {}
+        with BenchmarkDatabase():
+            Seeder(seed=args.seed).run(**get_counts(size))
+            benchmark = Benchmark(args.requests, seed=args.seed)
+            for name, stats in benchmark.iter_results():
+                scenarios[name] = stats
+                print("%8d %-24s %8.1f req/s  p50 %8.2f ms  p99 %8.2f ms  "
+                      "%6.1f queries" % (
+                          size, name, stats['throughput'], stats['p50_ms'],
+                          stats['p99_ms'], stats['queries']
+                      ))
+
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            json.dump({'metadata': get_metadata(args), 'results': results},
+                      report_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        print("%d regressions" % regressions)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the list serializers against the read-only fast path.
+
+    > python -m benchmarks.bench_fast_serializers
+"""
+from benchmarks.base import BenchmarkDatabase, measure, report
+
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from catapp.factories import (BreedFactory, CatFactory,  # noqa: E402
+                              HomeFactory, HumanFactory)
+from catapp.fast_serializers import (BreedFastSerializer,  # noqa: E402
+                                     CatFastSerializer, HomeFastSerializer,
+                                     HumanFastSerializer)
+from catapp.models import Breed, Cat, Home, Human  # noqa: E402
+from catapp.serializers import (BreedSerializer, CatSerializer,  # noqa: E402
+                                HomeSerializer, HumanSerializer)
+
+NUM_OF_HOMES = 100
+NUM_OF_HUMANS = 300
+NUM_OF_BREEDS = 20
+NUM_OF_CATS = 1000
+
+CASES = [
+    (Home, HomeSerializer, HomeFastSerializer),
+    (Breed, BreedSerializer, BreedFastSerializer),
+    (Human, HumanSerializer, HumanFastSerializer),
+    (Cat, CatSerializer, CatFastSerializer),
+]
+
+
+def populate():
+    homes = HomeFactory.create_batch(NUM_OF_HOMES)
+    humans = [
+        HumanFactory.create(home=homes[i % NUM_OF_HOMES])
+        for i in range(NUM_OF_HUMANS)
+    ]
+    breeds = BreedFactory.create_batch(NUM_OF_BREEDS)
+    for i in range(NUM_OF_CATS):
+        CatFactory.create(breed=breeds[i % NUM_OF_BREEDS],
+                          owner=humans[i % NUM_OF_HUMANS])
+
+
+def main():
+    context = {'request': APIRequestFactory().get('/')}
+    with BenchmarkDatabase():
+        populate()
+        for model, serializer_class, fast_class in CASES:
+            queryset = model.objects.all()
+
+            def run_serializer():
+                return serializer_class(
+                    queryset.all(), many=True, context=context
+                ).data
+
+            def run_fast():
+                fast = fast_class(context=context)
+                return fast.to_representation(fast.get_rows(queryset.all()))
+
+            slow = measure(run_serializer)
+            fast = measure(run_fast)
+            report(serializer_class.__name__, slow)
+            report(fast_class.__name__, fast)
+            print("%-40s x%.1f" % (
+                "speedup", min(slow) / min(fast)
+            ))
+
+
+if __name__ == '__main__':
+    main()
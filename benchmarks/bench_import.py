@@ -0,0 +1,60 @@
+"""
+Measure the throughput of the cat import for several numbers of worker
+processes.
+
+    > python -m benchmarks.bench_import [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.base import BenchmarkDatabase
+
+from catapp.importers import CatImporter  # noqa: E402
+from catapp.models import Breed, Cat, Home, Human  # noqa: E402
+
+NUM_OF_ROWS = 200000
+WORKERS = [1, 2, 4, 8]
+
+
+def write_cats_file(path, num_of_rows, owner_ids):
+    with open(path, 'w') as cats_file:
+        cats_file.write("name,gender,date_of_birth,description,breed,owner\n")
+        for i in range(num_of_rows):
+            cats_file.write("Cat %d,%s,2015-01-%02d,Some description,"
+                            "Breed %d,%d\n" % (
+                                i, 'MFO'[i % 3], i % 28 + 1, i % 20,
+                                owner_ids[i % len(owner_ids)]
+                            ))
+
+
+def main():
+    num_of_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_OF_ROWS
+    with BenchmarkDatabase(), tempfile.TemporaryDirectory() as tmp_dir:
+        home = Home.objects.create(name="Home", address="Street",
+                                   hometype='landed')
+        owner_ids = [
+            Human.objects.create(name="Human %d" % i, home=home,
+                                 date_of_birth='1990-01-01').pk
+            for i in range(100)
+        ]
+        for i in range(20):
+            Breed.objects.create(name="Breed %d" % i, origin="Origin")
+
+        path = os.path.join(tmp_dir, 'cats.csv')
+        write_cats_file(path, num_of_rows, owner_ids)
+
+        for workers in WORKERS:
+            Cat.objects.all().delete()
+            start = time.perf_counter()
+            result = CatImporter(workers=workers).run(path)
+            elapsed = time.perf_counter() - start
+            assert result.num_of_created == num_of_rows
+            print("%2d workers: %8.0f rows/s  (%.1fs)" % (
+                workers, num_of_rows / elapsed, elapsed
+            ))
+
+
+if __name__ == '__main__':
+    main()
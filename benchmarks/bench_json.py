@@ -0,0 +1,56 @@
+"""
+Compare the stdlib JSON renderer and parser of DRF against the ones of
+`catapp.renderers` and `catapp.parsers`.
+
+    > python -m benchmarks.bench_json
+"""
+import io
+
+from benchmarks.base import BenchmarkDatabase, measure, report
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from catapp.factories import (BreedFactory, CatFactory,  # noqa: E402
+                              HumanFactory)
+from catapp.fast_serializers import CatFastSerializer  # noqa: E402
+from catapp.models import Cat  # noqa: E402
+from catapp.parsers import FastJSONParser  # noqa: E402
+from catapp.renderers import FastJSONRenderer  # noqa: E402
+
+NUM_OF_CATS = 2000
+
+
+def populate():
+    breeds = BreedFactory.create_batch(20)
+    owners = HumanFactory.create_batch(100)
+    for i in range(NUM_OF_CATS):
+        CatFactory.create(breed=breeds[i % 20], owner=owners[i % 100])
+
+
+def main():
+    context = {'request': APIRequestFactory().get('/')}
+    with BenchmarkDatabase():
+        populate()
+        fast = CatFastSerializer(context=context)
+        data = fast.to_representation(fast.get_rows(Cat.objects.all()))
+
+    content = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == content
+    print("%d cats, %d bytes" % (len(data), len(content)))
+
+    for renderer in (JSONRenderer(), FastJSONRenderer()):
+        report("render %s" % type(renderer).__name__,
+               measure(lambda: renderer.render(data), repeat=20))
+
+    parser_context = {'encoding': 'utf-8'}
+    for parser in (JSONParser(), FastJSONParser()):
+        report("parse %s" % type(parser).__name__,
+               measure(lambda: parser.parse(io.BytesIO(content),
+                                            parser_context=parser_context),
+                       repeat=20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare the payload size and the encode/decode time of cat lists rendered
+in JSON and in MessagePack.
+
+    > python -m benchmarks.bench_msgpack
+"""
+import io
+
+from benchmarks.base import BenchmarkDatabase, measure, report
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from catapp.factories import (BreedFactory, CatFactory,  # noqa: E402
+                              HumanFactory)
+from catapp.fast_serializers import CatFastSerializer  # noqa: E402
+from catapp.models import Cat  # noqa: E402
+from catapp.parsers import FastJSONParser, MessagePackParser  # noqa: E402
+from catapp.renderers import (FastJSONRenderer,  # noqa: E402
+                              MessagePackRenderer)
+
+SIZES = [10, 100, 1000]
+
+
+def main():
+    context = {'request': APIRequestFactory().get('/')}
+    with BenchmarkDatabase():
+        breeds = BreedFactory.create_batch(20)
+        owners = HumanFactory.create_batch(100)
+        for i in range(max(SIZES)):
+            CatFactory.create(breed=breeds[i % 20], owner=owners[i % 100])
+        fast = CatFastSerializer(context=context)
+        cats = fast.to_representation(fast.get_rows(Cat.objects.all()))
+
+    cases = [
+        (JSONRenderer(), None),
+        (FastJSONRenderer(), FastJSONParser()),
+        (MessagePackRenderer(), MessagePackParser()),
+    ]
+    for size in SIZES:
+        data = cats[:size]
+        print("--- %d cats" % size)
+        for renderer, parser in cases:
+            name = type(renderer).__name__
+            content = renderer.render(data)
+            print("%-40s %9d bytes" % (name, len(content)))
+            report("encode %s" % name,
+                   measure(lambda: renderer.render(data), repeat=20))
+            if parser is not None:
+                report("decode %s" % name,
+                       measure(lambda: parser.parse(
+                           io.BytesIO(content),
+                           parser_context={'encoding': 'utf-8'}
+                       ), repeat=20))
+
+
+if __name__ == '__main__':
+    main()
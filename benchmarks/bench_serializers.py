@@ -0,0 +1,167 @@
+"""
+Micro-benchmarks of the serializers with `many=True`, for several numbers
+of rows and split by type of field (identity URL, related URL, method
+field, plain fields).
+
+The instances are built in memory, with their relations cached as if
+selected or prefetched, so only the cost of the serialization is
+measured; a benchmark making a query fails. With pyperf installed the
+benchmarks are run by a `pyperf.Runner` (which takes its usual options,
+e.g. `-o result.json` and `--fast`), otherwise by `measure`:
+
+    > python -m benchmarks.bench_serializers
+"""
+import datetime
+
+from benchmarks.base import measure, report
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (CaptureQueriesContext,  # noqa: E402
+                               setup_test_environment)
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from catapp.models import Breed, Cat, Home, Human  # noqa: E402
+from catapp.serializers import (BreedSerializer, CatSerializer,  # noqa: E402
+                                HomeSerializer, HumanSerializer)
+
+try:
+    import pyperf
+except ImportError:
+    pyperf = None
+
+SIZES = [10, 100, 10000]
+
+# Fields of each serializer per type of field
+FIELD_TYPES = {
+    HomeSerializer: {
+        'identity': ['url'],
+        'plain': ['name', 'address', 'hometype'],
+    },
+    BreedSerializer: {
+        'identity': ['url'],
+        'related': ['cats'],
+        'method': ['homes'],
+        'plain': ['name', 'origin', 'description'],
+    },
+    HumanSerializer: {
+        'identity': ['url'],
+        'related': ['home', 'cats'],
+        'plain': ['name', 'gender', 'date_of_birth', 'description'],
+    },
+    CatSerializer: {
+        'identity': ['url'],
+        'related': ['breed', 'owner'],
+        'method': ['home'],
+        'plain': ['name', 'gender', 'date_of_birth', 'description'],
+    },
+}
+
+
+def set_prefetched(obj, name, objs):
+    """
+    Cache `objs` as the prefetched objects of the relation `name` of `obj`.
+    """
+    queryset = getattr(obj, name).all()
+    queryset._result_cache = list(objs)
+    queryset._prefetch_done = True
+    obj._prefetched_objects_cache = {name: queryset}
+
+
+def build_fixtures(size):
+    """
+    Return `size` homes, breeds, humans and cats built in memory. Each
+    breed has 3 cats and each human 2 cats, owned by humans of 5 homes.
+    """
+    today = datetime.date(2020, 1, 1)
+    homes = [
+        Home(id=i, name="Home %d" % i, address="%d Cat Street" % i,
+             hometype='landed')
+        for i in range(1, size + 1)
+    ]
+    breeds = [
+        Breed(id=i, name="Breed %d" % i, origin="Origin",
+              description="Description of the breed")
+        for i in range(1, size + 1)
+    ]
+    humans = [
+        Human(id=i, name="Human %d" % i, gender='F', date_of_birth=today,
+              description="Description of the human",
+              home=homes[i % min(5, size)])
+        for i in range(1, size + 1)
+    ]
+    cats = [
+        Cat(id=i, name="Cat %d" % i, gender='M', date_of_birth=today,
+            description="Description of the cat",
+            breed=breeds[i % size], owner=humans[i % size])
+        for i in range(1, size * 6 + 1)
+    ]
+    for name, objs in (('breed', breeds), ('owner', humans)):
+        related_cats = {obj.id: [] for obj in objs}
+        for cat in cats:
+            related_cats[getattr(cat, name + '_id')].append(cat)
+        for obj in objs:
+            set_prefetched(obj, 'cats', related_cats[obj.id])
+    return {
+        HomeSerializer: homes,
+        BreedSerializer: breeds,
+        HumanSerializer: humans,
+        CatSerializer: cats[:size],
+    }
+
+
+def get_benchmark(serializer_class, instances, field_names, context):
+    def serialize():
+        serializer = serializer_class(instances, many=True, context=context)
+        if field_names is not None:
+            fields = serializer.child.fields
+            for name in list(fields):
+                if name not in field_names:
+                    del fields[name]
+        return serializer.data
+    return serialize
+
+
+def iter_benchmarks():
+    context = {'request': APIRequestFactory().get('/')}
+    for size in SIZES:
+        fixtures = build_fixtures(size)
+        for serializer_class, field_types in FIELD_TYPES.items():
+            cases = [('all', None)] + list(field_types.items())
+            for field_type, field_names in cases:
+                name = '%s[%d] %s' % (
+                    serializer_class.__name__, size, field_type
+                )
+                yield name, size, get_benchmark(
+                    serializer_class, fixtures[serializer_class],
+                    field_names, context
+                )
+
+
+def check_no_query(name, func):
+    with CaptureQueriesContext(connection) as context:
+        func()
+    if context.captured_queries:
+        raise AssertionError("%s makes %d queries" % (
+            name, len(context.captured_queries)
+        ))
+
+
+def main():
+    # Allows the host of the request factory
+    setup_test_environment()
+    if pyperf is not None:
+        runner = pyperf.Runner()
+        args = runner.parse_args()
+        for name, size, func in iter_benchmarks():
+            if not args.worker:
+                check_no_query(name, func)
+            runner.bench_func(name, func)
+        return
+
+    for name, size, func in iter_benchmarks():
+        check_no_query(name, func)
+        report(name, measure(func, repeat=5, number=max(1, 1000 // size)))
+
+
+if __name__ == '__main__':
+    main()
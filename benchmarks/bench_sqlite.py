@@ -0,0 +1,150 @@
+"""
+Concurrent read / write benchmark of the SQLite connection profiles.
+
+A file database (the pragmas have no effect on the in-memory test
+database) is seeded, then reader threads list pages of cats while writer
+threads create cats, for a fixed duration. This is run with the SQLite
+defaults (rollback journal, no pragmas), with the `SQLITE_PRAGMAS` of the
+settings, and with those pragmas and the writes run by the writer thread
+of `catapp.writequeue`, reporting the reads and writes per second, the
+p99 latencies and the number of "database is locked" errors:
+
+    > python -m benchmarks.bench_sqlite --readers 4 --writers 2
+"""
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.base import BenchmarkDatabase, percentile
+
+from django.conf import settings  # noqa: E402
+from django.db import OperationalError, connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from catapp import writequeue  # noqa: E402
+from catapp.models import Breed, Cat, Human  # noqa: E402
+from catapp.seeding import Seeder  # noqa: E402
+
+# Pragmas of each profile and whether its writes are queued
+PROFILES = {
+    'default': ({'journal_mode': 'delete'}, False),
+    'tuned': (settings.SQLITE_PRAGMAS, False),
+    'queued': (settings.SQLITE_PRAGMAS, True),
+}
+
+
+class Worker(threading.Thread):
+
+    def __init__(self, operation, deadline, seed):
+        super().__init__()
+        self.operation = operation
+        self.deadline = deadline
+        self.rnd = random.Random(seed)
+        self.latencies = []
+        self.errors = 0
+
+    def run(self):
+        try:
+            while time.perf_counter() < self.deadline:
+                start = time.perf_counter()
+                try:
+                    self.operation(self.rnd)
+                except OperationalError:
+                    self.errors += 1
+                else:
+                    self.latencies.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+
+
+def get_operations():
+    breed_ids = list(Breed.objects.values_list('id', flat=True))
+    owner_ids = list(Human.objects.values_list('id', flat=True))
+    today = datetime.date.today()
+
+    def read(rnd):
+        queryset = Cat.objects.filter(breed=rnd.choice(breed_ids))
+        list(queryset.select_related('breed', 'owner')[:10])
+        queryset.count()
+
+    def write(rnd):
+        kwargs = {
+            'name': "Cat %d" % rnd.getrandbits(32), 'gender': 'F',
+            'date_of_birth': today, 'description': "Written by the benchmark",
+            'breed_id': rnd.choice(breed_ids),
+            'owner_id': rnd.choice(owner_ids),
+        }
+        writequeue.execute(lambda: Cat.objects.create(**kwargs))
+    return read, write
+
+
+def run_profile(pragmas, queued, args):
+    with tempfile.TemporaryDirectory() as directory:
+        connection.settings_dict['TEST']['NAME'] = os.path.join(
+            directory, 'bench.sqlite3'
+        )
+        with override_settings(
+            SQLITE_PRAGMAS=pragmas, WRITE_QUEUE_ENABLED=queued,
+            WRITE_QUEUE_LOCK_FILE=os.path.join(directory, 'bench.lock'),
+        ), BenchmarkDatabase():
+            # Open a connection with the pragmas of the profile
+            connection.close()
+            Seeder(seed=args.seed).run(
+                homes=100, breeds=50, humans=1000, cats=args.cats
+            )
+            read, write = get_operations()
+            deadline = time.perf_counter() + args.duration
+            readers = [Worker(read, deadline, args.seed + i)
+                       for i in range(args.readers)]
+            writers = [Worker(write, deadline, args.seed + args.readers + i)
+                       for i in range(args.writers)]
+            for worker in readers + writers:
+                worker.start()
+            for worker in readers + writers:
+                worker.join()
+            writequeue.shutdown()
+            connection.close()
+    return {
+        'reads': summarize(readers, args.duration),
+        'writes': summarize(writers, args.duration),
+    }
+
+
+def summarize(workers, duration):
+    latencies = [value for worker in workers for value in worker.latencies]
+    return {
+        'per_second': len(latencies) / duration,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+        'errors': sum(worker.errors for worker in workers),
+    }
+
+
+def print_results(name, results):
+    for kind, result in results.items():
+        p99 = result['p99_ms']
+        print("%-8s %-6s %9.1f /s  p99 %9s ms  %d locked" % (
+            name, kind, result['per_second'],
+            '-' if p99 is None else '%.2f' % p99, result['errors'],
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0,
+                        help="Seconds of load per profile")
+    parser.add_argument('--cats', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for name, (pragmas, queued) in PROFILES.items():
+        print_results(name, run_profile(pragmas, queued, args))
+
+
+if __name__ == '__main__':
+    main()
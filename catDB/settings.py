@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -130,14 +131,139 @@ REST_FRAMEWORK = {
         # Customized Expiring Token Authentication
         'catapp.authentication.ExpiringTokenAuthentication',
     ],
+    # JSON renderer and parser backed by orjson when it is installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'catapp.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'catapp.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
+        # DjangoFilterBackend rejecting the unsupported filters
+        'catapp.filters.FilterBackend',
+        # Full-text search backed by SQLite FTS5
+        'catapp.search.FTSSearchFilter',
     ],
 }
 
 
 # Used for token authentication for catapp
 AUTH_TOKEN_EXPIRING_HOURS = 24
+
+# Number of rows serialized at a time by the streaming list responses
+STREAM_CHUNK_SIZE = 500
+
+# Number of rows in each record batch of the columnar snapshots
+SNAPSHOT_BATCH_SIZE = 10000
+
+# Background export jobs, written by a pool of threads into EXPORT_JOB_ROOT
+EXPORT_JOB_WORKERS = 2
+EXPORT_JOB_ROOT = BASE_DIR / 'exports'
+# Finished export jobs (with their files) are deleted after this many hours
+EXPORT_JOB_EXPIRING_HOURS = 24
+
+# Bulk imports: rows validated and inserted at a time, rows committed at a
+# time and number of processes parsing and validating the rows
+IMPORT_BATCH_SIZE = 5000
+IMPORT_TRANSACTION_SIZE = 50000
+IMPORT_WORKERS = os.cpu_count() or 1
+
+# Default number of names listed by the autocomplete endpoints, and
+# seconds after which the names loaded by a process are loaded again (to
+# see the writes of the other processes), 0 to keep them
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_RELOAD_SECONDS = 300
+
+# Pragmas run on every new SQLite connection: write-ahead logging so the
+# readers do not block on the writer, fewer fsyncs (still safe with WAL),
+# 256 MiB of memory-mapped I/O, 64 MiB of page cache, temporary tables in
+# memory and waiting up to 5 seconds for a lock instead of failing
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+    'busy_timeout': 5000,
+}
+
+# The sample database committed with the project keeps its rollback
+# journal, WAL being a change of the file that git would report: a
+# `PRAGMAS` value of None skips the pragma for one database. The default
+# database can be moved to another file, in WAL, with CATDB_DATABASE
+if os.environ.get('CATDB_DATABASE'):
+    DATABASES['default']['NAME'] = os.environ['CATDB_DATABASE']
+else:
+    DATABASES['default']['PRAGMAS'] = {'journal_mode': None}
+
+# Optional single writer: the writes of the API are run by one thread of
+# each process, up to WRITE_QUEUE_BATCH_SIZE writes per commit, under a
+# lock on WRITE_QUEUE_LOCK_FILE shared by the processes
+WRITE_QUEUE_ENABLED = False
+WRITE_QUEUE_BATCH_SIZE = 50
+WRITE_QUEUE_LOCK_FILE = BASE_DIR / 'db.sqlite3.lock'
+
+# Writes of the API failing with "database is locked" are run again up to
+# WRITE_RETRIES times, after a random delay of up to WRITE_RETRY_DELAY
+# seconds doubled at each retry (and at most WRITE_RETRY_MAX_DELAY)
+WRITE_RETRIES = 3
+WRITE_RETRY_DELAY = 0.05
+WRITE_RETRY_MAX_DELAY = 1.0
+
+# Hours during which a write sent with an Idempotency-Key is replayed
+IDEMPOTENCY_KEY_EXPIRING_HOURS = 24
+
+# Read replicas: CATDB_REPLICAS is a comma separated list of SQLite files
+# kept in sync with the default database by `manage.py sync_replicas`.
+# The safe requests read the catalogue from a random replica, except for
+# REPLICA_PIN_SECONDS after a write of the same client
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+        filter(None, os.environ.get('CATDB_REPLICAS', '').split(',')), 1):
+    DATABASES['replica%d' % number] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica%d' % number)
+REPLICA_PIN_SECONDS = 5
+
+DATABASE_ROUTERS = []
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS.append('catapp.routers.ReplicaRouter')
+    MIDDLEWARE.append('catapp.middleware.ReadYourWritesMiddleware')
+
+# Users, tokens and sessions (with the content types and admin log they
+# refer to) in their own SQLite file, CATDB_AUTH_DATABASE, so logins and
+# catalogue writes do not wait on each other's write lock
+AUTH_DATABASE = None
+if os.environ.get('CATDB_AUTH_DATABASE'):
+    DATABASES['auth'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['CATDB_AUTH_DATABASE'],
+    }
+    AUTH_DATABASE = 'auth'
+    DATABASE_ROUTERS.insert(0, 'catapp.routers.AuthRouter')
+
+# Cat shards: CATDB_CAT_SHARDS is a comma separated list of SQLite files
+# over which the cats are spread by breed, see `catapp.sharding`. Their
+# foreign keys point to the default database and are not enforced
+CAT_SHARDS = []
+for number, path in enumerate(
+        filter(None, os.environ.get('CATDB_CAT_SHARDS', '').split(',')), 1):
+    DATABASES['cats%d' % number] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'PRAGMAS': {'foreign_keys': 'off'},
+    }
+    CAT_SHARDS.append('cats%d' % number)
+if CAT_SHARDS:
+    # Before ReplicaRouter, the replicas having no cat
+    DATABASE_ROUTERS.insert(0, 'catapp.routers.CatShardRouter')
+# Ids of the sharded cats reserved at once by each process
+CAT_ID_BLOCK_SIZE = 100
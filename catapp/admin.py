@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from catapp.models import Breed, Cat, Home, Human
+from catapp.models import Breed, Cat, ExportJob, Home, Human
 
 @admin.register(Breed)
 class BreedAdmin(admin.ModelAdmin):
@@ -19,3 +19,8 @@ class HomeAdmin(admin.ModelAdmin):
 @admin.register(Human)
 class HumanAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    pass
@@ -1,53 +1,161 @@
 from datetime import timedelta
-from django.http import HttpResponse
+from pathlib import Path
+from django.db import router, transaction
+from django.http import FileResponse, HttpResponse
 from django.utils import timezone
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
+from rest_framework.decorators import action
 from rest_framework.reverse import reverse
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
+from catapp import jobs
+from catapp.database import retry_metrics
 from catapp.serializers import (BreedSerializer, CatSerializer,
-                                HomeSerializer, HumanSerializer)
-from catapp.models import Breed, Cat, Home, Human
+                                ExportJobSerializer, HomeSerializer,
+                                HumanSerializer)
+from catapp.filters import (BreedFilterSet, CatFilterSet, HomeFilterSet,
+                            HumanFilterSet)
+from catapp.fast_serializers import (BreedFastSerializer, CatFastSerializer,
+                                     HomeFastSerializer, HumanFastSerializer)
+from catapp.mixins import (AutocompleteMixin, ExportMixin, FastDeleteMixin,
+                           FastListMixin, QueuedWriteMixin, RetryWriteMixin,
+                           ShardedMixin, retry_write)
+from catapp.parsers import FastJSONParser, MSGPACK_PARSER_CLASSES
+from catapp.renderers import FastJSONRenderer, MSGPACK_RENDERER_CLASSES
+from catapp.models import Breed, Cat, ExportJob, Home, Human
 from catapp.authentication import EXPIRING_HOUR
 
+# Content types negotiated by the API on top of the defaults in settings
+RENDERER_CLASSES = api_settings.DEFAULT_RENDERER_CLASSES \
+    + MSGPACK_RENDERER_CLASSES
+PARSER_CLASSES = api_settings.DEFAULT_PARSER_CLASSES + MSGPACK_PARSER_CLASSES
 
-class HomeViewSet(viewsets.ModelViewSet):
+
+class HomeViewSet(ExportMixin, FastListMixin, RetryWriteMixin,
+                  QueuedWriteMixin, FastDeleteMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = RENDERER_CLASSES
+    parser_classes = PARSER_CLASSES
     queryset = Home.objects.all()
     serializer_class = HomeSerializer
-    filterset_fields = '__all__'
+    fast_serializer_class = HomeFastSerializer
+    filterset_class = HomeFilterSet
     search_fields = ['name', 'address']
 
 
-class BreedViewSet(viewsets.ModelViewSet):
+class BreedViewSet(AutocompleteMixin, ExportMixin, FastListMixin,
+                   RetryWriteMixin, QueuedWriteMixin,
+                   viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = RENDERER_CLASSES
+    parser_classes = PARSER_CLASSES
     queryset = Breed.objects.all()
     serializer_class = BreedSerializer
-    filterset_fields = '__all__'
+    fast_serializer_class = BreedFastSerializer
+    filterset_class = BreedFilterSet
     search_fields = ['name', 'origin']
 
 
-class HumanViewSet(viewsets.ModelViewSet):
+class HumanViewSet(AutocompleteMixin, ExportMixin, FastListMixin,
+                   RetryWriteMixin, QueuedWriteMixin, FastDeleteMixin,
+                   viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = RENDERER_CLASSES
+    parser_classes = PARSER_CLASSES
     queryset = Human.objects.all()
     serializer_class = HumanSerializer
-    filterset_fields = '__all__'
+    fast_serializer_class = HumanFastSerializer
+    filterset_class = HumanFilterSet
     search_fields = ['name', 'gender', 'date_of_birth']
 
 
-class CatViewSet(viewsets.ModelViewSet):
+class CatViewSet(AutocompleteMixin, ExportMixin, FastListMixin,
+                 ShardedMixin, RetryWriteMixin, QueuedWriteMixin,
+                 viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
+    renderer_classes = RENDERER_CLASSES
+    parser_classes = PARSER_CLASSES
     queryset = Cat.objects.all()
     serializer_class = CatSerializer
-    filterset_fields = '__all__'
+    fast_serializer_class = CatFastSerializer
+    filterset_class = CatFilterSet
     search_fields = ['name', 'gender', 'date_of_birth']
 
 
+# Viewsets of the models that can be exported by a job
+VIEWSETS = {
+    ExportJob.ModelName.HOME: HomeViewSet,
+    ExportJob.ModelName.BREED: BreedViewSet,
+    ExportJob.ModelName.HUMAN: HumanViewSet,
+    ExportJob.ModelName.CAT: CatViewSet,
+}
+
+
+class ExportJobViewSet(mixins.CreateModelMixin,
+                       mixins.RetrieveModelMixin,
+                       mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    POST creates an export job written in the background, GET polls its
+    status and `download` serves the file once the job is done.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+
+    def perform_create(self, serializer):
+        job = serializer.save()
+        jobs.submit(job)
+        job.refresh_from_db()
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ExportJob.Status.DONE:
+            return Response(
+                {'detail': "Export job is %s." % job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(
+            open(job.file, 'rb'),
+            as_attachment=True,
+            filename=Path(job.file).name
+        )
+
+
+class WriteRetryMetricsView(APIView):
+    """
+    Number of the writes of this server process per number of retries on
+    a locked database, for the staff.
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = RENDERER_CLASSES
+
+    def get(self, request, *args, **kwargs):
+        return Response(retry_metrics.as_dict())
+
+
 class ObtainNewAuthToken(ObtainAuthToken):
+    renderer_classes = [FastJSONRenderer] + MSGPACK_RENDERER_CLASSES
+    parser_classes = [FormParser, MultiPartParser, FastJSONParser] \
+        + MSGPACK_PARSER_CLASSES
+
     def post(self, request, *args, **kwargs):
+        # The tokens may be in their own database (`AUTH_DATABASE`)
+        using = router.db_for_write(Token)
+
+        def obtain_token():
+            with transaction.atomic(using=using):
+                return self.obtain_token(request)
+        return retry_write(obtain_token, using=using)
+
+    def obtain_token(self, request):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data['user']
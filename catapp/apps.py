@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CatappConfig(AppConfig):
     name = 'catapp'
+
+    def ready(self):
+        from catapp import autocomplete, database, jobs, sharding
+        autocomplete.connect_signals()
+        database.connect_signals()
+        jobs.connect_signals()
+        if settings.CAT_SHARDS:
+            sharding.connect_signals()
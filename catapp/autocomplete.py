@@ -0,0 +1,233 @@
+"""
+In-memory prefix index of the names of breeds, humans and cats.
+
+Each worker process loads the names of a model once, on its first
+autocomplete, into a list sorted by case-folded name. A prefix query is
+then a binary search followed by a scan of the matching names, with no
+database access. The indexes are kept up to date by the `post_save`,
+`post_delete` and `bulk_delete` (`catapp.deletion`) receivers connected
+in `CatappConfig.ready`, once the transaction of the write is committed
+so a rolled back write never shows. Rows written without those signals
+(`bulk_create`, the `seed` command, another process) are seen once the
+index is reloaded: the first autocomplete after
+`AUTOCOMPLETE_RELOAD_SECONDS` starts loading the names again in a
+background thread, and the loaded index keeps answering until the new
+names are swapped in.
+"""
+import bisect
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from catapp import sharding
+from catapp.deletion import bulk_aware, bulk_delete
+from catapp.models import Breed, Cat, Human
+
+AUTOCOMPLETE_MODELS = [Breed, Human, Cat]
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+# Lock of the first load of each model
+_load_locks = {}
+
+
+def fold(name):
+    key = name.casefold()
+    # Share the string when folding does not change it
+    return name if key == name else key
+
+
+class NameIndex:
+    """
+    Names of `model` sorted by their (case-folded name, pk) keys.
+    """
+
+    def __init__(self, model, field='name'):
+        self.model = model
+        self.field = field
+        self.keys = []
+        self.names = {}
+        self.lock = threading.Lock()
+        self.reload_lock = threading.Lock()
+        self.reload_thread = None
+        self.loaded = None
+        # Changes made while the names are loaded, (pk, name or None)
+        self.pending = None
+
+    def read_names(self):
+        """
+        Return the names of the rows of the database, by pk.
+        """
+        # The cats are gathered from their shards
+        querysets = sharding.scatter(self.model.objects.all()) \
+            if self.model is Cat else [self.model.objects.all()]
+        return dict(itertools.chain.from_iterable(
+            queryset.values_list('pk', self.field) for queryset in querysets
+        ))
+
+    def load(self):
+        with self.lock:
+            self.pending = []
+        names = self.read_names()
+        keys = sorted((fold(name), pk) for pk, name in names.items())
+        with self.lock:
+            self.keys, self.names = keys, names
+            # Committed after the names were read, maybe
+            for pk, name in self.pending:
+                self._remove(pk)
+                if name is not None:
+                    self._add(pk, name)
+            self.pending = None
+            self.loaded = time.monotonic()
+
+    def is_expired(self):
+        reload_seconds = settings.AUTOCOMPLETE_RELOAD_SECONDS
+        return bool(reload_seconds) \
+            and time.monotonic() - self.loaded > reload_seconds
+
+    def reload(self):
+        """
+        Load the names again in a background thread, unless already
+        loading them; the loaded names are searched meanwhile.
+        """
+        if self.reload_lock.acquire(blocking=False):
+            self.reload_thread = threading.Thread(
+                target=self.run_reload, daemon=True,
+                name='autocomplete-%s' % self.model._meta.model_name
+            )
+            self.reload_thread.start()
+
+    def run_reload(self):
+        try:
+            self.load()
+        finally:
+            self.reload_lock.release()
+            connections.close_all()
+
+    def search(self, prefix, limit):
+        """
+        Return the (pk, name) of the first `limit` names starting with
+        `prefix`, whatever their case.
+        """
+        prefix = fold(prefix)
+        results = []
+        with self.lock:
+            keys = self.keys
+            index = bisect.bisect_left(keys, (prefix,))
+            while index < len(keys) and len(results) < limit:
+                key, pk = keys[index]
+                if not key.startswith(prefix):
+                    break
+                results.append((pk, self.names[pk]))
+                index += 1
+        return results
+
+    def add(self, pk, name):
+        with self.lock:
+            self._remove(pk)
+            self._add(pk, name)
+            if self.pending is not None:
+                self.pending.append((pk, name))
+
+    def remove(self, pk):
+        with self.lock:
+            self._remove(pk)
+            if self.pending is not None:
+                self.pending.append((pk, None))
+
+    def _add(self, pk, name):
+        bisect.insort(self.keys, (fold(name), pk))
+        self.names[pk] = name
+
+    def _remove(self, pk):
+        name = self.names.pop(pk, None)
+        if name is not None:
+            key = (fold(name), pk)
+            index = bisect.bisect_left(self.keys, key)
+            if index < len(self.keys) and self.keys[index] == key:
+                del self.keys[index]
+
+
+def get_index(model):
+    """
+    Return the index of `model`, loading it on first use and reloading it
+    in the background once expired.
+    """
+    index = _indexes.get(model)
+    if index is None:
+        with _indexes_lock:
+            load_lock = _load_locks.setdefault(model, threading.Lock())
+        # The first load of a model does not hold up the other models
+        with load_lock:
+            index = _indexes.get(model)
+            if index is None:
+                index = NameIndex(model)
+                index.load()
+                with _indexes_lock:
+                    _indexes[model] = index
+                return index
+    if index.is_expired():
+        index.reload()
+    return index
+
+
+def reset():
+    """
+    Drop the loaded indexes, to be loaded again from the database.
+    """
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def update_index(sender, instance, using, **kwargs):
+    def add():
+        index = _indexes.get(sender)
+        if index is not None:
+            index.add(instance.pk, getattr(instance, index.field))
+    transaction.on_commit(add, using=using)
+
+
+@bulk_aware
+def remove_from_index(sender, instance, using, **kwargs):
+    pk = instance.pk
+
+    def remove():
+        index = _indexes.get(sender)
+        if index is not None:
+            index.remove(pk)
+    transaction.on_commit(remove, using=using)
+
+
+def bulk_remove_from_index(sender, queryset, using, **kwargs):
+    # Rows about to be deleted by `catapp.deletion.fast_delete`
+    if sender not in _indexes:
+        return
+    pks = list(queryset.order_by().values_list('pk', flat=True))
+
+    def remove():
+        index = _indexes.get(sender)
+        if index is not None:
+            for pk in pks:
+                index.remove(pk)
+    transaction.on_commit(remove, using=using)
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    for model in AUTOCOMPLETE_MODELS:
+        post_save.connect(
+            update_index, sender=model,
+            dispatch_uid='autocomplete-save-%s' % model._meta.label
+        )
+        post_delete.connect(
+            remove_from_index, sender=model,
+            dispatch_uid='autocomplete-delete-%s' % model._meta.label
+        )
+        bulk_delete.connect(
+            bulk_remove_from_index, sender=model,
+            dispatch_uid='autocomplete-bulk-delete-%s' % model._meta.label
+        )
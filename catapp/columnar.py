@@ -0,0 +1,101 @@
+"""
+Columnar (Apache Arrow / Parquet) snapshots of the catapp models.
+
+Rows are read as tuples and turned into Arrow record batches one column at
+a time, so a snapshot is built in batches of `SNAPSHOT_BATCH_SIZE` rows
+instead of one object at a time. Foreign keys are kept as integer columns.
+"""
+from django.conf import settings
+
+from catapp import sharding
+from catapp.models import Breed, Cat, Home, Human
+from catapp.utils import iter_chunks
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+SNAPSHOT_MODELS = [Home, Breed, Human, Cat]
+
+
+def get_arrow_type(field):
+    if field.is_relation:
+        return get_arrow_type(field.target_field)
+    internal_type = field.get_internal_type()
+    if internal_type in ('AutoField', 'BigAutoField', 'IntegerField',
+                         'BigIntegerField', 'SmallIntegerField',
+                         'PositiveIntegerField', 'PositiveSmallIntegerField'):
+        return pyarrow.int64()
+    if internal_type == 'DateField':
+        return pyarrow.date32()
+    if internal_type == 'DateTimeField':
+        return pyarrow.timestamp('us', tz='UTC')
+    if internal_type == 'BooleanField':
+        return pyarrow.bool_()
+    if internal_type == 'FloatField':
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+def get_schema(model, columns=None):
+    """
+    Return the Arrow schema of `model` for the given attnames (every
+    concrete field by default).
+    """
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    if columns is None:
+        columns = list(fields)
+    return pyarrow.schema([
+        pyarrow.field(column, get_arrow_type(fields[column]),
+                      nullable=fields[column].null)
+        for column in columns
+    ])
+
+
+def iter_record_batches(schema, rows, batch_size=None):
+    """
+    Group `rows` (tuples in the order of `schema`) into record batches.
+    """
+    batch_size = batch_size or settings.SNAPSHOT_BATCH_SIZE
+    for chunk in iter_chunks(rows, batch_size):
+        yield pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(values, type=field.type)
+                for field, values in zip(schema, zip(*chunk))
+            ],
+            schema=schema
+        )
+
+
+def iter_snapshot_batches(queryset, batch_size=None):
+    """
+    Return the schema and the record batches of every row of `queryset`.
+    """
+    batch_size = batch_size or settings.SNAPSHOT_BATCH_SIZE
+    schema = get_schema(queryset.model)
+    rows = sharding.iterator(
+        queryset.order_by('pk').values_list(*schema.names), batch_size
+    )
+    return schema, iter_record_batches(schema, rows, batch_size)
+
+
+def write_snapshot(queryset, path, format='parquet', batch_size=None):
+    """
+    Write every row of `queryset` to `path` as a Parquet file or an Arrow
+    IPC file, and return the number of rows written.
+    """
+    schema, batches = iter_snapshot_batches(queryset, batch_size)
+    if format == 'parquet':
+        writer = pyarrow.parquet.ParquetWriter(str(path), schema)
+    else:
+        writer = pyarrow.ipc.new_file(str(path), schema)
+
+    num_of_rows = 0
+    with writer:
+        for batch in batches:
+            writer.write_table(pyarrow.Table.from_batches([batch]))
+            num_of_rows += batch.num_rows
+    return num_of_rows
@@ -0,0 +1,189 @@
+"""
+Tuning of the SQLite connections.
+
+`configure_connection`, connected to `connection_created` in
+`CatappConfig.ready`, runs a `PRAGMA` for each item of the
+`SQLITE_PRAGMAS` setting on every new SQLite connection, e.g.
+
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'busy_timeout': 5000,
+    }
+
+The `PRAGMAS` of a database in `DATABASES` are run on its connections on
+top of those (e.g. `{'foreign_keys': 'off'}` for the cat shards).
+`journal_mode` is stored in the database file while the other pragmas
+only last as long as the connection. An in-memory database (the test
+database) stays in the `memory` journal mode.
+
+Writes still failing with "database is locked" once the busy timeout is
+over can be run through `retry_on_busy`, which runs them again after a
+jittered backoff and counts the retries in `retry_metrics`.
+
+`backup_database` copies a database into another with the online backup
+API of SQLite, which keeps the read replicas in sync with the default
+database.
+"""
+import collections
+import logging
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+logger = logging.getLogger(__name__)
+
+# Pragma names and values which may be written in the statement as is
+PRAGMA_NAME_RE = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE_RE = re.compile(r'^(-?\d+|[A-Za-z_]+)$')
+
+
+def get_pragma_sql(name, value):
+    if not PRAGMA_NAME_RE.match(name):
+        raise ValueError("Invalid SQLite pragma: %r" % name)
+    value = str(value)
+    if not PRAGMA_VALUE_RE.match(value):
+        raise ValueError("Invalid value of the SQLite pragma %s: %r" % (
+            name, value
+        ))
+    return 'PRAGMA %s = %s' % (name, value)
+
+
+def get_pragmas(connection):
+    """
+    Return the `SQLITE_PRAGMAS` updated with the `PRAGMAS` of the database
+    of `connection`, where a value of None skips the pragma.
+    """
+    pragmas = dict(getattr(settings, 'SQLITE_PRAGMAS', {}))
+    pragmas.update(connection.settings_dict.get('PRAGMAS', {}))
+    return {name: value for name, value in pragmas.items()
+            if value is not None}
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = get_pragmas(connection)
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(get_pragma_sql(name, value))
+
+
+def configure_migrated_connection(sender, using, **kwargs):
+    # The schema editor of the migrations turns the foreign keys back on
+    connection = connections[using]
+    if 'foreign_keys' in connection.settings_dict.get('PRAGMAS', {}):
+        configure_connection(sender, connection)
+
+
+def connect_signals():
+    from django.db.backends.signals import connection_created
+    from django.db.models.signals import post_migrate
+
+    connection_created.connect(
+        configure_connection, dispatch_uid='sqlite-pragmas'
+    )
+    post_migrate.connect(
+        configure_migrated_connection, dispatch_uid='sqlite-pragmas-migrate'
+    )
+
+
+def is_busy_error(exc):
+    """
+    Return whether `exc` is SQLite failing to get a lock (SQLITE_BUSY or
+    SQLITE_LOCKED), after which the transaction can be run again.
+    """
+    return isinstance(exc, OperationalError) and 'locked' in str(exc)
+
+
+class RetryMetrics:
+    """
+    Number of writes per number of retries, for the writes that succeeded
+    and for those still busy after the last retry.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.succeeded = collections.Counter()
+            self.failed = collections.Counter()
+
+    def record(self, retries, succeeded):
+        with self.lock:
+            (self.succeeded if succeeded else self.failed)[retries] += 1
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'succeeded': dict(self.succeeded),
+                'failed': dict(self.failed),
+                'retries': sum(
+                    retries * count
+                    for counter in (self.succeeded, self.failed)
+                    for retries, count in counter.items()
+                ),
+            }
+
+
+retry_metrics = RetryMetrics()
+
+
+def get_backoff(retry, delay, max_delay):
+    """
+    Return a random delay up to the exponential backoff of `retry` (full
+    jitter), so the writers retrying together spread out.
+    """
+    return random.uniform(0, min(max_delay, delay * 2 ** (retry - 1)))
+
+
+def retry_on_busy(func, using=DEFAULT_DB_ALIAS):
+    """
+    Call `func`, again up to `WRITE_RETRIES` times while it fails to get a
+    lock of the database. `func` has to be one transaction so a failed
+    attempt leaves nothing behind; inside a transaction of the caller it
+    is called once.
+    """
+    retries = 0
+    while True:
+        try:
+            result = func()
+        except OperationalError as exc:
+            if not is_busy_error(exc):
+                raise
+            if (retries >= settings.WRITE_RETRIES
+                    or connections[using].in_atomic_block):
+                retry_metrics.record(retries, False)
+                logger.warning("Write still busy after %d retries", retries)
+                raise
+            retries += 1
+            time.sleep(get_backoff(retries, settings.WRITE_RETRY_DELAY,
+                                   settings.WRITE_RETRY_MAX_DELAY))
+        else:
+            retry_metrics.record(retries, True)
+            if retries:
+                logger.info("Write succeeded after %d retries", retries)
+            return result
+
+
+def backup_database(source, target):
+    """
+    Copy the SQLite database of the alias `source` into the database of
+    the alias `target`, which is locked for writing during the copy (its
+    readers wait up to their busy timeout).
+    """
+    source_connection = connections[source]
+    target_connection = connections[target]
+    for conn in (source_connection, target_connection):
+        if conn.vendor != 'sqlite':
+            raise ValueError("%s is not an SQLite database." % conn.alias)
+        conn.ensure_connection()
+    source_connection.connection.backup(target_connection.connection)
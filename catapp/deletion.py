@@ -0,0 +1,129 @@
+"""
+Fast cascading delete.
+
+`Model.delete()` goes through Django's `Collector`, which loads every row
+reached by the cascade (a home, its humans and their cats) into memory,
+sends `pre_delete` and `post_delete` for each of them and deletes them by
+chunks of pks. `fast_delete` deletes the same rows with one set-based
+DELETE per table, the children first, each selecting its rows through
+the foreign keys up to the deleted object, e.g. for a home:
+
+    DELETE FROM catapp_cat WHERE id IN (
+        SELECT cat.id FROM catapp_cat INNER JOIN catapp_human ...
+        WHERE catapp_human.home_id = %s)
+    DELETE FROM catapp_human WHERE home_id = %s
+    DELETE FROM catapp_home WHERE id = %s
+
+It applies when every relation reached is a CASCADE (or DO_NOTHING)
+foreign key and every `pre_delete`/`post_delete` receiver of the models
+reached is marked `@bulk_aware`, its work being done by a receiver of
+`bulk_delete` instead. `bulk_delete` is sent before each DELETE with the
+queryset of the rows about to be deleted, which receivers may read (e.g.
+their pks) and return counts of the rows they deleted elsewhere (the cats
+of the shards). Otherwise `delete` falls back to `Model.delete()`.
+"""
+import collections
+
+from django.db import models, router, transaction
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import Signal
+
+# Sent with `queryset` and `using` before the set-based DELETE of the rows
+# of `queryset`. Receivers may return a {model label: count} dict of the
+# rows they deleted.
+bulk_delete = Signal()
+
+_bulk_aware = set()
+
+
+def bulk_aware(receiver):
+    """
+    Mark a `pre_delete`/`post_delete` receiver whose work is also done by
+    a receiver of `bulk_delete`, so it does not prevent `fast_delete`.
+    """
+    _bulk_aware.add(receiver)
+    return receiver
+
+
+def has_row_receivers(model):
+    return any(
+        receiver not in _bulk_aware
+        for signal in (pre_delete, post_delete)
+        for receiver in signal._live_receivers(model)
+    )
+
+
+def get_plan(model, lookup='pk', path=()):
+    """
+    Return the (model, lookup) pairs of the rows deleted with `model`, the
+    children first, each lookup leading from the model to the pk of the
+    deleted object. Return None if they cannot be deleted set-based.
+    """
+    if (model in path or model._meta.many_to_many
+            or model._meta.private_fields or has_row_receivers(model)):
+        return None
+    plan = []
+    for relation in model._meta.related_objects:
+        on_delete = getattr(relation, 'on_delete', None)
+        if on_delete is models.DO_NOTHING:
+            continue
+        if on_delete is not models.CASCADE or relation.many_to_many:
+            return None
+        children = get_plan(
+            relation.related_model,
+            '%s__%s' % (relation.field.name, lookup),
+            path + (model,)
+        )
+        if children is None:
+            return None
+        plan.extend(children)
+    plan.append((model, lookup))
+    return plan
+
+
+def fast_delete(instance, using=None):
+    """
+    Delete `instance` with the rows of its cascade set-based, and return
+    the number of rows deleted and a dict of the number of rows deleted
+    per model label, as `Model.delete()` does. Return None if the rows
+    cannot be deleted set-based.
+    """
+    using = using or router.db_for_write(type(instance), instance=instance)
+    plan = get_plan(type(instance))
+    if plan is None:
+        return None
+
+    counter = collections.Counter()
+    with transaction.atomic(using=using):
+        for model, lookup in plan:
+            queryset = model._base_manager.using(using).filter(
+                **{lookup: instance.pk}
+            )
+            for receiver, counts in bulk_delete.send(
+                    sender=model, queryset=queryset, using=using):
+                counter.update(counts or {})
+            counter[model._meta.label] += queryset._raw_delete(using)
+    setattr(instance, instance._meta.pk.attname, None)
+    counts = {label: count for label, count in counter.items() if count}
+    return sum(counts.values()), counts
+
+
+def delete(instance):
+    """
+    Delete `instance` through `fast_delete`, or `Model.delete()` if its
+    rows cannot be deleted set-based.
+    """
+    result = fast_delete(instance)
+    if result is None:
+        return instance.delete()
+    return result
+
+
+def get_counts_header(counts):
+    """
+    Return the counts of a delete as the value of a response header, e.g.
+    `catapp.Cat=3, catapp.Human=1`.
+    """
+    return ', '.join(
+        '%s=%d' % (label, count) for label, count in sorted(counts.items())
+    )
@@ -0,0 +1,245 @@
+"""
+Read-only fast path for the list endpoints.
+
+The serializers in `catapp.serializers` build a model instance for every
+row and run each field's `to_representation` on it.  The classes below
+produce the very same JSON shape from `values()` rows instead, following a
+field plan that is precomputed once per class.
+"""
+import itertools
+from collections import defaultdict
+
+from rest_framework.reverse import reverse
+
+from catapp import sharding
+from catapp.models import Breed, Cat, Home, Human
+
+# Stand-in primary key used to reverse a detail url only once per request
+PK_PLACEHOLDER = '__pk__'
+
+# Kinds of field in a field plan
+VALUE = 'value'         # column copied as it is
+DATE = 'date'           # date column rendered in ISO 8601
+IDENTITY = 'identity'   # hyperlink to the row itself
+RELATED = 'related'     # hyperlink through a FK id column
+MANY = 'many'           # list of values collected by `collect_<name>`
+
+
+class DetailUrl:
+    """
+    Absolute url of a detail view, split around the primary key so that
+    building a hyperlink is a plain string concatenation.
+    """
+
+    def __init__(self, view_name, request, format=None):
+        url = reverse(
+            view_name,
+            kwargs={'pk': PK_PLACEHOLDER},
+            request=request,
+            format=format
+        )
+        self.prefix, self.suffix = url.split(PK_PLACEHOLDER)
+
+    def __call__(self, pk):
+        if pk is None:
+            return None
+        return '%s%s%s' % (self.prefix, pk, self.suffix)
+
+
+class FastSerializer:
+    """
+    Base of the read-only fast path.
+
+    `fields` is the field plan of the class, in output order, as
+    (field name, kind, source) tuples. The source is the `values()` column
+    for VALUE and DATE, the view name for IDENTITY, a (column, view name)
+    pair for RELATED and the view name used by the collected pks for MANY.
+    """
+    model = None
+    fields = ()
+
+    def __init__(self, context):
+        request = context['request']
+        format = context.get('format')
+        self.urls = {}
+        for name, kind, source in self.fields:
+            view_name = source[1] if kind == RELATED else source
+            if kind in (IDENTITY, RELATED, MANY):
+                self.urls[view_name] = DetailUrl(view_name, request, format)
+
+    @classmethod
+    def get_columns(cls):
+        columns = ['id']
+        for name, kind, source in cls.fields:
+            if kind in (VALUE, DATE):
+                columns.append(source)
+            elif kind == RELATED:
+                columns.append(source[0])
+        return columns
+
+    def get_rows(self, queryset):
+        return queryset.values(*self.get_columns())
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        ids = [row['id'] for row in rows]
+        collected = {
+            name: getattr(self, 'collect_' + name)(ids)
+            for name, kind, source in self.fields
+            if kind == MANY
+        }
+        plan = []
+        for name, kind, source in self.fields:
+            if kind == RELATED:
+                plan.append((name, kind, source[0], self.urls[source[1]]))
+            elif kind in (IDENTITY, MANY):
+                plan.append((name, kind, 'id', self.urls[source]))
+            else:
+                plan.append((name, kind, source, None))
+
+        result = []
+        for row in rows:
+            data = {}
+            for name, kind, column, url in plan:
+                value = row[column]
+                if kind == VALUE:
+                    data[name] = value
+                elif kind == DATE:
+                    data[name] = None if value is None else value.isoformat()
+                elif kind == MANY:
+                    data[name] = [url(pk) for pk in collected[name][value]]
+                else:
+                    data[name] = url(value)
+            result.append(data)
+        return result
+
+    @staticmethod
+    def group_pks(pairs):
+        # Group (key, pk) pairs into {key: [pk, ...]} keeping their order
+        groups = defaultdict(list)
+        for key, pk in pairs:
+            groups[key].append(pk)
+        return groups
+
+
+class HomeFastSerializer(FastSerializer):
+    model = Home
+    fields = (
+        ('url', IDENTITY, 'catapp:home-detail'),
+        ('name', VALUE, 'name'),
+        ('address', VALUE, 'address'),
+        ('hometype', VALUE, 'hometype'),
+    )
+
+
+class BreedFastSerializer(FastSerializer):
+    model = Breed
+    fields = (
+        ('url', IDENTITY, 'catapp:breed-detail'),
+        ('cats', MANY, 'catapp:cat-detail'),
+        ('homes', MANY, 'catapp:home-detail'),
+        ('name', VALUE, 'name'),
+        ('origin', VALUE, 'origin'),
+        ('description', VALUE, 'description'),
+    )
+
+    def collect_cats(self, ids):
+        # The cats of a breed are all in the same shard
+        return self.group_pks(itertools.chain.from_iterable(sharding.scatter(
+            Cat.objects.filter(breed_id__in=ids).values_list('breed_id', 'id')
+        )))
+
+    def collect_homes(self, ids):
+        if sharding.is_sharded():
+            pairs = self.group_pks(self.collect_sharded_homes(ids))
+        else:
+            pairs = self.group_pks(
+                Cat.objects.filter(breed_id__in=ids)
+                .order_by()
+                .values_list('breed_id', 'owner__home_id')
+                .distinct()
+            )
+        # Same as `BreedSerializer.get_breed_homes`, the home ids are put
+        # into a set in descending order so the resulting order matches
+        homes = defaultdict(list)
+        for breed_id, home_ids in pairs.items():
+            homes[breed_id] = list(set(sorted(home_ids, reverse=True)))
+        return homes
+
+    @staticmethod
+    def collect_sharded_homes(ids):
+        # The humans are not in the shards: the owners of the cats are
+        # mapped to their homes with a query on the default database
+        owners = set(itertools.chain.from_iterable(sharding.scatter(
+            Cat.objects.filter(breed_id__in=ids)
+            .order_by()
+            .values_list('breed_id', 'owner_id')
+            .distinct()
+        )))
+        homes = dict(
+            Human.objects.filter(id__in={owner for _, owner in owners})
+            .values_list('id', 'home_id')
+        )
+        return {(breed_id, homes[owner]) for breed_id, owner in owners
+                if owner in homes}
+
+
+class HumanFastSerializer(FastSerializer):
+    model = Human
+    fields = (
+        ('url', IDENTITY, 'catapp:human-detail'),
+        ('home', RELATED, ('home_id', 'catapp:home-detail')),
+        ('cats', MANY, 'catapp:cat-detail'),
+        ('name', VALUE, 'name'),
+        ('gender', VALUE, 'gender'),
+        ('date_of_birth', DATE, 'date_of_birth'),
+        ('description', VALUE, 'description'),
+    )
+
+    def collect_cats(self, ids):
+        queryset = Cat.objects.filter(owner_id__in=ids).values_list(
+            'owner_id', 'id'
+        )
+        if sharding.is_sharded():
+            # Gathered in the order of the cats (`ORDERING`)
+            queryset = sharding.ShardedQuerySet(
+                queryset.values_list('owner_id', 'id', 'name')
+            )
+            return self.group_pks((owner, pk) for owner, pk, name in queryset)
+        return self.group_pks(queryset)
+
+
+class CatFastSerializer(FastSerializer):
+    model = Cat
+    fields = (
+        ('url', IDENTITY, 'catapp:cat-detail'),
+        ('breed', RELATED, ('breed_id', 'catapp:breed-detail')),
+        ('owner', RELATED, ('owner_id', 'catapp:human-detail')),
+        ('home', RELATED, ('owner__home_id', 'catapp:home-detail')),
+        ('name', VALUE, 'name'),
+        ('gender', VALUE, 'gender'),
+        ('date_of_birth', DATE, 'date_of_birth'),
+        ('description', VALUE, 'description'),
+    )
+
+    def get_rows(self, queryset):
+        if not sharding.is_sharded():
+            return super().get_rows(queryset)
+        # The humans are not in the shards, the homes of the owners are
+        # filled in by `to_representation`
+        columns = [
+            column for column in self.get_columns()
+            if column != 'owner__home_id'
+        ]
+        return sharding.ShardedQuerySet(queryset.values(*columns))
+
+    def to_representation(self, rows):
+        if sharding.is_sharded():
+            rows = list(rows)
+            homes = dict(
+                Human.objects.filter(id__in={row['owner_id'] for row in rows})
+                .values_list('id', 'home_id')
+            )
+            for row in rows:
+                row['owner__home_id'] = homes.get(row['owner_id'])
+        return super().to_representation(rows)
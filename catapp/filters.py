@@ -0,0 +1,143 @@
+"""
+FilterSets of the viewsets.
+
+Only the lookups backed by an index are exposed: exact and `in` lookups
+on the choices and foreign keys, ranges on `date_of_birth`, and exact
+and prefix lookups on `name`. Filtering on another field (e.g. on the
+`description`, which would scan the whole table) is rejected with a 400
+by the list endpoints instead of being silently ignored.
+"""
+import django_filters
+from django import forms
+from django.forms.utils import ErrorList
+from django_filters.constants import EMPTY_VALUES
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.settings import api_settings
+
+from catapp.models import Breed, Cat, Home, Human
+
+# Query parameters of the list endpoints which are not filters
+NON_FILTER_PARAMS = {
+    'page', 'stream', api_settings.URL_FORMAT_OVERRIDE,
+    api_settings.SEARCH_PARAM, api_settings.ORDERING_PARAM,
+}
+
+# Greatest code point, bounding the strings starting with a prefix
+MAX_CHAR = '\U0010ffff'
+
+DATE_LOOKUPS = ['exact', 'gt', 'gte', 'lt', 'lte']
+
+
+class PrefixFilter(django_filters.CharFilter):
+    """
+    Case-sensitive prefix filter written as the range
+    `prefix <= value < prefix + MAX_CHAR`, which can use the index of the
+    field where a `LIKE 'prefix%'` can not (it is case-insensitive on
+    SQLite).
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return self.get_method(qs)(**{
+            '%s__gte' % self.field_name: value,
+            '%s__lt' % self.field_name: value + MAX_CHAR,
+        })
+
+
+class NumberInFilter(django_filters.BaseInFilter,
+                     django_filters.NumberFilter):
+    """
+    `in` lookup on the ids of a foreign key, not checking that they exist.
+    """
+
+
+class StrictFilterSet(django_filters.FilterSet):
+    """
+    FilterSet rejecting, when `strict`, the query parameters that are
+    neither one of its filters nor in `NON_FILTER_PARAMS`.
+    """
+    strict = True
+
+    def get_unsupported_params(self):
+        if not self.strict:
+            return []
+        return sorted(set(self.data) - set(self.filters) - NON_FILTER_PARAMS)
+
+    def is_valid(self):
+        return not self.get_unsupported_params() and super().is_valid()
+
+    @property
+    def errors(self):
+        errors = super().errors
+        for param in self.get_unsupported_params():
+            errors[param] = ErrorList([forms.ValidationError(
+                "Filtering on %(param)s is not supported.",
+                code='unsupported', params={'param': param}
+            )])
+        return errors
+
+
+class FilterBackend(DjangoFilterBackend):
+    """
+    `DjangoFilterBackend` only rejecting the unsupported filters of the
+    list endpoints, the other query parameters of a detail request being
+    ignored.
+    """
+
+    def get_filterset(self, request, queryset, view):
+        filterset = super().get_filterset(request, queryset, view)
+        if isinstance(filterset, StrictFilterSet):
+            filterset.strict = not getattr(view, 'detail', False)
+        return filterset
+
+
+class HomeFilterSet(StrictFilterSet):
+    name__startswith = PrefixFilter(field_name='name')
+
+    class Meta:
+        model = Home
+        fields = {
+            'name': ['exact'],
+            'hometype': ['exact', 'in'],
+        }
+
+
+class BreedFilterSet(StrictFilterSet):
+    name__startswith = PrefixFilter(field_name='name')
+
+    class Meta:
+        model = Breed
+        fields = {
+            'name': ['exact'],
+        }
+
+
+class HumanFilterSet(StrictFilterSet):
+    name__startswith = PrefixFilter(field_name='name')
+    home__in = NumberInFilter(field_name='home', lookup_expr='in')
+
+    class Meta:
+        model = Human
+        fields = {
+            'name': ['exact'],
+            'gender': ['exact', 'in'],
+            'date_of_birth': DATE_LOOKUPS,
+            'home': ['exact'],
+        }
+
+
+class CatFilterSet(StrictFilterSet):
+    name__startswith = PrefixFilter(field_name='name')
+    breed__in = NumberInFilter(field_name='breed', lookup_expr='in')
+    owner__in = NumberInFilter(field_name='owner', lookup_expr='in')
+
+    class Meta:
+        model = Cat
+        fields = {
+            'name': ['exact'],
+            'gender': ['exact', 'in'],
+            'date_of_birth': DATE_LOOKUPS,
+            'breed': ['exact'],
+            'owner': ['exact'],
+        }
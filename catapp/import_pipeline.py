@@ -0,0 +1,154 @@
+"""
+Parallel parse / single-writer import pipeline.
+
+A reader thread splits the file into chunks of raw records and hands them
+to a pool of worker processes, which parse and validate them. The results
+are queued, in the order of the file, for the single writer (the caller
+of `ImportPipeline.run`). The queue is bounded, so the reader waits when
+the writer falls behind instead of holding the whole file in memory.
+
+Worker processes never touch the database and this module does not
+import the models, so the workers can be spawned as well as forked.
+"""
+import csv
+import io
+import json
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Importer of the current worker process
+_importer = None
+
+
+def init_worker(settings_module, model_name, batch_size, maps):
+    global _importer
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+    from catapp.importers import IMPORTERS
+
+    _importer = IMPORTERS[model_name](batch_size=batch_size)
+    _importer.set_maps(maps)
+
+
+def clean_chunk(format, header, records, first_row_number):
+    """
+    Parse and validate a chunk of raw records in a worker process.
+    """
+    if format == 'csv':
+        rows = list(csv.DictReader(io.StringIO(header + ''.join(records))))
+    else:
+        rows = [json.loads(record) for record in records]
+    valid, errors = _importer.clean_batch(rows, first_row_number)
+    return len(rows), valid, errors
+
+
+def iter_raw_chunks(path, format, size):
+    """
+    Yield the header line and chunks of `size` raw records of the file.
+
+    A CSV record spans several lines while one of its values is quoted,
+    which is the case as long as the record holds an odd number of quotes.
+    """
+    with open(path, newline='', encoding='utf-8') as import_file:
+        header = next(import_file, '') if format == 'csv' else ''
+        chunk, record, quotes = [], [], 0
+        for line in import_file:
+            if format == 'csv':
+                if not record and not line.strip():
+                    continue
+                record.append(line)
+                quotes += line.count('"')
+                if quotes % 2:
+                    continue
+                chunk.append(''.join(record))
+                record, quotes = [], 0
+            elif line.strip():
+                chunk.append(line)
+            if len(chunk) >= size:
+                yield header, chunk
+                chunk = []
+        if record:
+            chunk.append(''.join(record))
+        if chunk:
+            yield header, chunk
+
+
+class ImportPipeline:
+    """
+    Run the parse and validation of `importer` in `workers` processes.
+    """
+
+    def __init__(self, importer, workers, queue_size=None):
+        self.importer = importer
+        self.workers = workers
+        self.queue_size = queue_size or workers * 2
+
+    def run(self, path, format=None):
+        """
+        Yield (number of rows, valid rows, errors) for each chunk, in the
+        order of the file.
+        """
+        from catapp.importers import FORMATS
+
+        format = format or Path(path).suffix.lstrip('.').lower()
+        if format not in FORMATS:
+            raise ValueError("Unknown import format: %s" % format)
+
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(
+                os.environ.get('DJANGO_SETTINGS_MODULE', 'catDB.settings'),
+                self.importer.model._meta.model_name,
+                self.importer.batch_size,
+                self.importer.get_maps(),
+            ),
+        )
+        results = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        def read():
+            try:
+                first_row_number = 1
+                for header, records in iter_raw_chunks(
+                        path, format, self.importer.batch_size):
+                    if stop.is_set():
+                        return
+                    results.put(pool.submit(
+                        clean_chunk, format, header, records, first_row_number
+                    ))
+                    first_row_number += len(records)
+            except Exception as exc:
+                results.put(exc)
+            finally:
+                results.put(None)
+
+        reader = threading.Thread(target=read, name='import-reader')
+        reader.start()
+        try:
+            while True:
+                item = results.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item.result()
+        finally:
+            # Unblock and stop the reader when the writer gives up early
+            stop.set()
+            while reader.is_alive():
+                try:
+                    item = results.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if hasattr(item, 'cancel'):
+                    item.cancel()
+            reader.join()
+            pool.shutdown(wait=True)
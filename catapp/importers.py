@@ -0,0 +1,245 @@
+"""
+Bulk import of CSV / NDJSON files into the catapp models.
+
+Rows are validated in batches by `catapp.validators.BatchValidator`
+instead of building a serializer per row, foreign keys are resolved
+through in-memory maps loaded once, and the valid rows are written
+with `bulk_create`, committing every `IMPORT_TRANSACTION_SIZE` rows.
+With more than one worker, parsing and validation run in a process
+pool (see `catapp.import_pipeline`).
+"""
+import csv
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+
+from catapp.import_pipeline import ImportPipeline
+from catapp.models import Breed, Cat, Home, Human
+from catapp.utils import iter_chunks
+from catapp.validators import BatchValidator, PrimaryKeyLookup, SlugLookup
+
+FORMATS = ('csv', 'ndjson')
+
+
+def read_rows(path, format=None):
+    """
+    Yield every row of the CSV or NDJSON file at `path` as a dict.
+    """
+    format = format or Path(path).suffix.lstrip('.').lower()
+    if format not in FORMATS:
+        raise ValueError("Unknown import format: %s" % format)
+
+    with open(path, newline='', encoding='utf-8') as import_file:
+        if format == 'csv':
+            yield from csv.DictReader(import_file)
+        else:
+            for line in import_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class ImportResult:
+    """
+    Number of rows read and created, and the errors of the invalid rows as
+    (row number, {field: [messages]}) pairs.
+    """
+
+    def __init__(self):
+        self.num_of_rows = 0
+        self.num_of_created = 0
+        self.errors = []
+
+
+class Importer:
+    """
+    Base of the importers.
+
+    `fields` are the columns of the file copied into the model, validated
+    a batch at a time by a `BatchValidator`. Foreign key columns are
+    resolved by the lookups of `get_lookups`, from the maps built in
+    `load_maps`, into the id stored in `<field>_id`.
+
+    The maps are the only state of an importer, handed over to the worker
+    processes by `get_maps` / `set_maps`.
+    """
+    model = None
+    fields = ()
+
+    def __init__(self, batch_size=None, transaction_size=None, workers=None):
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.transaction_size = \
+            transaction_size or settings.IMPORT_TRANSACTION_SIZE
+        self.workers = workers or settings.IMPORT_WORKERS
+
+    def load_maps(self):
+        pass
+
+    def get_maps(self):
+        return {}
+
+    def set_maps(self, maps):
+        for name, value in maps.items():
+            setattr(self, name, value)
+
+    def run(self, path, format=None, progress=None):
+        """
+        Import the file at `path`, calling `progress` with the current
+        `ImportResult` after each write.
+        """
+        self.load_maps()
+        result = ImportResult()
+        if self.workers > 1:
+            batches = ImportPipeline(self, self.workers).run(path, format)
+        else:
+            batches = (
+                (len(rows), *self.clean_batch(rows, first_row_number))
+                for first_row_number, rows in self.iter_batches(path, format)
+            )
+
+        pending = []
+        for num_of_rows, valid, errors in batches:
+            objs, write_errors = self.build_objs(valid)
+            result.num_of_rows += num_of_rows
+            result.errors.extend(errors + write_errors)
+            pending.extend(objs)
+            if len(pending) >= self.transaction_size:
+                result.num_of_created += self.write(pending)
+                pending = []
+                if progress:
+                    progress(result)
+        result.num_of_created += self.write(pending)
+        result.errors.sort(key=lambda error: error[0])
+        if progress:
+            progress(result)
+        return result
+
+    def iter_batches(self, path, format=None):
+        first_row_number = 1
+        for rows in iter_chunks(read_rows(path, format), self.batch_size):
+            yield first_row_number, rows
+            first_row_number += len(rows)
+
+    def write(self, objs):
+        if not objs:
+            return 0
+        with transaction.atomic():
+            self.model.objects.bulk_create(objs, batch_size=self.batch_size)
+        return len(objs)
+
+    def get_lookups(self):
+        """
+        Return the lookups of the foreign keys, resolving the values from
+        the maps instead of the database.
+        """
+        return {}
+
+    def clean_batch(self, rows, first_row_number):
+        """
+        Return the (row number, values) of the valid rows and the
+        (row number, errors) of the others. No database access is made, so
+        this can run in a worker process.
+
+        Empty values are treated as missing, as a CSV file cannot tell
+        them apart.
+        """
+        validator = BatchValidator(self.model, self.fields, self.get_lookups())
+        values, errors = validator.validate([
+            {name: value for name, value in row.items() if value != ''}
+            for row in rows
+        ])
+        valid, invalid = [], []
+        for number, row_values, row_errors in zip(
+                range(first_row_number, first_row_number + len(rows)),
+                values, errors):
+            if row_errors:
+                invalid.append((number, {
+                    name: [str(detail) for detail in details]
+                    for name, details in row_errors.items()
+                }))
+            else:
+                valid.append((number, row_values))
+        return valid, invalid
+
+    def build_objs(self, valid):
+        """
+        Return the model objects to write from the valid rows, and the
+        errors of those that cannot be written. Runs in the writer.
+        """
+        return [self.model(**values) for number, values in valid], []
+
+
+class HomeImporter(Importer):
+    model = Home
+    fields = ('name', 'address', 'hometype')
+
+
+class BreedImporter(Importer):
+    model = Breed
+    fields = ('name', 'origin', 'description')
+
+    def load_maps(self):
+        self.names = set(Breed.objects.values_list('name', flat=True))
+
+    def build_objs(self, valid):
+        # Breed names are unique, within the file as well
+        objs, errors = [], []
+        for number, values in valid:
+            if values['name'] in self.names:
+                errors.append((number, {
+                    'name': ["breed with this name already exists."]
+                }))
+            else:
+                self.names.add(values['name'])
+                objs.append(Breed(**values))
+        return objs, errors
+
+
+class HumanImporter(Importer):
+    model = Human
+    fields = ('name', 'gender', 'date_of_birth', 'description', 'home')
+
+    def load_maps(self):
+        self.home_ids = set(Home.objects.values_list('id', flat=True))
+
+    def get_maps(self):
+        return {'home_ids': self.home_ids}
+
+    def get_lookups(self):
+        return {'home': PrimaryKeyLookup(Home, known=self.home_ids)}
+
+
+class CatImporter(Importer):
+    """
+    The `breed` column holds the name (or the id) of the breed and the
+    `owner` column the id of the human.
+    """
+    model = Cat
+    fields = ('name', 'gender', 'date_of_birth', 'description',
+              'breed', 'owner')
+
+    def load_maps(self):
+        self.breed_ids = dict(Breed.objects.values_list('name', 'id'))
+        self.owner_ids = set(Human.objects.values_list('id', flat=True))
+
+    def get_maps(self):
+        return {
+            'breed_ids': self.breed_ids,
+            'owner_ids': self.owner_ids,
+        }
+
+    def get_lookups(self):
+        return {
+            'breed': SlugLookup(Breed, 'name', known=self.breed_ids,
+                                allow_pk=True),
+            'owner': PrimaryKeyLookup(Human, known=self.owner_ids),
+        }
+
+
+IMPORTERS = {
+    'home': HomeImporter,
+    'breed': BreedImporter,
+    'human': HumanImporter,
+    'cat': CatImporter,
+}
@@ -0,0 +1,246 @@
+"""
+Background export jobs.
+
+Jobs are written by a pool of `EXPORT_JOB_WORKERS` threads of the web
+process, so no external broker is needed and the request workers only
+create and poll them. With `EXPORT_JOB_WORKERS = 0` a job is written as
+soon as it is submitted (used by the tests).
+
+Each job records the process writing it (`worker`). On its first request
+a process submits again the pending and running jobs of the processes of
+its host which no longer exist (e.g. restarted), as nothing else would
+finish them; the jobs of other hosts are left to those hosts. The
+finished jobs and their files are deleted after
+`EXPORT_JOB_EXPIRING_HOURS`.
+"""
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from rest_framework.request import Request
+
+from catapp import columnar, sharding
+from catapp.models import ExportJob
+from catapp.renderers import CSVRenderer, NDJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+RENDERER_CLASSES = {
+    ExportJob.Format.CSV: CSVRenderer,
+    ExportJob.Format.NDJSON: NDJSONRenderer,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EXPORT_JOB_WORKERS,
+                thread_name_prefix='export-job',
+            )
+        return _executor
+
+
+def get_worker():
+    return '%s:%d' % (socket.gethostname(), os.getpid())
+
+
+def is_worker_alive(worker):
+    """
+    Return whether the process `worker` may still be writing its jobs,
+    which can only be known for the processes of this host.
+    """
+    host, sep, pid = worker.rpartition(':')
+    if not sep or host != socket.gethostname():
+        return bool(sep)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+def submit(job):
+    """
+    Queue `job` to be written by the worker threads.
+    """
+    job.worker = get_worker()
+    job.save(update_fields=['worker'])
+    delete_expired_jobs()
+    if not settings.EXPORT_JOB_WORKERS:
+        run_job(job.pk)
+        return
+    # Only hand the job over once its row is visible to the worker threads
+    transaction.on_commit(
+        lambda: get_executor().submit(run_job_in_thread, job.pk)
+    )
+
+
+def run_job_in_thread(pk):
+    try:
+        run_job(pk)
+    finally:
+        # Each worker thread has its own connection to the database
+        connection.close()
+
+
+def resubmit_orphaned_jobs():
+    """
+    Submit again the pending and running jobs whose process is gone, and
+    return them.
+    """
+    worker = get_worker()
+    jobs = []
+    unfinished = ExportJob.objects.filter(status__in=[
+        ExportJob.Status.PENDING, ExportJob.Status.RUNNING
+    ]).exclude(worker=worker)
+    for job in unfinished:
+        if is_worker_alive(job.worker):
+            continue
+        # Claimed first, in case another process resubmits it too
+        if ExportJob.objects.filter(pk=job.pk, worker=job.worker).update(
+                worker=worker):
+            logger.warning("Export job %d resubmitted, its worker %s is "
+                           "gone", job.pk, job.worker or '-')
+            submit(job)
+            jobs.append(job)
+    return jobs
+
+
+def recover_jobs(sender=None, **kwargs):
+    # Once per process, on its first request
+    from django.core.signals import request_started
+
+    request_started.disconnect(dispatch_uid='export-jobs-recover')
+    resubmit_orphaned_jobs()
+    delete_expired_jobs()
+
+
+def connect_signals():
+    from django.core.signals import request_started
+
+    request_started.connect(recover_jobs, dispatch_uid='export-jobs-recover')
+
+
+def delete_expired_jobs():
+    """
+    Delete the jobs finished more than `EXPORT_JOB_EXPIRING_HOURS` ago
+    with their files, and return the number of jobs deleted.
+    """
+    expired = ExportJob.objects.filter(finished__lt=timezone.now() - timedelta(
+        hours=settings.EXPORT_JOB_EXPIRING_HOURS
+    ))
+    count = 0
+    for job in expired:
+        if job.file:
+            Path(job.file).unlink(missing_ok=True)
+        job.delete()
+        count += 1
+    return count
+
+
+def get_queryset(model_name, query):
+    """
+    Return the queryset of `model_name`, filtered and searched the same way
+    as its list endpoint with the query string `query`. Invalid filters
+    raise the `ValidationError` of the list endpoint.
+    """
+    from catapp.api import VIEWSETS
+
+    viewset = VIEWSETS[model_name](
+        action='list', args=(), kwargs={}, format_kwarg=None
+    )
+    request = HttpRequest()
+    request.method = 'GET'
+    request.GET = QueryDict(query)
+    viewset.request = Request(request)
+    return viewset.filter_queryset(viewset.get_queryset())
+
+
+def get_job_queryset(job):
+    """
+    Return the queryset of the job, filtered and searched the same way as
+    the list endpoint of its model with the query string of the job.
+    """
+    return get_queryset(job.model_name, job.query)
+
+
+def get_job_path(job):
+    return Path(settings.EXPORT_JOB_ROOT) / ('%s-%d.%s' % (
+        job.model_name, job.pk, job.format
+    ))
+
+
+def write_job_file(job, path):
+    """
+    Write the rows of `job` to `path` and return the number of rows.
+    """
+    queryset = get_job_queryset(job)
+    if job.format in RENDERER_CLASSES:
+        columns = [f.attname for f in queryset.model._meta.concrete_fields]
+        rows = sharding.iterator(
+            queryset.values_list(*columns), settings.STREAM_CHUNK_SIZE
+        )
+        counted_rows = CountedRows(rows)
+        renderer = RENDERER_CLASSES[job.format]()
+        with open(path, 'wb') as export_file:
+            for content in renderer.iter_render(columns, counted_rows):
+                export_file.write(content)
+        return counted_rows.count
+
+    if columnar.pyarrow is None:
+        raise RuntimeError("pyarrow is required to export as %s." % job.format)
+    return columnar.write_snapshot(queryset, path, format=job.format)
+
+
+def run_job(pk):
+    job = ExportJob.objects.get(pk=pk)
+    job.status = ExportJob.Status.RUNNING
+    job.save(update_fields=['status'])
+
+    path = get_job_path(job)
+    part_path = path.with_name(path.name + '.part')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        job.num_of_rows = write_job_file(job, part_path)
+        part_path.replace(path)
+    except Exception as exc:
+        logger.exception("Export job %d failed", job.pk)
+        if part_path.exists():
+            part_path.unlink()
+        job.status = ExportJob.Status.FAILED
+        job.error = str(exc)
+    else:
+        job.status = ExportJob.Status.DONE
+        job.file = str(path)
+    job.finished = timezone.now()
+    job.save()
+
+
+class CountedRows:
+    """
+    Iterable counting the rows it hands over.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
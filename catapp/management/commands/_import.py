@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catapp.importers import FORMATS, IMPORTERS
+
+# Number of invalid rows printed at the end of an import
+MAX_PRINTED_ERRORS = 20
+
+
+class ImportCommand(BaseCommand):
+    """
+    Base of the `import_<model>` commands.
+    """
+    model_name = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or NDJSON file to import.")
+        parser.add_argument(
+            '--format', choices=FORMATS, default=None,
+            help="Format of the file (default: from its extension)."
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows validated and inserted at a time "
+                 "(default: IMPORT_BATCH_SIZE)."
+        )
+        parser.add_argument(
+            '--transaction-size', type=int, default=None,
+            help="Rows committed at a time "
+                 "(default: IMPORT_TRANSACTION_SIZE)."
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Processes parsing and validating the rows "
+                 "(default: IMPORT_WORKERS)."
+        )
+
+    def get_importer(self, options):
+        return IMPORTERS[self.model_name](
+            batch_size=options['batch_size'],
+            transaction_size=options['transaction_size'],
+            workers=options['workers'],
+        )
+
+    def report_progress(self, result):
+        elapsed = time.perf_counter() - self.start
+        self.stdout.write("%d rows read, %d imported (%d rows/s)" % (
+            result.num_of_rows, result.num_of_created,
+            result.num_of_rows / elapsed if elapsed else 0
+        ))
+
+    def handle(self, *args, **options):
+        importer = self.get_importer(options)
+        progress = self.report_progress if options['verbosity'] else None
+        self.start = time.perf_counter()
+        try:
+            result = importer.run(
+                options['path'], options['format'], progress=progress
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - self.start
+
+        for number, errors in result.errors[:MAX_PRINTED_ERRORS]:
+            self.stderr.write("Row %d: %s" % (number, errors))
+        if len(result.errors) > MAX_PRINTED_ERRORS:
+            self.stderr.write("... and %d more invalid rows" % (
+                len(result.errors) - MAX_PRINTED_ERRORS
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            "%d of %d rows imported into %s in %.1fs (%d invalid)" % (
+                result.num_of_created, result.num_of_rows,
+                importer.model._meta.label, elapsed, len(result.errors)
+            )
+        ))
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catapp import columnar
+
+EXTENSIONS = {
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the homes, breeds, humans and cats into one columnar file "
+        "per model (Parquet or Arrow IPC), foreign keys as integer columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help="Directory of the files.")
+        parser.add_argument(
+            '--format', choices=sorted(EXTENSIONS), default='parquet',
+            help="Columnar format of the files (default: parquet)."
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows per record batch (default: SNAPSHOT_BATCH_SIZE)."
+        )
+        parser.add_argument(
+            '--models', nargs='+', default=None,
+            choices=[m._meta.model_name for m in columnar.SNAPSHOT_MODELS],
+            help="Models to export (default: all)."
+        )
+
+    def handle(self, *args, **options):
+        if columnar.pyarrow is None:
+            raise CommandError("pyarrow is required to export a snapshot.")
+
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        for model in columnar.SNAPSHOT_MODELS:
+            model_name = model._meta.model_name
+            if options['models'] and model_name not in options['models']:
+                continue
+            path = output_dir / ('%s.%s' % (
+                model_name, EXTENSIONS[options['format']]
+            ))
+            num_of_rows = columnar.write_snapshot(
+                model.objects.all(), path,
+                format=options['format'],
+                batch_size=options['batch_size'],
+            )
+            self.stdout.write("%s: %d rows written to %s" % (
+                model._meta.label, num_of_rows, path
+            ))
@@ -0,0 +1,17 @@
+from django.core.management.base import CommandError
+
+from catapp import sharding
+from catapp.management.commands._import import ImportCommand
+
+
+class Command(ImportCommand):
+    help = "Bulk import cats from a CSV or NDJSON file."
+    model_name = 'cat'
+
+    def handle(self, *args, **options):
+        # The rows are inserted in bulk into the default database
+        if sharding.is_sharded():
+            raise CommandError(
+                "Cats cannot be imported with CAT_SHARDS set."
+            )
+        super().handle(*args, **options)
@@ -0,0 +1,6 @@
+from catapp.management.commands._import import ImportCommand
+
+
+class Command(ImportCommand):
+    help = "Bulk import humans from a CSV or NDJSON file."
+    model_name = 'human'
@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catapp import sharding
+from catapp.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert a synthetic dataset of homes, breeds, humans and cats for "
+        "load testing. The same seed and counts give the same dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--homes', type=int, default=100,
+                            help="Number of homes (default: 100).")
+        parser.add_argument('--breeds', type=int, default=50,
+                            help="Number of breeds (default: 50).")
+        parser.add_argument('--humans', type=int, default=1000,
+                            help="Number of humans (default: 1000).")
+        parser.add_argument('--cats', type=int, default=10000,
+                            help="Number of cats (default: 10000).")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Seed of the random values (default: 0).")
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help="Exponent of the Zipf-like distribution of the cats per "
+                 "breed and humans per home, 0 for uniform (default: 1.0)."
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows inserted at a time (default: IMPORT_BATCH_SIZE)."
+        )
+        parser.add_argument(
+            '--transaction-size', type=int, default=None,
+            help="Rows committed at a time "
+                 "(default: IMPORT_TRANSACTION_SIZE)."
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Delete every home, breed, human and cat first."
+        )
+
+    def report_progress(self, model, count):
+        if count:
+            self.stdout.write("%s: %d rows seeded (%.1fs)" % (
+                model._meta.label, count, time.perf_counter() - self.start
+            ))
+
+    def handle(self, *args, **options):
+        # The cats are inserted into and cleared from the default database
+        if sharding.is_sharded() and (options['cats'] or options['clear']):
+            raise CommandError(
+                "Cats cannot be seeded or cleared with CAT_SHARDS set, "
+                "use --cats 0 without --clear."
+            )
+        seeder = Seeder(
+            seed=options['seed'],
+            skew=options['skew'],
+            batch_size=options['batch_size'],
+            transaction_size=options['transaction_size'],
+        )
+        self.start = time.perf_counter()
+        if options['clear']:
+            seeder.clear()
+        progress = self.report_progress if options['verbosity'] else None
+        try:
+            counts = seeder.run(
+                homes=options['homes'],
+                breeds=options['breeds'],
+                humans=options['humans'],
+                cats=options['cats'],
+                progress=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            "%d rows seeded in %.1fs" % (
+                sum(counts.values()), time.perf_counter() - self.start
+            )
+        ))
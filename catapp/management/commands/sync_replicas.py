@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from catapp.database import backup_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the default database into the read replicas of "
+        "DATABASE_REPLICAS, once or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Seconds between two syncs, 0 to sync once (default: 0)."
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                "No replica configured, set the CATDB_REPLICAS variable."
+            )
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                start = time.perf_counter()
+                backup_database(DEFAULT_DB_ALIAS, alias)
+                self.stdout.write("%s synced in %.1fs" % (
+                    alias, time.perf_counter() - start
+                ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,31 @@
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from catapp.routers import replica_reads
+
+
+class ReadYourWritesMiddleware:
+    """
+    Read from the replicas during the safe requests, except for the
+    clients holding the pin cookie, set for `REPLICA_PIN_SECONDS` by a
+    successful write so they read their writes from the default database
+    until the replicas have caught up.
+
+    The rows of a streamed response are read once the middleware has
+    returned, from the default database.
+    """
+    cookie_name = 'catdb_pin_primary'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        with replica_reads(safe and self.cookie_name not in request.COOKIES):
+            response = self.get_response(request)
+        if not safe and response.status_code < 400:
+            response.set_cookie(
+                self.cookie_name, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+        return response
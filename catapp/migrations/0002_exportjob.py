@@ -0,0 +1,32 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(choices=[('home', 'Home'), ('breed', 'Breed'), ('human', 'Human'), ('cat', 'Cat')], max_length=5)),
+                ('format', models.CharField(choices=[('csv', 'Csv'), ('ndjson', 'Ndjson'), ('parquet', 'Parquet'), ('arrow', 'Arrow')], default='csv', max_length=7)),
+                ('query', models.CharField(blank=True, max_length=300)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=7)),
+                ('num_of_rows', models.PositiveIntegerField(blank=True, null=True)),
+                ('file', models.CharField(blank=True, max_length=300)),
+                ('error', models.TextField(blank=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'catapp_exportjob',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
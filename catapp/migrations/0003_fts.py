@@ -0,0 +1,39 @@
+from django.db import migrations
+
+from catapp.search import fts5_available, get_create_fts_sql, get_drop_fts_sql
+
+# Columns of the FTS table of each table: the `search_fields` of its
+# viewset and the description
+FTS_COLUMNS = {
+    'catapp_home': ('name', 'address'),
+    'catapp_breed': ('name', 'origin', 'description'),
+    'catapp_human': ('name', 'gender', 'date_of_birth', 'description'),
+    'catapp_cat': ('name', 'gender', 'date_of_birth', 'description'),
+}
+
+
+def create_fts_tables(apps, schema_editor):
+    if not fts5_available(schema_editor.connection):
+        return
+    for table, columns in FTS_COLUMNS.items():
+        for sql in get_create_fts_sql(table, columns):
+            schema_editor.execute(sql)
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in FTS_COLUMNS:
+        for sql in get_drop_fts_sql(table):
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catapp', '0002_exportjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.1.14 on 2026-10-19 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catapp', '0003_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cat',
+            index=models.Index(fields=['name'], name='cat_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cat',
+            index=models.Index(fields=['gender'], name='cat_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cat',
+            index=models.Index(fields=['date_of_birth'], name='cat_date_of_birth_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='home',
+            index=models.Index(fields=['name'], name='home_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='home',
+            index=models.Index(fields=['hometype'], name='home_hometype_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='human',
+            index=models.Index(fields=['name'], name='human_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='human',
+            index=models.Index(fields=['gender'], name='human_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='human',
+            index=models.Index(fields=['date_of_birth'], name='human_date_of_birth_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.1.14 on 2026-10-19 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catapp', '0004_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cat',
+            name='cat_gender_idx',
+        ),
+        migrations.AddIndex(
+            model_name='cat',
+            index=models.Index(fields=['gender', 'date_of_birth'], name='cat_gender_dob_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cat',
+            index=models.Index(fields=['breed', 'name'], name='cat_breed_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cat',
+            index=models.Index(fields=['owner', 'name'], name='cat_owner_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='human',
+            index=models.Index(fields=['home', 'name'], name='human_home_name_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-19 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catapp', '0008_idsequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='worker',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.14 on 2026-10-19 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catapp', '0009_exportjob_worker'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cat',
+            index=models.Index(fields=['gender', 'name'], name='cat_gender_name_idx'),
+        ),
+    ]
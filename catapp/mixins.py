@@ -0,0 +1,333 @@
+import contextlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import (DEFAULT_DB_ALIAS, IntegrityError, OperationalError,
+                       transaction)
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from catapp import autocomplete, deletion, sharding, writequeue
+from catapp.database import is_busy_error, retry_on_busy
+from catapp.fast_serializers import DetailUrl
+from catapp.models import IdempotencyKey
+from catapp.renderers import (ARROW_RENDERER_CLASSES, CSVRenderer,
+                              NDJSONRenderer, StreamingJSONRenderer)
+from catapp.utils import iter_chunks
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+class DatabaseBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The database is busy, try again later."
+    default_code = 'database_busy'
+    # Sent as the Retry-After header
+    wait = 1
+
+
+def retry_write(func, using=DEFAULT_DB_ALIAS):
+    """
+    Call `func` through `retry_on_busy`, raising `DatabaseBusy` when the
+    database is still locked after the retries.
+    """
+    try:
+        return retry_on_busy(func, using=using)
+    except OperationalError as exc:
+        if is_busy_error(exc):
+            raise DatabaseBusy() from exc
+        raise
+
+
+class FastListMixin:
+    """
+    Serve `list` through the read-only fast path of
+    `catapp.fast_serializers` when the viewset declares one.
+
+    Passing `?stream=true` skips the pagination and streams the whole
+    result as one JSON array, serialized `STREAM_CHUNK_SIZE` rows at a time.
+    It only applies to the JSON responses, the other renderers get the
+    paginated list.
+    """
+    fast_serializer_class = None
+    stream_param = 'stream'
+
+    def get_fast_serializer(self):
+        return self.fast_serializer_class(
+            context=self.get_serializer_context()
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.get_fast_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = serializer.get_rows(queryset)
+
+        stream = request.query_params.get(self.stream_param, '')
+        if stream.lower() in TRUE_VALUES and isinstance(
+                request.accepted_renderer, JSONRenderer):
+            # Other content types (e.g. MessagePack) get the paginated list
+            return self.stream_list(serializer, rows)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(rows))
+
+    def stream_list(self, serializer, rows):
+        chunk_size = settings.STREAM_CHUNK_SIZE
+        chunks = (
+            serializer.to_representation(chunk)
+            for chunk in iter_chunks(
+                rows.iterator(chunk_size=chunk_size), chunk_size
+            )
+        )
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(
+            renderer.iter_render(chunks),
+            content_type=renderer.media_type
+        )
+
+
+class ExportMixin:
+    """
+    Add an `export` action streaming every row of the filtered queryset as
+    CSV (`?format=csv`, the default), NDJSON (`?format=ndjson`) or, when
+    `pyarrow` is installed, an Arrow IPC stream (`?format=arrow`).
+
+    The rows hold the raw columns of the model, with foreign keys as ids,
+    and are fetched `STREAM_CHUNK_SIZE` at a time.
+    """
+
+    def get_export_columns(self):
+        model = self.get_queryset().model
+        return [field.attname for field in model._meta.concrete_fields]
+
+    @action(detail=False, methods=['get'],
+            renderer_classes=[CSVRenderer, NDJSONRenderer]
+            + ARROW_RENDERER_CLASSES)
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = self.get_export_columns()
+        rows = sharding.iterator(
+            queryset.values_list(*columns), settings.STREAM_CHUNK_SIZE
+        )
+
+        renderer = request.accepted_renderer
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type += '; charset=%s' % renderer.charset
+        response = StreamingHttpResponse(
+            renderer.iter_render(
+                columns, rows, renderer_context=self.get_renderer_context()
+            ),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (
+            queryset.model._meta.verbose_name_plural, renderer.format
+        )
+        return response
+
+
+class AutocompleteMixin:
+    """
+    Add an `autocomplete` action listing the objects whose name starts
+    with `?q=` (case insensitive), at most `?limit=` of them
+    (`AUTOCOMPLETE_LIMIT` by default).
+
+    The names come from the in-memory index of `catapp.autocomplete`, so
+    no query is made once the index of the worker is loaded.
+    """
+    autocomplete_param = 'q'
+    autocomplete_max_limit = 100
+
+    def get_autocomplete_limit(self, request):
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            return settings.AUTOCOMPLETE_LIMIT
+        return max(1, min(limit, self.autocomplete_max_limit))
+
+    @action(detail=False, methods=['get'], pagination_class=None,
+            filter_backends=[])
+    def autocomplete(self, request, *args, **kwargs):
+        prefix = request.query_params.get(self.autocomplete_param, '')
+        if not prefix.strip():
+            return Response([])
+
+        model = self.get_queryset().model
+        matches = autocomplete.get_index(model).search(
+            prefix.strip(), self.get_autocomplete_limit(request)
+        )
+        detail_url = DetailUrl(
+            '%s:%s-detail' % (request.resolver_match.namespace,
+                              self.basename),
+            request
+        )
+        return Response([
+            {'url': detail_url(pk), 'name': name} for pk, name in matches
+        ])
+
+
+class ShardedMixin:
+    """
+    Look the object of the detail views up in every shard of
+    `catapp.sharding`, its breed being unknown until it is found.
+    """
+
+    def get_object(self):
+        if not sharding.is_sharded():
+            return super().get_object()
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = sharding.ShardedQuerySet(queryset).get(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (queryset.model.DoesNotExist, TypeError, ValueError,
+                DjangoValidationError):
+            raise Http404(
+                "No %s matches the given query." % (
+                    queryset.model._meta.object_name
+                )
+            )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class FastDeleteMixin:
+    """
+    Delete the object of `destroy` through `catapp.deletion.delete`, with
+    set-based DELETEs of its cascade when possible, and send the number of
+    rows deleted per model in the `Deleted-Objects` header.
+    """
+    deleted_header = 'Deleted-Objects'
+
+    def destroy(self, request, *args, **kwargs):
+        self.deleted_counts = None
+        response = super().destroy(request, *args, **kwargs)
+        if self.deleted_counts:
+            response[self.deleted_header] = deletion.get_counts_header(
+                self.deleted_counts
+            )
+        return response
+
+    def perform_destroy(self, instance):
+        total, self.deleted_counts = deletion.delete(instance)
+
+
+class QueuedWriteMixin:
+    """
+    Run the writes of `create`, `update` and `destroy` through the writer
+    thread of `catapp.writequeue` when it is enabled.
+    """
+
+    def perform_create(self, serializer):
+        writequeue.execute(lambda: super(QueuedWriteMixin, self)
+                           .perform_create(serializer))
+
+    def perform_update(self, serializer):
+        writequeue.execute(lambda: super(QueuedWriteMixin, self)
+                           .perform_update(serializer))
+
+    def perform_destroy(self, instance):
+        writequeue.execute(lambda: super(QueuedWriteMixin, self)
+                           .perform_destroy(instance))
+
+
+class RetryWriteMixin:
+    """
+    Run `create`, `update` (and `partial_update`) and `destroy` in a
+    transaction retried by `retry_write` while the database is locked.
+
+    A write sent with an `Idempotency-Key` header by an authenticated user
+    is run at most once per key within `IDEMPOTENCY_KEY_EXPIRING_HOURS`:
+    its response is stored in the same transaction and replayed to the
+    requests sending the key again. With the write queue, whose writes are
+    committed by the writer thread, the response is stored once the write
+    is committed.
+    """
+    idempotency_header = 'Idempotency-Key'
+
+    def create(self, request, *args, **kwargs):
+        return self.run_write(super().create, request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        return self.run_write(super().update, request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        return self.run_write(super().destroy, request, *args, **kwargs)
+
+    def get_idempotency_key(self, request):
+        if not request.user.is_authenticated:
+            return None
+        return request.headers.get(self.idempotency_header) or None
+
+    def get_idempotent_response(self, request, key):
+        """
+        Return the stored response of `key`, or None if it is unused.
+        """
+        expired = timezone.now() - timedelta(
+            hours=settings.IDEMPOTENCY_KEY_EXPIRING_HOURS
+        )
+        keys = IdempotencyKey.objects.filter(user=request.user, key=key)
+        keys.filter(created__lt=expired).delete()
+        stored = keys.first()
+        if stored is None:
+            return None
+        if (stored.method, stored.path) != (request.method, request.path):
+            raise ValidationError({self.idempotency_header: [
+                "Key already used for another request."
+            ]})
+        headers = {'Idempotent-Replayed': 'true'}
+        if stored.status_code == status.HTTP_201_CREATED:
+            headers.update(self.get_success_headers(stored.response))
+        return Response(stored.response, status=stored.status_code,
+                        headers=headers)
+
+    def save_idempotent_response(self, request, key, response):
+        IdempotencyKey.objects.create(
+            user=request.user, key=key, method=request.method,
+            path=request.path, status_code=response.status_code,
+            response=response.data,
+        )
+
+    def run_write(self, action, request, *args, **kwargs):
+        key = self.get_idempotency_key(request)
+        if key is not None:
+            response = self.get_idempotent_response(request, key)
+            if response is not None:
+                return response
+
+        queued = settings.WRITE_QUEUE_ENABLED
+
+        def write():
+            # The writes of the write queue are committed by its thread
+            atomic = contextlib.nullcontext() if queued \
+                else transaction.atomic()
+            with atomic:
+                response = action(request, *args, **kwargs)
+                if key is not None:
+                    writequeue.execute(lambda: self.save_idempotent_response(
+                        request, key, response
+                    ))
+            return response
+
+        try:
+            return retry_write(write)
+        except IntegrityError:
+            # The same key sent by a concurrent request was stored first
+            response = key and self.get_idempotent_response(request, key)
+            if not response:
+                raise
+            return response
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from django.core.validators import ValidationError
@@ -39,6 +41,11 @@ class Home(models.Model):
     class Meta:
         ordering = ['-id']
         db_table = "%s_%s" % ("catapp", "home")
+        # Indexes of the filters of `catapp.filters`
+        indexes = [
+            models.Index(fields=['name'], name='home_name_idx'),
+            models.Index(fields=['hometype'], name='home_hometype_idx'),
+        ]
 
 
 class Breed(models.Model):
@@ -83,6 +90,26 @@ class Human(models.Model):
     class Meta:
         ordering = ['name']
         db_table = "%s_%s" % ("catapp", "human")
+        # Indexes of the filters of `catapp.filters`, and of the humans of a
+        # home in the order of the model
+        indexes = [
+            models.Index(fields=['name'], name='human_name_idx'),
+            models.Index(fields=['gender'], name='human_gender_idx'),
+            models.Index(fields=['date_of_birth'],
+                         name='human_date_of_birth_idx'),
+            models.Index(fields=['home', 'name'], name='human_home_name_idx'),
+        ]
+
+
+class CatQuerySet(models.QuerySet):
+
+    def create(self, **kwargs):
+        # Let the routers pick the database of the new cat from the cat
+        # itself (its shard, see `catapp.sharding`), unless one is chosen
+        obj = self.model(**kwargs)
+        self._for_write = True
+        obj.save(force_insert=True, using=self._db)
+        return obj
 
 
 class Cat(models.Model):
@@ -105,9 +132,129 @@ class Cat(models.Model):
     owner = models.ForeignKey(
         'Human', related_name='cats', on_delete=models.CASCADE)
 
+    objects = CatQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
     class Meta:
         ordering = ['name']
         db_table = "%s_%s" % ("catapp", "cat")
+        # Indexes of the filters of `catapp.filters`, and of the cats of a
+        # breed, an owner or a gender in the order of the model. A gender
+        # with a range of dates of birth is filtered through (gender,
+        # date_of_birth), the matching cats being then sorted by name.
+        indexes = [
+            models.Index(fields=['name'], name='cat_name_idx'),
+            models.Index(fields=['date_of_birth'],
+                         name='cat_date_of_birth_idx'),
+            models.Index(fields=['gender', 'date_of_birth'],
+                         name='cat_gender_dob_idx'),
+            models.Index(fields=['gender', 'name'],
+                         name='cat_gender_name_idx'),
+            models.Index(fields=['breed', 'name'], name='cat_breed_name_idx'),
+            models.Index(fields=['owner', 'name'], name='cat_owner_name_idx'),
+        ]
+
+
+class IdSequence(models.Model):
+    """
+    Last id given out for the rows of a model spread over several
+    databases (see `catapp.sharding`).
+    name: label of the model.
+    value: last id given out.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return "%s (%d)" % (self.name, self.value)
+
+    class Meta:
+        db_table = "%s_%s" % ("catapp", "idsequence")
+
+
+class ExportJob(models.Model):
+    """
+    Export of a model into a file, written in the background.
+    model_name: Name of the exported model (home|breed|human|cat).
+    format: format of the file (csv|ndjson|parquet|arrow).
+    query: query string of the filters and search applied to the model.
+    status: status of the job (pending|running|done|failed).
+    num_of_rows: number of rows written once the job is done.
+    file: path of the written file.
+    error: error message when the job failed.
+    worker: host and pid of the process writing the job.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        DONE = 'done'
+        FAILED = 'failed'
+
+    class Format(models.TextChoices):
+        CSV = 'csv'
+        NDJSON = 'ndjson'
+        PARQUET = 'parquet'
+        ARROW = 'arrow'
+
+    class ModelName(models.TextChoices):
+        HOME = 'home'
+        BREED = 'breed'
+        HUMAN = 'human'
+        CAT = 'cat'
+
+    model_name = models.CharField(max_length=5, choices=ModelName.choices)
+    format = models.CharField(
+        max_length=7, choices=Format.choices, default=Format.CSV
+    )
+    query = models.CharField(max_length=300, blank=True)
+    status = models.CharField(
+        max_length=7, choices=Status.choices, default=Status.PENDING
+    )
+    num_of_rows = models.PositiveIntegerField(null=True, blank=True)
+    file = models.CharField(max_length=300, blank=True)
+    error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+
+    def __str__(self):
+        return "%s.%s (%s)" % (self.model_name, self.format, self.status)
+
+    class Meta:
+        ordering = ['-id']
+        db_table = "%s_%s" % ("catapp", "exportjob")
+
+
+class IdempotencyKey(models.Model):
+    """
+    Response of a write sent with an `Idempotency-Key` header, replayed
+    when the same user sends the same key again.
+    user: user who sent the write.
+    key: value of the `Idempotency-Key` header.
+    method, path: request the key was used for.
+    status_code, response: status code and data of the response.
+    """
+    # The users may be in another database (`AUTH_DATABASE`), where the
+    # keys can neither be constrained nor deleted with their user; they
+    # expire instead
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.DO_NOTHING,
+                             db_constraint=False)
+    key = models.CharField(max_length=255)
+    method = models.CharField(max_length=7)
+    path = models.CharField(max_length=300)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return "%s %s (%s)" % (self.method, self.path, self.key)
+
+    class Meta:
+        db_table = "%s_%s" % ("catapp", "idempotencykey")
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'],
+                                    name='idempotencykey_user_key_uniq'),
+        ]
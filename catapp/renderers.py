@@ -0,0 +1,233 @@
+import csv
+import io
+import math
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+from catapp import columnar
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def has_non_finite_float(data):
+    """
+    Return whether `data` holds a NaN or an infinite float, in a dict, a
+    list or a tuple.
+    """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return False
+    return any(has_non_finite_float(value) for value in data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that uses `orjson` when it is installed and falls back to
+    the stdlib `json` module of `JSONRenderer` otherwise.
+
+    The output is byte-identical to `JSONRenderer` for strings, integers,
+    booleans, None and the types converted by the encoder of DRF (dates,
+    times, decimals, urls...), while pretty printing (e.g. by the
+    browsable API) and anything `orjson` refuses use the stdlib. Finite
+    floats are written in the shortest form of `orjson` (`1e16` rather
+    than `1e+16`), which parses to the same value; NaN and infinities,
+    written as `null` by `orjson`, are left to the stdlib, which rejects
+    them under `STRICT_JSON`.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None \
+                or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in ret and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same as `JSONRenderer`, U+2028 and U+2029 are always escaped
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028') \
+                .replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    """
+    JSON renderer that renders a list chunk by chunk, so a large list never
+    has to be held in memory as a whole.
+    """
+
+    def iter_render(self, chunks, renderer_context=None):
+        """
+        Yield the bytes of one JSON array made from `chunks`, an iterable of
+        lists of items.
+        """
+        yield b'['
+        first = True
+        for chunk in chunks:
+            if not chunk:
+                continue
+            # Strip the brackets of each rendered chunk and join them
+            content = self.render(chunk, renderer_context=renderer_context)
+            if not first:
+                yield b','
+            yield content[1:-1]
+            first = False
+        yield b']'
+
+
+def render_as_json(data, renderer_context=None):
+    """
+    Render `data` as JSON for the renderers of the export rows, which only
+    stream rows through `iter_render`: anything else given to `render`
+    (e.g. an error) is sent as JSON, with the JSON content type.
+    """
+    if data is None:
+        return b''
+    response = (renderer_context or {}).get('response')
+    if response is not None:
+        response['Content-Type'] = FastJSONRenderer.media_type
+    return FastJSONRenderer().render(data)
+
+
+class EchoBuffer:
+    """
+    File-like object handing back whatever is written to it, so `csv.writer`
+    can produce one row at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer which serializes rows of values to CSV.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def iter_render(self, columns, rows, renderer_context=None):
+        """
+        Yield the encoded CSV lines of the `columns` header and of every
+        row (a sequence of values in the same order) in `rows`.
+        """
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(columns).encode(self.charset)
+        for row in rows:
+            yield writer.writerow(row).encode(self.charset)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return render_as_json(data, renderer_context)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer which serializes rows of values to newline delimited JSON,
+    one object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def __init__(self):
+        self.json_renderer = FastJSONRenderer()
+
+    def iter_render(self, columns, rows, renderer_context=None):
+        """
+        Yield one JSON object line per row (a sequence of values in the same
+        order as `columns`) in `rows`.
+        """
+        for row in rows:
+            yield self.json_renderer.render(dict(zip(columns, row))) + b'\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return b''.join(
+            self.json_renderer.render(item) + b'\n' for item in items
+        )
+
+
+class ArrowStreamRenderer(BaseRenderer):
+    """
+    Renderer which serializes rows of values to an Apache Arrow IPC stream,
+    typed after the model of the view and built in columnar batches.
+    """
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+
+    def iter_render(self, columns, rows, renderer_context=None):
+        """
+        Yield the schema then one record batch message at a time.
+        """
+        model = renderer_context['view'].get_queryset().model
+        schema = columnar.get_schema(model, columns)
+        sink = io.BytesIO()
+        with columnar.pyarrow.ipc.new_stream(sink, schema) as writer:
+            for batch in columnar.iter_record_batches(schema, rows):
+                writer.write_batch(batch)
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        yield sink.getvalue()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return render_as_json(data, renderer_context)
+
+
+# Arrow is only offered to the clients when `pyarrow` is installed
+ARROW_RENDERER_CLASSES = [ArrowStreamRenderer] if columnar.pyarrow else []
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack.
+
+    Values that MessagePack cannot carry (dates, times, decimals, lazy
+    strings...) are converted by the JSON encoder of DRF, so the fields
+    have the same semantics as in JSON.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = encoders.JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(
+            data, default=self.encoder_class().default, use_bin_type=True
+        )
+
+
+# MessagePack is only offered to the clients when `msgpack` is installed
+MSGPACK_RENDERER_CLASSES = [MessagePackRenderer] if msgpack else []
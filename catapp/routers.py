@@ -0,0 +1,171 @@
+"""
+Database routers.
+
+`AuthRouter` keeps the users, tokens and sessions (with the content types
+and admin log they refer to) in the `AUTH_DATABASE`, so logins and
+catalogue writes do not wait on the same SQLite write lock.
+
+`CatShardRouter` writes the cats to the shard of their breed and reads
+the cats of a breed from it (see `catapp.sharding`).
+
+`ReplicaRouter` sends the reads of the homes, breeds, humans and cats to
+a database of `DATABASE_REPLICAS`, but only within `replica_reads()`,
+which `ReadYourWritesMiddleware` enters for the safe requests of clients
+that did not write recently. The replica is picked at random once per
+block, so every read of a request sees the same copy. Every other read (the
+writing requests, the commands, the worker threads) and every write goes
+to the default database.
+"""
+import contextlib
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Apps of the auth database
+AUTH_APPS = {'auth', 'authtoken', 'sessions', 'contenttypes', 'admin'}
+# Models of the other databases with a foreign key to the users (without
+# constraint)
+USER_RELATED_MODELS = {'catapp.idempotencykey'}
+
+# Models whose reads may go to a replica
+REPLICA_MODELS = {'catapp.home', 'catapp.breed', 'catapp.human', 'catapp.cat'}
+
+_state = threading.local()
+
+
+@contextlib.contextmanager
+def replica_reads(enabled=True):
+    """
+    Route the reads of the current thread to one random replica while in
+    the block (the replica of the enclosing block, if any).
+    """
+    previous = (reads_from_replicas(), get_replica())
+    replica = previous[1]
+    if enabled and replica is None and settings.DATABASE_REPLICAS:
+        replica = random.choice(settings.DATABASE_REPLICAS)
+    _state.replica_reads, _state.replica = enabled, replica
+    try:
+        yield
+    finally:
+        _state.replica_reads, _state.replica = previous
+
+
+def reads_from_replicas():
+    return getattr(_state, 'replica_reads', False)
+
+
+def get_replica():
+    """
+    Return the replica picked by the current `replica_reads()`, if any.
+    """
+    return getattr(_state, 'replica', None)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (model._meta.label_lower not in REPLICA_MODELS
+                or not reads_from_replicas()):
+            return None
+        return get_replica()
+
+    def db_for_write(self, model, **hints):
+        if model._meta.label_lower in REPLICA_MODELS:
+            # Not the database the instance was read from
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the default database
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class AuthRouter:
+
+    def get_database(self, app_label):
+        if settings.AUTH_DATABASE and app_label in AUTH_APPS:
+            return settings.AUTH_DATABASE
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self.get_database(model._meta.app_label)
+
+    def db_for_write(self, model, **hints):
+        return self.get_database(model._meta.app_label)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not settings.AUTH_DATABASE:
+            return None
+        labels = {obj1._meta.label_lower, obj2._meta.label_lower}
+        apps = {obj1._meta.app_label, obj2._meta.app_label}
+        if apps <= AUTH_APPS:
+            return True
+        if apps & AUTH_APPS:
+            return bool(labels & USER_RELATED_MODELS)
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not settings.AUTH_DATABASE:
+            return None
+        if app_label in AUTH_APPS:
+            return db == settings.AUTH_DATABASE
+        if db == settings.AUTH_DATABASE:
+            return False
+        return None
+
+
+class CatShardRouter:
+
+    def get_cat_database(self, instance):
+        from catapp import sharding
+
+        if instance is None:
+            return None
+        if instance._meta.label_lower == 'catapp.cat':
+            return sharding.get_shard(instance.breed_id)
+        if instance._meta.label_lower == 'catapp.breed':
+            return sharding.get_shard(instance.pk)
+        return None
+
+    def db_for_read(self, model, **hints):
+        if not settings.CAT_SHARDS:
+            return None
+        instance = hints.get('instance')
+        if model._meta.label_lower == 'catapp.cat':
+            return self.get_cat_database(instance)
+        if (instance is not None
+                and instance._state.db in settings.CAT_SHARDS):
+            # Breed or owner of a cat read from a shard
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        if not settings.CAT_SHARDS:
+            return None
+        if model._meta.label_lower == 'catapp.cat':
+            return self.get_cat_database(hints.get('instance'))
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not settings.CAT_SHARDS:
+            return None
+        if 'catapp.cat' in {obj1._meta.label_lower, obj2._meta.label_lower}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.CAT_SHARDS:
+            # Shards hold the (empty) tables of catapp but only the cats
+            # are written there
+            return app_label == 'catapp'
+        return None
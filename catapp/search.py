@@ -0,0 +1,129 @@
+"""
+Full-text search of the viewsets with SQLite FTS5.
+
+Each searchable table has an external content FTS5 table,
+`<table>_fts`, indexing the `search_fields` of its viewset and the
+description, kept in sync by triggers (so `bulk_create` and raw inserts
+are indexed as well). The tables and triggers are created by a migration
+on SQLite builds with FTS5; a migration remaking one of the tables has to
+create its triggers again.
+
+`FTSSearchFilter` replaces `rest_framework.filters.SearchFilter`: every
+search term is matched as a prefix and the results are ordered by their
+BM25 rank. Without the FTS table (another database or an SQLite build
+without FTS5), it falls back to the `icontains` lookups of the
+`SearchFilter`.
+"""
+import functools
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+# Prefix lengths indexed by the FTS tables, speeding up short prefixes
+FTS_PREFIXES = '2 3'
+
+
+def get_fts_table(table):
+    return '%s_fts' % table
+
+
+def fts5_available(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return ('ENABLE_FTS5',) in cursor.fetchall()
+
+
+def get_create_fts_sql(table, columns):
+    """
+    Return the statements creating the FTS table of `table` on `columns`,
+    its triggers, and indexing the existing rows.
+    """
+    fts_table = get_fts_table(table)
+    names = ', '.join(columns)
+    new_values = ', '.join('new.%s' % column for column in columns)
+    old_values = ', '.join('old.%s' % column for column in columns)
+    delete = (
+        "INSERT INTO {fts}({fts}, rowid, {names}) "
+        "VALUES ('delete', old.id, {old_values});"
+    )
+    insert = (
+        "INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    )
+    statements = [
+        "CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        "content='{table}', content_rowid='id', prefix='{prefixes}')",
+        "CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        + insert + " END",
+        "CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        + delete + " END",
+        "CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+        + delete + " " + insert + " END",
+        "INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    return [
+        statement.format(
+            fts=fts_table, table=table, names=names, prefixes=FTS_PREFIXES,
+            new_values=new_values, old_values=old_values,
+        )
+        for statement in statements
+    ]
+
+
+def get_drop_fts_sql(table):
+    fts_table = get_fts_table(table)
+    return [
+        "DROP TRIGGER IF EXISTS %s_%s" % (fts_table, suffix)
+        for suffix in ('ai', 'ad', 'au')
+    ] + ["DROP TABLE IF EXISTS %s" % fts_table]
+
+
+@functools.lru_cache(maxsize=None)
+def has_fts_table(alias, database_name, table):
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return False
+    return get_fts_table(table) in connection.introspection.table_names()
+
+
+def get_match_query(terms):
+    """
+    Return the FTS5 query matching every term as a prefix.
+    """
+    return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+
+class FTSSearchFilter(SearchFilter):
+    """
+    `SearchFilter` backed by the FTS5 table of the model.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not getattr(view, 'search_fields', None):
+            return queryset
+
+        table = queryset.model._meta.db_table
+        connection = connections[queryset.db]
+        if not has_fts_table(queryset.db, connection.settings_dict['NAME'],
+                             table):
+            return super().filter_queryset(request, queryset, view)
+
+        quote_name = connection.ops.quote_name
+        fts_table = quote_name(get_fts_table(table))
+        return queryset.extra(
+            tables=[get_fts_table(table)],
+            where=[
+                '%s.rowid = %s.%s' % (
+                    fts_table, quote_name(table),
+                    quote_name(queryset.model._meta.pk.column)
+                ),
+                '%s MATCH %%s' % fts_table,
+            ],
+            params=[get_match_query(search_terms)],
+        ).order_by(
+            RawSQL('bm25(%s)' % fts_table, ()),
+            *queryset.query.order_by or queryset.model._meta.ordering
+        )
@@ -0,0 +1,240 @@
+"""
+Synthetic datasets for load testing.
+
+Unlike `catapp.factories`, which creates rows one at a time, `Seeder`
+generates whole batches of rows from pools of fake values built once,
+and inserts them with `executemany` under explicit ids, so no id has to
+be read back to link the foreign keys. Every choice is drawn from a
+random generator seeded per model, so the same seed and counts always
+give the same dataset.
+
+The number of cats per breed and of humans per home follow a Zipf-like
+distribution: the k-th most popular breed (home) is picked with a weight
+of 1 / k ** skew.
+"""
+import datetime
+import itertools
+import random
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from faker import Faker
+
+from catapp.models import Breed, Cat, Gender, Home, Human
+
+# Number of fake values of each pool
+POOL_SIZE = 1000
+
+
+def get_date_pool(start, end):
+    """
+    Return every date between `start` and `end` in the ISO format.
+    """
+    return [
+        datetime.date.fromordinal(ordinal).isoformat()
+        for ordinal in range(start.toordinal(), end.toordinal() + 1)
+    ]
+
+
+def get_cum_weights(n, skew):
+    """
+    Return the cumulated weights of a Zipf-like distribution over `n`
+    items.
+    """
+    return list(itertools.accumulate(
+        1 / (rank ** skew) for rank in range(1, n + 1)
+    ))
+
+
+class Seeder:
+    """
+    Insert `homes`, `breeds`, `humans` and `cats` synthetic rows.
+
+    The foreign keys point to the rows seeded in the same run, or to the
+    existing rows when none of the model are seeded.
+    """
+
+    def __init__(self, seed=0, skew=1.0, batch_size=None,
+                 transaction_size=None):
+        self.seed = seed
+        self.skew = skew
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.transaction_size = \
+            transaction_size or settings.IMPORT_TRANSACTION_SIZE
+        self.faker = Faker()
+        self.faker.seed_instance(seed)
+        self.build_pools()
+
+    def build_pools(self):
+        faker = self.faker
+        self.names = [faker.name()[:30] for _ in range(POOL_SIZE)]
+        self.words = [faker.word().title() for _ in range(POOL_SIZE)]
+        self.addresses = [faker.address()[:300] for _ in range(POOL_SIZE)]
+        self.countries = [faker.country()[:30] for _ in range(POOL_SIZE)]
+        self.descriptions = [
+            faker.text(max_nb_chars=300) for _ in range(POOL_SIZE)
+        ]
+        self.human_dates = get_date_pool(
+            datetime.date(1990, 1, 1), datetime.date(2019, 12, 31)
+        )
+        self.cat_dates = get_date_pool(
+            datetime.date(2008, 1, 1), datetime.date(2020, 5, 31)
+        )
+        self.genders = [value for value, label in Gender.choices]
+        self.hometypes = [value for value, label in Home.HomeType.choices]
+
+    def get_random(self, model):
+        # Seeded per model, so the rows of a model do not depend on the
+        # number of rows seeded for the others
+        return random.Random('%d-%s' % (self.seed, model._meta.model_name))
+
+    def get_skewed_choice(self, rnd, ids):
+        """
+        Return a function picking `k` of `ids` with a Zipf-like skew, the
+        most popular ones spread over the ids.
+        """
+        ids = list(ids)
+        rnd.shuffle(ids)
+        cum_weights = get_cum_weights(len(ids), self.skew)
+        return lambda k: rnd.choices(ids, cum_weights=cum_weights, k=k)
+
+    def get_target_ids(self, model, seeded_ids):
+        if seeded_ids:
+            return seeded_ids
+        ids = list(model.objects.values_list('id', flat=True))
+        if not ids:
+            raise ValueError(
+                "No %s to link to, seed some first."
+                % model._meta.verbose_name_plural
+            )
+        return ids
+
+    def run(self, homes=0, breeds=0, humans=0, cats=0, progress=None):
+        """
+        Seed the rows and return the number of rows inserted per model,
+        calling `progress` with the model and its count once seeded.
+        """
+        counts = {}
+        home_ids = self.insert(Home, homes, self.iter_home_rows)
+        counts[Home] = len(home_ids)
+        breed_ids = self.insert(Breed, breeds, self.iter_breed_rows)
+        counts[Breed] = len(breed_ids)
+        if progress:
+            progress(Home, counts[Home])
+            progress(Breed, counts[Breed])
+
+        if humans:
+            home_ids = self.get_target_ids(Home, home_ids)
+        human_ids = self.insert(Human, humans, self.iter_human_rows,
+                                home_ids=home_ids)
+        counts[Human] = len(human_ids)
+        if progress:
+            progress(Human, counts[Human])
+
+        if cats:
+            breed_ids = self.get_target_ids(Breed, breed_ids)
+            human_ids = self.get_target_ids(Human, human_ids)
+        cat_ids = self.insert(Cat, cats, self.iter_cat_rows,
+                              breed_ids=breed_ids, owner_ids=human_ids)
+        counts[Cat] = len(cat_ids)
+        if progress:
+            progress(Cat, counts[Cat])
+        return counts
+
+    def insert(self, model, count, iter_rows, **kwargs):
+        """
+        Insert `count` rows of `model` and return their ids.
+        """
+        if not count:
+            return range(0)
+        first_id = (model.objects.order_by('-id').values_list(
+            'id', flat=True).first() or 0) + 1
+        ids = range(first_id, first_id + count)
+
+        columns = [field.column for field in model._meta.concrete_fields]
+        sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+            connection.ops.quote_name(model._meta.db_table),
+            ", ".join(connection.ops.quote_name(c) for c in columns),
+            ", ".join(["%s"] * len(columns)),
+        )
+        rnd = self.get_random(model)
+        rows = iter_rows(rnd, ids, **kwargs)
+        for start in range(0, count, self.transaction_size):
+            stop = min(start + self.transaction_size, count)
+            with transaction.atomic(), connection.cursor() as cursor:
+                for batch_start in range(start, stop, self.batch_size):
+                    batch_size = min(self.batch_size, stop - batch_start)
+                    cursor.executemany(
+                        sql, list(itertools.islice(rows, batch_size))
+                    )
+        # Move the id sequence past the explicit ids (a no-op on SQLite)
+        with connection.cursor() as cursor:
+            for reset_sql in connection.ops.sequence_reset_sql(
+                    no_style(), [model]):
+                cursor.execute(reset_sql)
+        return ids
+
+    def clear(self):
+        """
+        Delete every home, breed, human and cat, without loading them.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in (Cat, Human, Breed, Home):
+                cursor.execute("DELETE FROM %s" % connection.ops.quote_name(
+                    model._meta.db_table
+                ))
+
+    def iter_batches(self, ids):
+        for start in range(0, len(ids), self.batch_size):
+            yield ids[start:start + self.batch_size]
+
+    def iter_home_rows(self, rnd, ids):
+        for batch in self.iter_batches(ids):
+            k = len(batch)
+            yield from zip(
+                batch,
+                ("Home %d" % pk for pk in batch),
+                rnd.choices(self.addresses, k=k),
+                rnd.choices(self.hometypes, k=k),
+            )
+
+    def iter_breed_rows(self, rnd, ids):
+        for batch in self.iter_batches(ids):
+            k = len(batch)
+            # The id keeps the names unique
+            yield from zip(
+                batch,
+                ("%s %d" % (word[:18], pk) for word, pk in zip(
+                    rnd.choices(self.words, k=k), batch)),
+                rnd.choices(self.countries, k=k),
+                rnd.choices(self.descriptions, k=k),
+            )
+
+    def iter_human_rows(self, rnd, ids, home_ids):
+        choose_homes = self.get_skewed_choice(rnd, home_ids)
+        for batch in self.iter_batches(ids):
+            k = len(batch)
+            yield from zip(
+                batch,
+                rnd.choices(self.names, k=k),
+                rnd.choices(self.genders, k=k),
+                rnd.choices(self.human_dates, k=k),
+                rnd.choices(self.descriptions, k=k),
+                choose_homes(k),
+            )
+
+    def iter_cat_rows(self, rnd, ids, breed_ids, owner_ids):
+        choose_breeds = self.get_skewed_choice(rnd, breed_ids)
+        owner_ids = list(owner_ids)
+        for batch in self.iter_batches(ids):
+            k = len(batch)
+            yield from zip(
+                batch,
+                rnd.choices(self.names, k=k),
+                rnd.choices(self.genders, k=k),
+                rnd.choices(self.cat_dates, k=k),
+                rnd.choices(self.descriptions, k=k),
+                choose_breeds(k),
+                rnd.choices(owner_ids, k=k),
+            )
@@ -1,6 +1,7 @@
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
 from rest_framework.reverse import reverse
-from catapp.models import Breed, Cat, Home, Human
+from catapp import columnar, jobs, sharding
+from catapp.models import Breed, Cat, ExportJob, Home, Human
 
 
 class HomeSerializer(serializers.HyperlinkedModelSerializer):
@@ -23,16 +24,23 @@ class BreedSerializer(serializers.HyperlinkedModelSerializer):
     homes = serializers.SerializerMethodField('get_breed_homes')
 
     def get_breed_homes(self, obj):
-        # Retrieving all unique owners whose cat's is the current breed type
-        all_owners = Cat.objects.filter(breed=obj.id).values_list(
-            'owner', flat=True
-        ).distinct()
-        # Retrieving all unique home among the owners
-        homes = set(
-            Home.objects.filter(human__id__in=all_owners)
-            .order_by('-id')
-            .values_list('id', flat=True)
-        )
+        if 'cats' in getattr(obj, '_prefetched_objects_cache', {}):
+            # Cats prefetched with their owners, e.g. by
+            # `prefetch_related('cats__owner')`
+            home_ids = sorted(
+                {cat.owner.home_id for cat in obj.cats.all()}, reverse=True
+            )
+        else:
+            # Retrieving all unique owners whose cat's is the current breed
+            # type, through `obj.cats` so they are read from its shard
+            all_owners = obj.cats.values_list('owner', flat=True).distinct()
+            if sharding.is_sharded():
+                # No subquery across databases
+                all_owners = list(all_owners)
+            # Retrieving all unique home among the owners
+            home_ids = Home.objects.filter(human__id__in=all_owners) \
+                .order_by('-id').values_list('id', flat=True)
+        homes = set(home_ids)
         # Convert the retrieved home ids into hyperlinks
         result = [
             reverse(
@@ -61,6 +69,11 @@ class HumanSerializer(serializers.HyperlinkedModelSerializer):
         view_name='catapp:cat-detail',
     )
 
+    def to_representation(self, instance):
+        # The cats of a human may be in any shard
+        sharding.prefetch_cats(instance, 'owner')
+        return super().to_representation(instance)
+
     class Meta:
         model = Human
         fields = '__all__'
@@ -87,7 +100,8 @@ class CatSerializer(serializers.HyperlinkedModelSerializer):
         # Assume that the Cat-Human is Many-to-One relationship
         # and Human-Home is Many-to-One relationship, hence one cat
         # will only has one home related to it
-        cat_home = Human.objects.get(id=obj.owner_id).home_id
+        # Through `obj.owner` so a `select_related('owner')` is used
+        cat_home = obj.owner.home_id
         result = reverse(
             'catapp:home-detail',
             args=[cat_home], 
@@ -98,3 +112,46 @@ class CatSerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Cat
         fields = '__all__'
+
+
+class ExportJobSerializer(serializers.HyperlinkedModelSerializer):
+    """
+    Expose the download link of the job once its file is written
+    """
+    url = serializers.HyperlinkedIdentityField(
+        view_name="catapp:exportjob-detail"
+    )
+    download = serializers.SerializerMethodField('get_download_url')
+
+    def get_download_url(self, obj):
+        if obj.status != ExportJob.Status.DONE:
+            return None
+        return reverse(
+            'catapp:exportjob-download',
+            args=[obj.id],
+            request=self.context['request']
+        )
+
+    def validate_format(self, value):
+        columnar_formats = (ExportJob.Format.PARQUET, ExportJob.Format.ARROW)
+        if value in columnar_formats and columnar.pyarrow is None:
+            raise serializers.ValidationError(
+                "Format %s requires pyarrow to be installed." % value
+            )
+        return value
+
+    def validate(self, attrs):
+        # Same filters as the list endpoint of the model, so an invalid
+        # query is rejected now rather than failing the job
+        try:
+            jobs.get_queryset(attrs['model_name'], attrs.get('query', ''))
+        except exceptions.ValidationError as exc:
+            raise serializers.ValidationError({'query': exc.detail})
+        return attrs
+
+    class Meta:
+        model = ExportJob
+        exclude = ['file', 'worker']
+        read_only_fields = [
+            'status', 'num_of_rows', 'error', 'created', 'finished'
+        ]
@@ -0,0 +1,307 @@
+"""
+Sharding of the cats by breed.
+
+With `CAT_SHARDS`, the cats are not stored in the default database but
+spread over the databases of `CAT_SHARDS`, the cats of a breed all being
+in the shard `breed_id % len(CAT_SHARDS)`. The homes, breeds and humans
+stay in the default database, so the shards hold the cats without
+foreign key constraints (`PRAGMA foreign_keys = off`).
+
+- `CatShardRouter` (`catapp.routers`) writes a cat to the shard of its
+  breed and reads the cats of a breed from it.
+- The ids of the cats come from a global sequence (`IdSequence`), so they
+  stay unique across the shards; a cat changing breed is moved to the
+  shard of its new breed. Each process reserves `CAT_ID_BLOCK_SIZE` ids
+  at a time and gives them out from memory, so the ids follow the order
+  of the inserts within a process only and those left unused when the
+  process stops are skipped.
+- Reads that are not bound to one breed are scattered over the shards
+  and gathered by `ShardedQuerySet`, merging the rows ordered by name.
+- Deleting a breed or a human deletes its cats from the shards, also
+  when deleted set-based by `catapp.deletion.fast_delete`.
+
+Rows inserted in bulk (`bulk_create`) do not go through the routers and
+land in the default database, so the `import_cats` and `seed` commands
+refuse to write cats with `CAT_SHARDS`.
+"""
+import heapq
+import itertools
+import threading
+from operator import attrgetter, itemgetter
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F, Max
+from django.db.models.query import ValuesIterable, ValuesListIterable
+
+from catapp.deletion import bulk_aware, bulk_delete
+from catapp.models import Breed, Cat, Human, IdSequence
+from catapp.utils import iter_chunks
+
+# Ordering of the rows merged from the shards
+ORDERING = ('name', 'id')
+# Most owners or breeds whose cats are deleted by one DELETE of a shard
+# (under the limit of SQLite on the number of parameters)
+DELETE_BATCH_SIZE = 500
+
+# Ids reserved by the process and not given out yet, per model
+_id_blocks = {}
+_id_blocks_lock = threading.Lock()
+
+
+def is_sharded():
+    return bool(settings.CAT_SHARDS)
+
+
+def get_shard(breed_id):
+    """
+    Return the database of the cats of the breed `breed_id`.
+    """
+    if breed_id is None or not is_sharded():
+        return None
+    return settings.CAT_SHARDS[breed_id % len(settings.CAT_SHARDS)]
+
+
+def scatter(queryset):
+    """
+    Return `queryset` run on each shard, or as it is without shards.
+    """
+    if not is_sharded():
+        return [queryset]
+    return [queryset.using(alias) for alias in settings.CAT_SHARDS]
+
+
+def get_ordering_key(queryset):
+    """
+    Return the function taking the `ORDERING` values from the rows of
+    `queryset`: model instances, `values()` dicts or `values_list()`
+    tuples (which have to hold the `ORDERING` fields).
+    """
+    if issubclass(queryset._iterable_class, ValuesIterable):
+        return itemgetter(*ORDERING)
+    if issubclass(queryset._iterable_class, ValuesListIterable):
+        names = list(queryset._fields)
+        return itemgetter(*(names.index(name) for name in ORDERING))
+    return attrgetter(*ORDERING)
+
+
+class ShardedQuerySet:
+    """
+    Read-only union of a queryset run on every shard, ordered by
+    `ORDERING`. It can be counted, sliced (a page of rows) and iterated,
+    which is what the paginators and the streaming responses need.
+    """
+    ordered = True
+
+    def __init__(self, queryset):
+        self.model = queryset.model
+        self.querysets = scatter(queryset.order_by(*ORDERING))
+        self.key = get_ordering_key(queryset)
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.stop is None:
+            raise TypeError("ShardedQuerySet only supports bounded slices.")
+        start = index.start or 0
+        # The rows of the slice are among the first `stop` rows of each
+        # shard
+        rows = heapq.merge(
+            *(queryset[:index.stop] for queryset in self.querysets),
+            key=self.key
+        )
+        return list(itertools.islice(rows, start, index.stop))
+
+    def __iter__(self):
+        return heapq.merge(*self.querysets, key=self.key)
+
+    def iterator(self, chunk_size=2000):
+        return heapq.merge(
+            *(queryset.iterator(chunk_size=chunk_size)
+              for queryset in self.querysets),
+            key=self.key
+        )
+
+    def get(self, **kwargs):
+        """
+        Return the row matching `kwargs` from the first shard having it.
+        """
+        for queryset in self.querysets:
+            obj = queryset.filter(**kwargs).first()
+            if obj is not None:
+                return obj
+        raise self.model.DoesNotExist(
+            "%s matching query does not exist." % self.model._meta.object_name
+        )
+
+
+def iterator(queryset, chunk_size):
+    """
+    Return `queryset.iterator(chunk_size)`, gathered from the shards for
+    the cats.
+    """
+    if queryset.model is Cat and is_sharded():
+        return ShardedQuerySet(queryset).iterator(chunk_size=chunk_size)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def allocate_ids(model, count=1):
+    """
+    Return the next `count` ids of `model` from its global sequence,
+    started after the greatest id found in the default database and the
+    shards.
+    """
+    name = model._meta.label_lower
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        sequences = IdSequence.objects.using(DEFAULT_DB_ALIAS).filter(
+            name=name
+        )
+        if not sequences.update(value=F('value') + count):
+            start = max(
+                queryset.aggregate(max_id=Max('pk'))['max_id'] or 0
+                for queryset in [model.objects.using(DEFAULT_DB_ALIAS)]
+                + scatter(model.objects.all())
+            )
+            sequence, created = IdSequence.objects.using(
+                DEFAULT_DB_ALIAS
+            ).get_or_create(name=name, defaults={'value': start + count})
+            if not created:
+                # Created by another process in the meantime
+                sequences.update(value=F('value') + count)
+        value = sequences.get().value
+    return range(value - count + 1, value + 1)
+
+
+def allocate_id(model):
+    """
+    Return the next id of `model` from the block of `CAT_ID_BLOCK_SIZE`
+    ids reserved by the process, reserving a new block once it is used
+    up.
+    """
+    with _id_blocks_lock:
+        pk = next(_id_blocks.get(model, iter(())), None)
+        if pk is not None:
+            return pk
+        ids = iter(allocate_ids(model, count=settings.CAT_ID_BLOCK_SIZE))
+        pk = next(ids)
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Kept once the reservation is committed, a rolled back
+            # block being given out again
+            def keep():
+                with _id_blocks_lock:
+                    _id_blocks[model] = ids
+            transaction.on_commit(keep, using=DEFAULT_DB_ALIAS)
+        else:
+            _id_blocks[model] = ids
+        return pk
+
+
+def reset_ids():
+    """
+    Drop the ids reserved by the process.
+    """
+    with _id_blocks_lock:
+        _id_blocks.clear()
+
+
+def prefetch_cats(instance, field_name):
+    """
+    Cache the cats of `instance` (a breed or a human, through the
+    `field_name` of the cats) gathered from the shards, as a
+    `prefetch_related('cats')` would.
+    """
+    if not is_sharded() or 'cats' in getattr(
+            instance, '_prefetched_objects_cache', {}):
+        return
+    queryset = instance.cats.all()
+    queryset._result_cache = list(ShardedQuerySet(
+        Cat.objects.filter(**{field_name: instance.pk})
+    ))
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache = {'cats': queryset}
+
+
+def assign_cat_id(sender, instance, using, **kwargs):
+    if instance.pk is None:
+        instance.pk = allocate_id(Cat)
+    elif not instance._state.adding and instance._state.db != using:
+        # Changed breed, moved to the shard of the new breed
+        instance._moved_from = instance._state.db
+
+
+def remove_moved_cat(sender, instance, **kwargs):
+    moved_from = instance.__dict__.pop('_moved_from', None)
+    if moved_from is not None:
+        Cat.objects.using(moved_from).filter(pk=instance.pk)._raw_delete(
+            moved_from
+        )
+
+
+@bulk_aware
+def delete_breed_cats(sender, instance, **kwargs):
+    Cat.objects.using(get_shard(instance.pk)).filter(
+        breed_id=instance.pk
+    ).delete()
+
+
+@bulk_aware
+def delete_owner_cats(sender, instance, **kwargs):
+    for queryset in scatter(Cat.objects.filter(owner_id=instance.pk)):
+        queryset.delete()
+
+
+def bulk_delete_cats(sender, queryset, **kwargs):
+    """
+    Delete from the shards the cats of the breeds or humans of `queryset`
+    deleted by `catapp.deletion.fast_delete`.
+    """
+    field_name = 'breed_id' if sender is Breed else 'owner_id'
+    pks = list(queryset.order_by().values_list('pk', flat=True))
+    count = 0
+    for alias in settings.CAT_SHARDS:
+        for chunk in iter_chunks(pks, DELETE_BATCH_SIZE):
+            cats = Cat.objects.using(alias).filter(**{
+                '%s__in' % field_name: chunk
+            })
+            bulk_delete.send(sender=Cat, queryset=cats, using=alias)
+            count += cats._raw_delete(alias)
+    return {Cat._meta.label: count}
+
+
+def connect_signals():
+    from django.db.models.signals import post_save, pre_delete, pre_save
+
+    pre_save.connect(assign_cat_id, sender=Cat,
+                     dispatch_uid='sharding-assign-cat-id')
+    post_save.connect(remove_moved_cat, sender=Cat,
+                      dispatch_uid='sharding-remove-moved-cat')
+    pre_delete.connect(delete_breed_cats, sender=Breed,
+                       dispatch_uid='sharding-delete-breed-cats')
+    pre_delete.connect(delete_owner_cats, sender=Human,
+                       dispatch_uid='sharding-delete-owner-cats')
+    for model in (Breed, Human):
+        bulk_delete.connect(
+            bulk_delete_cats, sender=model,
+            dispatch_uid='sharding-bulk-delete-%s' % model._meta.label
+        )
+
+
+def disconnect_signals():
+    from django.db.models.signals import post_save, pre_delete, pre_save
+
+    pre_save.disconnect(dispatch_uid='sharding-assign-cat-id', sender=Cat)
+    post_save.disconnect(dispatch_uid='sharding-remove-moved-cat',
+                         sender=Cat)
+    pre_delete.disconnect(dispatch_uid='sharding-delete-breed-cats',
+                          sender=Breed)
+    pre_delete.disconnect(dispatch_uid='sharding-delete-owner-cats',
+                          sender=Human)
+    for model in (Breed, Human):
+        bulk_delete.disconnect(
+            sender=model,
+            dispatch_uid='sharding-bulk-delete-%s' % model._meta.label
+        )
@@ -0,0 +1,87 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from catapp import columnar
+from catapp.factories import BreedFactory, CatFactory, HumanFactory
+from catapp.models import Cat, Human
+
+
+@skipUnless(columnar.pyarrow, "pyarrow is not installed")
+@override_settings(SNAPSHOT_BATCH_SIZE=2)
+class ExportSnapshotTests(TestCase):
+    '''
+    Test Case Code Format: #TSN-R00
+
+    Test cases for exporting columnar snapshots
+    '''
+
+    def setUp(self):
+        self.breed = BreedFactory.create()
+        CatFactory.create_batch(3, breed=self.breed,
+                                owner=HumanFactory.create())
+        CatFactory.create_batch(2)
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+
+    def export(self, *args):
+        call_command('export_snapshot', self.output_dir.name, *args,
+                     stdout=io.StringIO())
+        return Path(self.output_dir.name)
+
+    # Test Case: #TSN-R01
+    def test_export_parquet_snapshot(self):
+        output_dir = self.export()
+        for name in ('home', 'breed', 'human', 'cat'):
+            self.assertTrue((output_dir / (name + '.parquet')).exists(),
+                            "#TSN-R01: %s snapshot is not written" % name)
+
+        table = columnar.pyarrow.parquet.read_table(
+            str(output_dir / 'cat.parquet')
+        )
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(
+            table.schema.names,
+            ['id', 'name', 'gender', 'date_of_birth', 'description',
+             'breed_id', 'owner_id']
+        )
+        self.assertEqual(str(table.schema.field('breed_id').type), 'int64')
+        rows = table.to_pylist()
+        cat_obj = Cat.objects.get(pk=rows[0]['id'])
+        self.assertEqual(rows[0]['date_of_birth'], cat_obj.date_of_birth)
+        self.assertEqual(rows[0]['owner_id'], cat_obj.owner_id)
+
+    # Test Case: #TSN-R02
+    def test_export_arrow_snapshot_of_some_models(self):
+        output_dir = self.export('--format', 'arrow', '--models', 'human')
+        self.assertFalse((output_dir / 'cat.arrow').exists())
+
+        with columnar.pyarrow.ipc.open_file(str(output_dir / 'human.arrow')) \
+                as reader:
+            table = reader.read_all()
+        self.assertEqual(table.num_rows, Human.objects.count())
+        self.assertEqual(
+            sorted(table.column('home_id').to_pylist()),
+            sorted(Human.objects.values_list('home_id', flat=True))
+        )
+
+    # Test Case: #TSN-R03
+    def test_export_arrow_stream_endpoint(self):
+        response = self.client.get(
+            reverse('catapp:cat-export'),
+            data={'format': 'arrow', 'breed': self.breed.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b''.join(response.streaming_content)
+        table = columnar.pyarrow.ipc.open_stream(content).read_all()
+        self.assertEqual(
+            sorted(table.column('id').to_pylist()),
+            sorted(self.breed.cats.values_list('id', flat=True)),
+            "#TSN-R03: Streamed snapshot does not honour the filter"
+        )
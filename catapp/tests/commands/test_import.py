@@ -0,0 +1,196 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from catapp.factories import BreedFactory, HomeFactory, HumanFactory
+from catapp.import_pipeline import iter_raw_chunks
+from catapp.models import Breed, Cat, Home, Human
+
+
+@override_settings(IMPORT_WORKERS=1)
+class ImportCommandBaseTests(TestCase):
+
+    def setUp(self):
+        self.breed = BreedFactory.create(name='Siamese')
+        self.owner = HumanFactory.create()
+        self.tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+
+    def write_file(self, suffix, content):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'w') as import_file:
+            import_file.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def call(self, command, path, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command(command, path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+
+class ImportCommandTests(ImportCommandBaseTests):
+    '''
+    Test Case Code Format: #TIM-A00
+
+    Test cases for bulk importing files through the import commands
+    '''
+
+    # Test Case: #TIM-A01
+    def test_import_cats_from_csv(self):
+        path = self.write_file('.csv', (
+            "name,gender,date_of_birth,description,breed,owner\n"
+            "Mochi,F,2019-03-01,,Siamese,{owner}\n"
+            "Tofu,,2018-01-01,Fluffy,{breed},{owner}\n"
+        ).format(owner=self.owner.pk, breed=self.breed.pk))
+        stdout, stderr = self.call('import_cats', path, '--batch-size', '1')
+
+        self.assertIn("2 of 2 rows imported", stdout)
+        self.assertEqual(Cat.objects.filter(breed=self.breed).count(), 2,
+                         "#TIM-A01: Cats are not imported")
+        tofu = Cat.objects.get(name='Tofu')
+        self.assertEqual(tofu.gender, 'O')  # Default gender
+        self.assertEqual(tofu.owner, self.owner)
+        self.assertEqual(tofu.date_of_birth, datetime.date(2018, 1, 1))
+
+    # Test Case: #TIM-A02
+    def test_import_invalid_cats(self):
+        rows = [
+            {'name': '*' * 31, 'gender': 'X', 'date_of_birth': 'today',
+             'breed': 'Unknown', 'owner': 0},
+            {'name': 'Future', 'date_of_birth': str(self.tomorrow),
+             'breed': 'Siamese', 'owner': self.owner.pk},
+            {'name': 'Valid', 'date_of_birth': '2019-03-01',
+             'breed': 'Siamese', 'owner': self.owner.pk},
+        ]
+        path = self.write_file(
+            '.ndjson', '\n'.join(json.dumps(row) for row in rows)
+        )
+        stdout, stderr = self.call('import_cats', path)
+
+        self.assertIn("1 of 3 rows imported", stdout)
+        self.assertEqual(list(Cat.objects.values_list('name', flat=True)),
+                         ['Valid'], "#TIM-A02: Invalid cats are imported")
+        self.assertIn("Row 1: {'name': ['Ensure this field has no more "
+                      "than 30 characters.']", stderr)
+        self.assertIn("'gender': ['\"X\" is not a valid choice.']", stderr)
+        self.assertIn("'breed': ['Object with name=Unknown does not "
+                      "exist.']", stderr)
+        self.assertIn("'owner': ['Invalid pk \"0\" - object does not "
+                      "exist.']", stderr)
+        self.assertIn("Row 2: {'date_of_birth': ['Date of birth should be "
+                      "in the past", stderr)
+
+    # Test Case: #TIM-A03
+    def test_import_breeds_with_duplicated_names(self):
+        path = self.write_file('.csv', (
+            "name,origin,description\n"
+            "Siamese,Thailand,\n"
+            "Bengal,United States,\n"
+            "Bengal,United States,\n"
+        ))
+        stdout, stderr = self.call('import_breeds', path)
+        self.assertIn("1 of 3 rows imported", stdout)
+        self.assertEqual(Breed.objects.filter(name='Bengal').count(), 1,
+                         "#TIM-A03: Duplicated breed is imported")
+
+    # Test Case: #TIM-A04
+    def test_import_homes_and_humans(self):
+        home_path = self.write_file('.csv', (
+            "name,address,hometype\n"
+            "Home A,1 Cat Street,landed\n"
+            "Home B,2 Cat Street,castle\n"
+        ))
+        self.call('import_homes', home_path)
+        self.assertEqual(Home.objects.filter(name='Home A').count(), 1)
+        self.assertFalse(Home.objects.filter(name='Home B').exists())
+
+        home = HomeFactory.create()
+        human_path = self.write_file('.csv', (
+            "name,gender,date_of_birth,description,home\n"
+            "Dana,F,1990-05-01,,%d\n" % home.pk
+        ))
+        stdout, stderr = self.call('import_humans', human_path,
+                                   '--transaction-size', '1')
+        self.assertEqual(Human.objects.get(name='Dana').home, home,
+                         "#TIM-A04: Human is not imported")
+
+    # Test Case: #TIM-A05
+    def test_import_unknown_format(self):
+        path = self.write_file('.xml', "<cats/>")
+        with self.assertRaises(CommandError):
+            self.call('import_cats', path)
+
+    # Test Case: #TIM-A06
+    @override_settings(CAT_SHARDS=['cats1'])
+    def test_import_cats_into_shards(self):
+        path = self.write_file('.csv', "name\nMochi\n")
+        with self.assertRaises(CommandError,
+                               msg="#TIM-A06: Cats imported into default"):
+            self.call('import_cats', path)
+
+
+class ImportPipelineTests(ImportCommandBaseTests):
+    '''
+    Test Case Code Format: #TIP-A00
+
+    Test cases for parsing and validating the rows in worker processes
+    '''
+
+    # Test Case: #TIP-A01
+    def test_split_csv_records(self):
+        path = self.write_file('.csv', (
+            'name,description\n'
+            'Mochi,"Two\nlines"\n'
+            '\n'
+            'Tofu,"Quoted ""name"""\n'
+            'Kiki,\n'
+        ))
+        chunks = list(iter_raw_chunks(path, 'csv', 2))
+        self.assertEqual(
+            [records for header, records in chunks],
+            [['Mochi,"Two\nlines"\n', 'Tofu,"Quoted ""name"""\n'],
+             ['Kiki,\n']],
+            "#TIP-A01: CSV records are not split correctly"
+        )
+        self.assertEqual(chunks[0][0], 'name,description\n')
+
+    # Test Case: #TIP-A02
+    def test_import_cats_in_worker_processes(self):
+        lines = ["name,gender,date_of_birth,description,breed,owner"]
+        for i in range(9):
+            lines.append('Cat %d,M,2019-03-0%d,"Line\nbreak",Siamese,%d' % (
+                i, i + 1, self.owner.pk
+            ))
+        lines.append("Invalid,M,%s,,Siamese,%d" % (self.tomorrow,
+                                                   self.owner.pk))
+        path = self.write_file('.csv', '\n'.join(lines) + '\n')
+
+        stdout, stderr = self.call('import_cats', path, '--workers', '2',
+                                   '--batch-size', '2',
+                                   '--transaction-size', '3')
+        self.assertIn("9 of 10 rows imported", stdout)
+        self.assertIn("Row 10: {'date_of_birth'", stderr)
+        self.assertEqual(
+            sorted(Cat.objects.values_list('name', flat=True)),
+            ['Cat %d' % i for i in range(9)],
+            "#TIP-A02: Cats are not imported by the pipeline"
+        )
+        self.assertEqual(Cat.objects.get(name='Cat 3').description,
+                         "Line\nbreak")
+
+    # Test Case: #TIP-A03
+    def test_import_breeds_duplicated_across_workers(self):
+        path = self.write_file('.ndjson', '\n'.join(
+            json.dumps({'name': 'Bengal', 'origin': 'US'}) for _ in range(4)
+        ))
+        stdout, stderr = self.call('import_breeds', path, '--workers', '2',
+                                   '--batch-size', '1')
+        self.assertIn("1 of 4 rows imported", stdout)
+        self.assertEqual(Breed.objects.filter(name='Bengal').count(), 1,
+                         "#TIP-A03: Duplicated breeds are imported")
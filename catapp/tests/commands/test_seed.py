@@ -0,0 +1,89 @@
+import io
+from collections import Counter
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from catapp.models import Breed, Cat, Home, Human
+
+
+class SeedCommandTests(TestCase):
+    '''
+    Test Case Code Format: #TSD-A00
+
+    Test cases for seeding synthetic datasets
+    '''
+
+    def seed(self, *args):
+        stdout = io.StringIO()
+        call_command('seed', *args, '--batch-size', '7',
+                     '--transaction-size', '20', stdout=stdout)
+        return stdout.getvalue()
+
+    def dump(self):
+        return [
+            list(model.objects.order_by('id').values_list())
+            for model in (Home, Breed, Human, Cat)
+        ]
+
+    # Test Case: #TSD-A01
+    def test_seed_counts(self):
+        stdout = self.seed('--homes', '5', '--breeds', '4', '--humans', '30',
+                           '--cats', '50')
+        self.assertIn("89 rows seeded", stdout)
+        self.assertEqual(
+            [Home.objects.count(), Breed.objects.count(),
+             Human.objects.count(), Cat.objects.count()],
+            [5, 4, 30, 50],
+            "#TSD-A01: Rows are not seeded"
+        )
+        for cat in Cat.objects.select_related('breed', 'owner__home'):
+            cat.full_clean()
+
+    # Test Case: #TSD-A02
+    def test_same_seed_same_dataset(self):
+        args = ('--homes', '3', '--breeds', '3', '--humans', '10',
+                '--cats', '20', '--seed', '7')
+        self.seed(*args)
+        first = self.dump()
+        self.seed('--clear', *args)
+        self.assertEqual(self.dump(), first,
+                         "#TSD-A02: Same seed gives a different dataset")
+        self.seed('--clear', *args[:-1], '8')
+        self.assertNotEqual(self.dump(), first,
+                            "#TSD-A02: Other seed gives the same dataset")
+
+    # Test Case: #TSD-A03
+    def test_skewed_cats_per_breed(self):
+        self.seed('--homes', '2', '--breeds', '10', '--humans', '5',
+                  '--cats', '1000', '--skew', '1.5')
+        counts = sorted(
+            Counter(Cat.objects.values_list('breed', flat=True)).values(),
+            reverse=True
+        )
+        self.assertGreater(counts[0], 5 * counts[-1],
+                           "#TSD-A03: Cats per breed are not skewed")
+
+    # Test Case: #TSD-A04
+    def test_seed_cats_for_existing_rows(self):
+        self.seed('--homes', '2', '--breeds', '2', '--humans', '3',
+                  '--cats', '0')
+        self.seed('--homes', '0', '--breeds', '0', '--humans', '0',
+                  '--cats', '10')
+        self.assertEqual(Cat.objects.count(), 10)
+        with self.assertRaises(CommandError):
+            self.seed('--clear', '--breeds', '0')
+
+    # Test Case: #TSD-A05
+    @override_settings(CAT_SHARDS=['cats1'])
+    def test_seed_cats_into_shards(self):
+        for args in (('--cats', '10'), ('--clear', '--cats', '0')):
+            with self.assertRaises(CommandError,
+                                   msg="#TSD-A05: Cats seeded into default"):
+                self.seed('--homes', '1', '--breeds', '1', '--humans', '1',
+                          *args)
+        self.seed('--homes', '1', '--breeds', '1', '--humans', '1',
+                  '--cats', '0')
+        self.assertEqual(Human.objects.count(), 1,
+                         "#TSD-A05: Rows other than cats not seeded")
@@ -0,0 +1,62 @@
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.test import SimpleTestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from catapp.models import Cat, IdempotencyKey
+from catapp.routers import AuthRouter
+
+
+@override_settings(AUTH_DATABASE='auth')
+class AuthRouterTests(SimpleTestCase):
+    '''
+    Test Case Code Format: #TAR-R00
+
+    Test cases for the routing of the users, tokens and sessions to their
+    own database
+    '''
+
+    def setUp(self):
+        self.router = AuthRouter()
+
+    # Test Case: #TAR-R01
+    def test_auth_models_routed(self):
+        for model in (User, Token, Session):
+            self.assertEqual(self.router.db_for_read(model), 'auth',
+                             "#TAR-R01: %s not read from auth" % model)
+            self.assertEqual(self.router.db_for_write(model), 'auth',
+                             "#TAR-R01: %s not written to auth" % model)
+        self.assertIsNone(self.router.db_for_write(Cat),
+                          "#TAR-R01: Cat routed to auth")
+
+    # Test Case: #TAR-R02
+    def test_migrations(self):
+        self.assertTrue(self.router.allow_migrate('auth', 'authtoken'),
+                        "#TAR-R02: Tokens not migrated on auth")
+        self.assertFalse(self.router.allow_migrate('default', 'sessions'),
+                         "#TAR-R02: Sessions migrated on default")
+        self.assertFalse(self.router.allow_migrate('auth', 'catapp'),
+                         "#TAR-R02: Catalogue migrated on auth")
+        self.assertIsNone(self.router.allow_migrate('default', 'catapp'),
+                          "#TAR-R02: Catalogue not migrated on default")
+
+    # Test Case: #TAR-R03
+    def test_relations(self):
+        user = User()
+        user._state.db = 'auth'
+        key = IdempotencyKey()
+        key._state.db = 'default'
+        self.assertTrue(self.router.allow_relation(user, Token()),
+                        "#TAR-R03: Relation within auth not allowed")
+        self.assertTrue(self.router.allow_relation(key, user),
+                        "#TAR-R03: Idempotency key of a user not allowed")
+        self.assertFalse(self.router.allow_relation(Cat(), user),
+                         "#TAR-R03: Relation of a cat to a user allowed")
+
+    # Test Case: #TAR-R04
+    @override_settings(AUTH_DATABASE=None)
+    def test_disabled(self):
+        self.assertIsNone(self.router.db_for_write(User),
+                          "#TAR-R04: User routed without auth database")
+        self.assertIsNone(self.router.allow_migrate('default', 'auth'),
+                          "#TAR-R04: Migration routed without auth database")
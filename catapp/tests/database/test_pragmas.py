@@ -0,0 +1,82 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from catapp.database import get_pragma_sql
+
+
+class PragmaTests(TestCase):
+    '''
+    Test Case Code Format: #TPR-R00
+
+    Test cases for the pragmas of the SQLite connections
+    '''
+
+    def get_pragma(self, conn, name):
+        with conn.cursor() as cursor:
+            cursor.execute('PRAGMA %s' % name)
+            return cursor.fetchone()[0]
+
+    # Test Case: #TPR-R01
+    def test_pragmas_of_connection(self):
+        self.assertEqual(self.get_pragma(connection, 'synchronous'), 1,
+                         "#TPR-R01: synchronous is not NORMAL")
+        self.assertEqual(self.get_pragma(connection, 'temp_store'), 2,
+                         "#TPR-R01: temp_store is not MEMORY")
+        self.assertEqual(self.get_pragma(connection, 'cache_size'), -65536,
+                         "#TPR-R01: cache_size is not set")
+        self.assertEqual(self.get_pragma(connection, 'busy_timeout'), 5000,
+                         "#TPR-R01: busy_timeout is not set")
+
+    # Test Case: #TPR-R02
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'wal',
+                                       'synchronous': 'full'})
+    def test_pragmas_of_file_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = dict(connection.settings_dict)
+            settings_dict['NAME'] = os.path.join(directory, 'db.sqlite3')
+            settings_dict['PRAGMAS'] = {}
+            conn = DatabaseWrapper(settings_dict, alias='pragmas')
+            try:
+                self.assertEqual(self.get_pragma(conn, 'journal_mode'), 'wal',
+                                 "#TPR-R02: journal_mode is not WAL")
+                self.assertEqual(self.get_pragma(conn, 'synchronous'), 2,
+                                 "#TPR-R02: synchronous is not FULL")
+            finally:
+                conn.close()
+
+    # Test Case: #TPR-R03
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'wal',
+                                       'synchronous': 'full'})
+    def test_pragma_skipped_for_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = dict(connection.settings_dict)
+            settings_dict['NAME'] = os.path.join(directory, 'db.sqlite3')
+            settings_dict['PRAGMAS'] = {'journal_mode': None}
+            conn = DatabaseWrapper(settings_dict, alias='pragmas')
+            try:
+                self.assertEqual(self.get_pragma(conn, 'journal_mode'),
+                                 'delete', "#TPR-R03: journal_mode changed")
+                self.assertEqual(self.get_pragma(conn, 'synchronous'), 2,
+                                 "#TPR-R03: Other pragmas skipped")
+            finally:
+                conn.close()
+
+
+class PragmaSQLTests(SimpleTestCase):
+    '''
+    Test Case Code Format: #TPR-S00
+
+    Test cases for the statements of the pragmas
+    '''
+
+    # Test Case: #TPR-S01
+    def test_pragma_sql(self):
+        self.assertEqual(get_pragma_sql('cache_size', -2000),
+                         'PRAGMA cache_size = -2000', "#TPR-S01: Wrong SQL")
+        for name, value in (('cache_size;', 1), ('journal_mode', 'wal; --')):
+            with self.assertRaises(ValueError, msg="#TPR-S01: Not rejected"):
+                get_pragma_sql(name, value)
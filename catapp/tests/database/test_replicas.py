@@ -0,0 +1,154 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from catapp.database import backup_database
+from catapp.middleware import ReadYourWritesMiddleware
+from catapp.models import Cat, ExportJob
+from catapp.routers import (ReplicaRouter, get_replica, reads_from_replicas,
+                            replica_reads)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTests(SimpleTestCase):
+    '''
+    Test Case Code Format: #TRP-R00
+
+    Test cases for the routing of the reads to the replicas
+    '''
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    # Test Case: #TRP-R01
+    def test_reads_routed_to_replicas(self):
+        self.assertIsNone(self.router.db_for_read(Cat),
+                          "#TRP-R01: Read routed outside of replica_reads")
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Cat), 'replica1',
+                             "#TRP-R01: Read not routed to the replica")
+            self.assertIsNone(self.router.db_for_read(ExportJob),
+                              "#TRP-R01: Export job read from the replica")
+            with replica_reads(False):
+                self.assertIsNone(self.router.db_for_read(Cat),
+                                  "#TRP-R01: Read not routed to default")
+            self.assertTrue(reads_from_replicas(),
+                            "#TRP-R01: Previous routing not restored")
+
+    # Test Case: #TRP-R02
+    def test_writes_and_migrations(self):
+        cat = Cat()
+        cat._state.db = 'replica1'
+        self.assertEqual(self.router.db_for_write(Cat, instance=cat),
+                         'default', "#TRP-R02: Write not routed to default")
+        self.assertFalse(self.router.allow_migrate('replica1', 'catapp'),
+                         "#TRP-R02: Replica migrated")
+        self.assertIsNone(self.router.allow_migrate('default', 'catapp'),
+                          "#TRP-R02: Default not migrated")
+
+    # Test Case: #TRP-R03
+    @override_settings(DATABASE_REPLICAS=['replica1', 'replica2'])
+    @mock.patch('catapp.routers.random.choice',
+                side_effect=['replica2', 'replica1'])
+    def test_one_replica_per_block(self, choice):
+        with replica_reads():
+            self.assertEqual(
+                {self.router.db_for_read(Cat) for _ in range(10)},
+                {'replica2'}, "#TRP-R03: Reads spread over the replicas"
+            )
+            with replica_reads(False), replica_reads():
+                self.assertEqual(self.router.db_for_read(Cat), 'replica2',
+                                 "#TRP-R03: Replica of the block not kept")
+        self.assertIsNone(get_replica(), "#TRP-R03: Replica not released")
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Cat), 'replica1',
+                             "#TRP-R03: Replica not picked again")
+        self.assertEqual(choice.call_count, 2,
+                         "#TRP-R03: Replica not picked once per block")
+
+
+@override_settings(REPLICA_PIN_SECONDS=5)
+class ReadYourWritesMiddlewareTests(SimpleTestCase):
+    '''
+    Test Case Code Format: #TRP-M00
+
+    Test cases for the pinning of the clients who wrote to the default
+    database
+    '''
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReadYourWritesMiddleware(self.get_response)
+
+    def get_response(self, request):
+        self.replica_reads = reads_from_replicas()
+        return HttpResponse(status=getattr(request, 'status', 200))
+
+    # Test Case: #TRP-M01
+    def test_safe_request_reads_from_replicas(self):
+        self.middleware(self.factory.get('/'))
+        self.assertTrue(self.replica_reads,
+                        "#TRP-M01: GET not read from the replicas")
+
+        request = self.factory.get('/')
+        request.COOKIES[ReadYourWritesMiddleware.cookie_name] = '1'
+        self.middleware(request)
+        self.assertFalse(self.replica_reads,
+                         "#TRP-M01: Pinned client read from the replicas")
+
+    # Test Case: #TRP-M02
+    def test_write_pins_client(self):
+        response = self.middleware(self.factory.post('/'))
+        self.assertFalse(self.replica_reads,
+                         "#TRP-M02: POST read from the replicas")
+        cookie = response.cookies[ReadYourWritesMiddleware.cookie_name]
+        self.assertEqual(cookie['max-age'], 5,
+                         "#TRP-M02: Client not pinned")
+
+        request = self.factory.post('/')
+        request.status = 400
+        response = self.middleware(request)
+        self.assertNotIn(ReadYourWritesMiddleware.cookie_name,
+                         response.cookies,
+                         "#TRP-M02: Client pinned after a failed write")
+
+
+class BackupDatabaseTests(SimpleTestCase):
+    '''
+    Test Case Code Format: #TRP-S00
+
+    Test cases for the sync of a replica with the backup API
+    '''
+
+    def add_connection(self, alias, path):
+        settings_dict = dict(connections['default'].settings_dict)
+        settings_dict['NAME'] = path
+        connections[alias] = DatabaseWrapper(settings_dict, alias=alias)
+        self.addCleanup(connections.__delitem__, alias)
+        self.addCleanup(connections[alias].close)
+        return connections[alias]
+
+    # Test Case: #TRP-S01
+    def test_backup_database(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        source = self.add_connection(
+            'backup_source', os.path.join(directory.name, 'source.sqlite3')
+        )
+        replica = self.add_connection(
+            'backup_replica', os.path.join(directory.name, 'replica.sqlite3')
+        )
+        with source.cursor() as cursor:
+            cursor.execute("CREATE TABLE cat (name TEXT)")
+            cursor.execute("INSERT INTO cat VALUES ('Mochi')")
+
+        backup_database('backup_source', 'backup_replica')
+        with replica.cursor() as cursor:
+            cursor.execute("SELECT name FROM cat")
+            self.assertEqual(cursor.fetchall(), [('Mochi',)],
+                             "#TRP-S01: Replica not synced")
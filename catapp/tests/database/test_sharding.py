@@ -0,0 +1,219 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+from django.db.models import QuerySet
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from catapp import sharding
+from catapp.factories import BreedFactory, HumanFactory
+from catapp.models import Cat, IdSequence
+from catapp.tests.base import ViewName as vn
+from catapp.tests.base import convert_id_to_hyperlink
+from catapp.tests.viewsets.base import get_valid_token_key
+
+SHARDS = ['test_cats1', 'test_cats2']
+
+
+@override_settings(
+    CAT_SHARDS=SHARDS,
+    DATABASE_ROUTERS=['catapp.routers.CatShardRouter']
+    + settings.DATABASE_ROUTERS
+)
+class ShardingTests(TransactionTestCase):
+    '''
+    Test Case Code Format: #TSH-R00
+
+    Test cases for the cats spread over the shards by breed
+    '''
+    # Evaluated once the shards are added by setUpClass
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        for alias in SHARDS:
+            settings_dict = dict(connections['default'].settings_dict)
+            settings_dict.update({
+                'NAME': os.path.join(cls.directory.name, alias + '.sqlite3'),
+                'PRAGMAS': {'foreign_keys': 'off'},
+                'TEST': {'NAME': None},
+            })
+            connections.databases[alias] = settings_dict
+        super().setUpClass()
+        for alias in SHARDS:
+            call_command('migrate', database=alias, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in SHARDS:
+            connections[alias].close()
+            del connections[alias]
+            del connections.databases[alias]
+        cls.directory.cleanup()
+
+    def setUp(self):
+        sharding.connect_signals()
+        self.addCleanup(sharding.disconnect_signals)
+        sharding.reset_ids()
+        self.addCleanup(sharding.reset_ids)
+        # Consecutive ids, the first and second breeds are in different
+        # shards
+        self.breeds = [BreedFactory.create() for _ in range(3)]
+        self.owner = HumanFactory.create()
+        self.cats = [
+            Cat.objects.create(name=name, gender='F', breed=breed,
+                               owner=self.owner, date_of_birth='2020-01-01',
+                               description=name)
+            for name, breed in [('Cleo', self.breeds[0]),
+                                ('Alfie', self.breeds[1]),
+                                ('Bella', self.breeds[2]),
+                                ('Dolly', self.breeds[1])]
+        ]
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=get_valid_token_key())
+
+    def get_names(self, database):
+        return set(Cat.objects.using(database).values_list('name', flat=True))
+
+    # Test Case: #TSH-R01
+    def test_cats_written_to_shard_of_breed(self):
+        self.assertFalse(Cat.objects.using('default').exists(),
+                         "#TSH-R01: Cat written to the default database")
+        for cat in self.cats:
+            shard = SHARDS[cat.breed_id % 2]
+            self.assertEqual(cat._state.db, shard,
+                             "#TSH-R01: Cat not written to its shard")
+            self.assertIn(cat.name, self.get_names(shard),
+                          "#TSH-R01: Cat missing from its shard")
+        ids = [cat.pk for cat in self.cats]
+        self.assertEqual(len(set(ids)), len(ids),
+                         "#TSH-R01: Id given out twice")
+
+    # Test Case: #TSH-R02
+    def test_change_of_breed_moves_cat(self):
+        cat = self.cats[0]
+        old_shard = cat._state.db
+        response = self.client.patch(
+            reverse(vn.CAT_VIEW_DETAIL, args=[cat.pk]),
+            {'breed': convert_id_to_hyperlink(vn.BREED_VIEW_DETAIL,
+                                              self.breeds[1])},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK,
+                         "#TSH-R02: Cat not updated")
+        new_shard = SHARDS[self.breeds[1].pk % 2]
+        self.assertNotEqual(old_shard, new_shard,
+                            "#TSH-R02: Breeds in the same shard")
+        self.assertNotIn('Cleo', self.get_names(old_shard),
+                         "#TSH-R02: Cat left in its old shard")
+        self.assertEqual(Cat.objects.using(new_shard).get(pk=cat.pk).breed_id,
+                         self.breeds[1].pk, "#TSH-R02: Cat not moved")
+
+    # Test Case: #TSH-R03
+    def test_list_merged_from_shards(self):
+        response = self.client.get(reverse(vn.CAT_VIEW_LIST))
+        self.assertEqual(response.status_code, status.HTTP_200_OK,
+                         "#TSH-R03: Cats not listed")
+        self.assertEqual(response.data['count'], 4,
+                         "#TSH-R03: Wrong number of cats")
+        self.assertEqual(
+            [cat['name'] for cat in response.data['results']],
+            ['Alfie', 'Bella', 'Cleo', 'Dolly'],
+            "#TSH-R03: Cats not merged by name"
+        )
+        self.assertEqual(
+            response.data['results'][0]['home'],
+            convert_id_to_hyperlink(vn.HOME_VIEW_DETAIL, self.owner.home),
+            "#TSH-R03: Wrong home of the cat"
+        )
+
+        response = self.client.get(reverse(vn.HUMAN_VIEW_DETAIL,
+                                           args=[self.owner.pk]))
+        self.assertEqual(len(response.data['cats']), 4,
+                         "#TSH-R03: Cats of the owner not gathered")
+
+    # Test Case: #TSH-R04
+    def test_detail_and_delete(self):
+        cat = self.cats[1]
+        url = reverse(vn.CAT_VIEW_DETAIL, args=[cat.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.data['name'], 'Alfie',
+                         "#TSH-R04: Cat not found in its shard")
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT,
+                         "#TSH-R04: Cat not deleted")
+        self.assertEqual(self.client.get(url).status_code,
+                         status.HTTP_404_NOT_FOUND,
+                         "#TSH-R04: Deleted cat found")
+
+        self.owner.delete()
+        for shard in SHARDS:
+            self.assertFalse(Cat.objects.using(shard).exists(),
+                             "#TSH-R04: Cats of the owner not deleted")
+
+    # Test Case: #TSH-R05
+    def test_sharded_queryset_slices(self):
+        queryset = sharding.ShardedQuerySet(Cat.objects.all())
+        self.assertEqual(len(queryset), 4, "#TSH-R05: Wrong count")
+        self.assertEqual([cat.name for cat in queryset[1:3]],
+                         ['Bella', 'Cleo'], "#TSH-R05: Wrong slice")
+        rows = sharding.ShardedQuerySet(
+            Cat.objects.values_list('id', 'name')
+        ).iterator(chunk_size=1)
+        self.assertEqual([name for pk, name in rows],
+                         ['Alfie', 'Bella', 'Cleo', 'Dolly'],
+                         "#TSH-R05: Rows not merged by name")
+
+    # Test Case: #TSH-R06
+    def test_fast_delete_of_home(self):
+        response = self.client.delete(reverse(vn.HOME_VIEW_DETAIL,
+                                              args=[self.owner.home_id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT,
+                         "#TSH-R06: Home not deleted")
+        self.assertEqual(response['Deleted-Objects'],
+                         'catapp.Cat=4, catapp.Home=1, catapp.Human=1',
+                         "#TSH-R06: Wrong counts header")
+        for shard in SHARDS:
+            self.assertFalse(Cat.objects.using(shard).exists(),
+                             "#TSH-R06: Cats of the home left in a shard")
+
+    # Test Case: #TSH-R07
+    @override_settings(CAT_ID_BLOCK_SIZE=10)
+    def test_ids_given_out_from_block(self):
+        sharding.reset_ids()
+        first = sharding.allocate_id(Cat)
+        with self.assertNumQueries(0, using='default'):
+            ids = [sharding.allocate_id(Cat) for _ in range(9)]
+        self.assertEqual(ids, list(range(first + 1, first + 10)),
+                         "#TSH-R07: Ids not given out from the block")
+        self.assertEqual(IdSequence.objects.get(name='catapp.cat').value,
+                         first + 9, "#TSH-R07: Wrong block reserved")
+        self.assertEqual(sharding.allocate_id(Cat), first + 10,
+                         "#TSH-R07: New block not reserved")
+
+    # Test Case: #TSH-R08
+    def test_sequence_created_concurrently(self):
+        IdSequence.objects.all().delete()
+        update = QuerySet.update
+        calls = []
+
+        def concurrent_update(queryset, **kwargs):
+            if not calls:
+                # Another process creating the sequence first
+                calls.append(None)
+                IdSequence.objects.create(name='catapp.cat', value=1000)
+                return 0
+            return update(queryset, **kwargs)
+        with mock.patch.object(QuerySet, 'update', autospec=True,
+                               side_effect=concurrent_update):
+            ids = sharding.allocate_ids(Cat, count=10)
+        self.assertEqual(ids, range(1001, 1011),
+                         "#TSH-R08: Ids of the other process given out")
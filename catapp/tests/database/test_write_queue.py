@@ -0,0 +1,87 @@
+import tempfile
+import threading
+
+from django.db import IntegrityError
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from catapp import writequeue
+from catapp.factories import BreedFactory, HumanFactory
+from catapp.models import Breed, Cat
+from catapp.tests.base import ViewName as vn
+from catapp.tests.viewsets.base import get_valid_token_key
+
+
+class WriteQueueTests(TransactionTestCase):
+    '''
+    Test Case Code Format: #TWQ-R00
+
+    Test cases for the writes run by the writer thread
+    '''
+    databases = '__all__'
+
+    def setUp(self):
+        self.lock_file = tempfile.NamedTemporaryFile()
+        self.writer = writequeue.Writer(batch_size=10,
+                                        lock_path=self.lock_file.name)
+
+    def tearDown(self):
+        self.lock_file.close()
+
+    def create_breed(self, name):
+        def func():
+            breed = Breed.objects.create(name=name, origin='Thailand',
+                                         description='Queued')
+            return threading.current_thread().name, breed.pk
+        return func
+
+    # Test Case: #TWQ-R01
+    def test_group_commit(self):
+        futures = [
+            self.writer.submit(self.create_breed('Breed %d' % i))
+            for i in range(3)
+        ] + [self.writer.submit(self.create_breed('Breed 0'))]
+        # Started after the writes are queued, so they form one batch
+        self.writer.start()
+        self.writer.stop()
+
+        for future in futures[:3]:
+            thread_name, pk = future.result()
+            self.assertEqual(thread_name, 'write-queue',
+                             "#TWQ-R01: Write not run by the writer")
+        with self.assertRaises(IntegrityError,
+                               msg="#TWQ-R01: Error not raised"):
+            futures[3].result()
+        self.assertEqual(Breed.objects.count(), 3,
+                         "#TWQ-R01: Wrong number of breeds committed")
+        self.assertEqual(
+            (self.writer.num_of_batches, self.writer.num_of_writes), (1, 4),
+            "#TWQ-R01: Writes not committed together"
+        )
+
+    # Test Case: #TWQ-R02
+    def test_create_through_queue(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=get_valid_token_key())
+        breed = BreedFactory.create()
+        owner = HumanFactory.create()
+        with override_settings(WRITE_QUEUE_ENABLED=True,
+                               WRITE_QUEUE_LOCK_FILE=self.lock_file.name):
+            try:
+                response = client.post(reverse(vn.CAT_VIEW_LIST), {
+                    'name': 'Mochi', 'gender': 'F',
+                    'date_of_birth': '2020-01-01', 'description': 'Queued',
+                    'breed': reverse(vn.BREED_VIEW_DETAIL, args=[breed.pk]),
+                    'owner': reverse(vn.HUMAN_VIEW_DETAIL, args=[owner.pk]),
+                })
+                num_of_writes = writequeue.get_writer().num_of_writes
+            finally:
+                writequeue.shutdown()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED,
+                         "#TWQ-R02: %s" % response.content)
+        self.assertTrue(Cat.objects.filter(name='Mochi').exists(),
+                        "#TWQ-R02: Cat not created")
+        self.assertEqual(num_of_writes, 1,
+                         "#TWQ-R02: Write not run by the writer")
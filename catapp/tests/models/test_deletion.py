@@ -0,0 +1,82 @@
+from django.db.models.signals import post_delete
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from catapp import autocomplete, deletion
+from catapp.factories import CatFactory, HomeFactory, HumanFactory
+from catapp.models import Cat, Home, Human
+from catapp.tests.base import ViewName as vn
+from catapp.tests.viewsets.base import get_valid_token_key
+
+
+class FastDeleteTests(TestCase):
+    '''
+    Test Case Code Format: #TFD-R00
+
+    Test cases for the set-based delete of a home or a human with its
+    cascade
+    '''
+    # Users and tokens may be in their own database (`AUTH_DATABASE`)
+    databases = '__all__'
+
+    def setUp(self):
+        self.home = HomeFactory.create()
+        self.humans = HumanFactory.create_batch(2, home=self.home)
+        self.cats = [CatFactory.create(owner=human) for human in self.humans
+                     for _ in range(3)]
+        # Rows of another home, kept
+        self.other_cat = CatFactory.create()
+        autocomplete.reset()
+        self.addCleanup(autocomplete.reset)
+
+    # Test Case: #TFD-R01
+    def test_home_deleted_set_based(self):
+        autocomplete.get_index(Cat)
+        # One DELETE per table, one SELECT of the cats for their loaded
+        # index and the savepoint, whatever the number of rows
+        with self.assertNumQueries(6):
+            total, counts = deletion.fast_delete(self.home)
+        self.assertEqual(
+            counts, {'catapp.Home': 1, 'catapp.Human': 2, 'catapp.Cat': 6},
+            "#TFD-R01: Wrong counts"
+        )
+        self.assertEqual(total, 9, "#TFD-R01: Wrong total")
+        self.assertIsNone(self.home.pk, "#TFD-R01: Pk of the home kept")
+        self.assertEqual(list(Cat.objects.all()), [self.other_cat],
+                         "#TFD-R01: Wrong cats deleted")
+        self.assertEqual(Human.objects.count(), 1,
+                         "#TFD-R01: Wrong humans deleted")
+
+    # Test Case: #TFD-R02
+    def test_row_receivers_fall_back(self):
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+        post_delete.connect(receiver, sender=Cat)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Cat)
+
+        self.assertIsNone(deletion.fast_delete(self.humans[0]),
+                          "#TFD-R02: Receiver of the cats ignored")
+        total, counts = deletion.delete(self.humans[0])
+        self.assertEqual(counts, {'catapp.Human': 1, 'catapp.Cat': 3},
+                         "#TFD-R02: Wrong counts")
+        self.assertEqual(len(deleted), 3,
+                         "#TFD-R02: Receiver not sent the cats")
+
+    # Test Case: #TFD-A01
+    def test_api_reports_counts(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=get_valid_token_key())
+        response = client.delete(reverse(vn.HOME_VIEW_DETAIL,
+                                         args=[self.home.pk]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT,
+                         "#TFD-A01: Home not deleted")
+        self.assertEqual(response['Deleted-Objects'],
+                         'catapp.Cat=6, catapp.Home=1, catapp.Human=2',
+                         "#TFD-A01: Wrong counts header")
+        self.assertFalse(Home.objects.filter(pk__in=[
+            human.home_id for human in self.humans
+        ]).exists(), "#TFD-A01: Home left")
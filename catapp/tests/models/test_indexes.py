@@ -0,0 +1,66 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+
+from catapp.models import Cat, Human
+
+
+class QueryPlanTests(TestCase):
+    '''
+    Test Case Code Format: #TQP-R00
+
+    Test cases for the indexes used by the common queries of the lists
+    '''
+
+    def get_query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, queryset, index, code):
+        plan = self.get_query_plan(queryset)
+        self.assertTrue(
+            any('INDEX %s ' % index in step for step in plan),
+            "%s: %s is not used: %s" % (code, index, plan)
+        )
+        self.assertFalse(
+            any('TEMP B-TREE' in step for step in plan),
+            "%s: Rows are sorted without index: %s" % (code, plan)
+        )
+
+    # Test Case: #TQP-R01
+    def test_cats_of_breed_by_name(self):
+        self.assertUsesIndex(Cat.objects.filter(breed=1)[:10],
+                             'cat_breed_name_idx', "#TQP-R01")
+
+    # Test Case: #TQP-R02
+    def test_cats_of_owner_by_name(self):
+        self.assertUsesIndex(Cat.objects.filter(owner=1)[:10],
+                             'cat_owner_name_idx', "#TQP-R02")
+
+    # Test Case: #TQP-R03
+    def test_humans_of_home_by_name(self):
+        self.assertUsesIndex(Human.objects.filter(home=1)[:10],
+                             'human_home_name_idx', "#TQP-R03")
+
+    # Test Case: #TQP-R04
+    def test_cats_by_gender_and_date_of_birth(self):
+        queryset = Cat.objects.filter(
+            gender='F', date_of_birth__gte=datetime.date(2015, 1, 1)
+        )[:10]
+        plan = self.get_query_plan(queryset)
+        self.assertTrue(
+            any('INDEX cat_gender_dob_idx ' in step for step in plan),
+            "#TQP-R04: cat_gender_dob_idx is not used: %s" % plan
+        )
+        # An index cannot both serve the range of dates and give the order
+        # of the names, the matching cats are sorted
+        self.assertTrue(any('TEMP B-TREE' in step for step in plan),
+                        "#TQP-R04: Unexpected plan: %s" % plan)
+
+    # Test Case: #TQP-R05
+    def test_cats_of_gender_by_name(self):
+        self.assertUsesIndex(Cat.objects.filter(gender='F')[:10],
+                             'cat_gender_name_idx', "#TQP-R05")
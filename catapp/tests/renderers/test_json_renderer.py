@@ -0,0 +1,152 @@
+import datetime
+import io
+import json
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.relations import Hyperlink
+from rest_framework.renderers import JSONRenderer
+
+from catapp import parsers, renderers
+from catapp.factories import CatFactory
+from catapp.models import Cat
+from catapp.parsers import FastJSONParser
+from catapp.renderers import FastJSONRenderer
+from catapp.serializers import CatSerializer
+from catapp.tests.serializers.base import make_request
+
+
+class FastJSONRendererTests(TestCase):
+    '''
+    Test Case Code Format: #TJR-R00
+
+    Test cases for rendering through the fast JSON renderer
+    '''
+
+    def assertSameBytes(self, data, code, **kwargs):
+        self.assertEqual(
+            FastJSONRenderer().render(data, **kwargs),
+            JSONRenderer().render(data, **kwargs),
+            "#TJR-%s: Rendered bytes differ from JSONRenderer" % code
+        )
+
+    # Test Case: #TJR-R01
+    def test_render_serialized_cats(self):
+        CatFactory.create_batch(5)
+        data = CatSerializer(
+            Cat.objects.all(), many=True, context={'request': make_request()}
+        ).data
+        self.assertSameBytes(data, 'R01')
+
+    # Test Case: #TJR-R02
+    def test_render_date_and_url_types(self):
+        data = OrderedDict([
+            ('date', datetime.date(2020, 12, 1)),
+            ('datetime', timezone.now()),
+            ('naive', datetime.datetime(2020, 12, 1, 8, 30, 15, 123456)),
+            ('time', datetime.time(8, 30)),
+            ('duration', datetime.timedelta(hours=1)),
+            ('url', Hyperlink('http://testserver/catapp/api/cats/1/', None)),
+            ('uuid', uuid.uuid4()),
+            ('decimal', Decimal('1.5')),
+        ])
+        self.assertSameBytes(data, 'R02')
+
+    # Test Case: #TJR-R03
+    def test_render_unicode_and_control_chars(self):
+        data = {'name': 'Mèo 猫 \u2028\u2029 "quoted" \\ \n\t\x01\x7f'}
+        self.assertSameBytes(data, 'R03')
+
+    # Test Case: #TJR-R04
+    def test_render_with_indent(self):
+        self.assertSameBytes(
+            {'name': 'cat', 'cats': [1, 2]}, 'R04',
+            accepted_media_type='application/json; indent=4'
+        )
+
+    # Test Case: #TJR-R05
+    def test_render_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertSameBytes({'date': datetime.date(2020, 1, 1)}, 'R05')
+
+    # Test Case: #TJR-R06
+    def test_render_big_integer(self):
+        # Out of the 64-bit range handled by orjson
+        self.assertSameBytes({'count': 2 ** 70}, 'R06')
+
+    # Test Case: #TJR-R07
+    def test_render_floats(self):
+        data = {'floats': [0.1, 1.5, 1e16, 1e-7, -2.5e300]}
+        # Same values, not always the same bytes
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), data,
+                         "#TJR-R07: Rendered floats differ")
+        self.assertSameBytes({'weight': 4.2}, 'R07')
+        self.assertSameBytes({'weights': [1.0, None]}, 'R07')
+
+    # Test Case: #TJR-R08
+    def test_render_non_finite_floats(self):
+        for value in (float('nan'), float('inf')):
+            with self.assertRaises(ValueError,
+                                   msg="#TJR-R08: Float not rejected"):
+                FastJSONRenderer().render({'weight': [None, value]})
+        with mock.patch.object(JSONRenderer, 'strict', False):
+            self.assertSameBytes({'weight': float('-inf')}, 'R08')
+
+
+class FastJSONParserTests(TestCase):
+    '''
+    Test Case Code Format: #TJP-R00
+
+    Test cases for parsing through the fast JSON parser
+    '''
+
+    def parse(self, parser, content, encoding='utf-8'):
+        return parser.parse(
+            io.BytesIO(content), parser_context={'encoding': encoding}
+        )
+
+    # Test Case: #TJP-R01
+    def test_parse_same_as_json_parser(self):
+        content = '{"name": "Mèo", "cats": [1, 2.5, null, true]}'.encode()
+        self.assertEqual(
+            self.parse(FastJSONParser(), content),
+            self.parse(JSONParser(), content),
+            "#TJP-R01: Parsed data differs from JSONParser"
+        )
+
+    # Test Case: #TJP-R02
+    def test_parse_invalid_content(self):
+        for content in (b'{"name": ', b'{"count": NaN}'):
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), content)
+
+    # Test Case: #TJP-R03
+    def test_parse_other_encoding(self):
+        content = '{"name": "Mèo"}'.encode('latin-1')
+        self.assertEqual(
+            self.parse(FastJSONParser(), content, encoding='latin-1'),
+            {'name': 'Mèo'},
+            "#TJP-R03: Content in latin-1 is not parsed"
+        )
+
+    # Test Case: #TJP-R04
+    def test_parse_without_orjson(self):
+        with mock.patch.object(parsers, 'orjson', None):
+            self.assertEqual(
+                self.parse(FastJSONParser(), b'{"name": "cat"}'),
+                {'name': 'cat'}
+            )
+
+    # Test Case: #TJP-R05
+    @skipUnless(parsers.orjson, "orjson is not installed")
+    def test_parse_big_integer(self):
+        content = b'{"count": %d}' % 2 ** 70
+        self.assertEqual(
+            self.parse(FastJSONParser(), content), {'count': 2 ** 70}
+        )
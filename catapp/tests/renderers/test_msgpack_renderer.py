@@ -0,0 +1,129 @@
+import datetime
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from catapp import renderers
+from catapp.factories import BreedFactory, CatFactory, HumanFactory
+from catapp.models import Cat
+from catapp.renderers import MessagePackRenderer
+from catapp.tests.base import convert_id_to_hyperlink, ViewName as vn
+from catapp.tests.viewsets.base import BaseTestCase, get_valid_token_key
+
+MSGPACK = 'application/msgpack'
+
+
+@skipUnless(renderers.msgpack, "msgpack is not installed")
+class MessagePackTests(BaseTestCase):
+    '''
+    Test Case Code Format: #TMP-X00
+
+    Where
+    =====
+        X:  A - Add (POST)
+            R - Retrieve (GET)
+    '''
+
+    def setUp(self):
+        self.msgpack = renderers.msgpack
+        self.breed = BreedFactory.create()
+        self.owner = HumanFactory.create()
+        CatFactory.create_batch(3, breed=self.breed, owner=self.owner)
+
+    # Test Case: #TMP-R01
+    def test_retrieve_cat_list_as_msgpack(self):
+        response = self.client.get(
+            reverse(vn.CAT_VIEW_LIST), HTTP_ACCEPT=MSGPACK
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response['Content-Type'], MSGPACK,
+            "#TMP-R01: Response is not rendered in MessagePack"
+        )
+        json_response = self.client.get(reverse(vn.CAT_VIEW_LIST))
+        self.assertEqual(
+            self.msgpack.unpackb(response.content, raw=False),
+            json_response.json(),
+            "#TMP-R01: MessagePack data is not same as the JSON data"
+        )
+
+    # Test Case: #TMP-R02
+    def test_retrieve_cat_obj_as_msgpack(self):
+        cat_obj = Cat.objects.first()
+        response = self.client.get(
+            reverse(vn.CAT_VIEW_DETAIL, args=[cat_obj.pk]),
+            HTTP_ACCEPT=MSGPACK
+        )
+        data = self.msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(
+            data['date_of_birth'], cat_obj.date_of_birth.isoformat(),
+            "#TMP-R02: Date is not rendered in the same format as JSON"
+        )
+
+    # Test Case: #TMP-A01
+    def test_add_cat_obj_in_msgpack(self):
+        self.login_with_token(get_valid_token_key())
+        data = {
+            'name': 'Mochi',
+            'gender': 'F',
+            'date_of_birth': '2019-03-01',
+            'description': '',
+            'breed': convert_id_to_hyperlink(vn.BREED_VIEW_DETAIL,
+                                             self.breed),
+            'owner': convert_id_to_hyperlink(vn.HUMAN_VIEW_DETAIL,
+                                             self.owner),
+        }
+        response = self.client.post(
+            reverse(vn.CAT_VIEW_LIST),
+            data=self.msgpack.packb(data),
+            content_type=MSGPACK,
+            HTTP_ACCEPT=MSGPACK,
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_201_CREATED,
+            "#TMP-A01: Add cat object in MessagePack failed"
+        )
+        self.assertEqual(
+            self.msgpack.unpackb(response.content, raw=False)['name'], 'Mochi'
+        )
+
+    # Test Case: #TMP-A02
+    def test_add_invalid_msgpack_content(self):
+        self.login_with_token(get_valid_token_key())
+        response = self.client.post(
+            reverse(vn.CAT_VIEW_LIST),
+            data=b'\xc1',     # Never used byte in MessagePack
+            content_type=MSGPACK,
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST,
+            "#TMP-A02: Invalid MessagePack content is accepted"
+        )
+
+    # Test Case: #TMP-A03
+    def test_obtain_token_in_msgpack(self):
+        User.objects.create_user(username='msgpack', password='msgpack')
+        response = self.client.post(
+            '/catapp/api-token-auth/',
+            data=self.msgpack.packb(
+                {'username': 'msgpack', 'password': 'msgpack'}
+            ),
+            content_type=MSGPACK,
+            HTTP_ACCEPT=MSGPACK,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            'token', self.msgpack.unpackb(response.content, raw=False),
+            "#TMP-A03: Token is not rendered in MessagePack"
+        )
+
+    # Test Case: #TMP-R03
+    def test_render_date_types(self):
+        content = MessagePackRenderer().render(
+            {'date': datetime.date(2020, 12, 1)}
+        )
+        self.assertEqual(
+            self.msgpack.unpackb(content, raw=False), {'date': '2020-12-01'}
+        )
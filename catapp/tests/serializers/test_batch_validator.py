@@ -0,0 +1,107 @@
+import datetime
+
+from django.test import TestCase
+
+from catapp.factories import BreedFactory, HumanFactory
+from catapp.models import Breed, Cat, Human
+from catapp.serializers import CatSerializer
+from catapp.tests.serializers.base import make_request
+from catapp.validators import BatchValidator, PrimaryKeyLookup, SlugLookup
+
+
+class BatchValidatorTests(TestCase):
+    '''
+    Test Case Code Format: #TBV-R00
+
+    Test cases for validating batches of rows column by column
+    '''
+
+    fields = ('name', 'gender', 'date_of_birth', 'description')
+
+    def setUp(self):
+        self.breed = BreedFactory.create(name='Siamese')
+        self.owner = HumanFactory.create()
+        self.tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+
+    # Test Case: #TBV-R01
+    def test_same_errors_as_serializer(self):
+        rows = [
+            {'name': 'Valid', 'gender': 'F', 'date_of_birth': '2019-03-01'},
+            {'name': '*' * 31, 'gender': 'X', 'date_of_birth': 'today'},
+            {'name': '  ', 'gender': '', 'date_of_birth': '2019-02-30'},
+            {'name': None, 'date_of_birth': str(self.tomorrow),
+             'description': '*' * 301},
+            {'gender': 'M', 'date_of_birth': datetime.date(2019, 3, 1)},
+            {'name': ['list'], 'date_of_birth': '2019-3-1',
+             'description': ''},
+        ]
+        values, errors = BatchValidator(Cat, self.fields).validate(rows)
+
+        serializer = CatSerializer(
+            data=rows, many=True, context={'request': make_request()}
+        )
+        serializer.is_valid()
+        expected = [
+            {name: details for name, details in row_errors.items()
+             if name in self.fields}
+            for row_errors in serializer.errors
+        ]
+        self.assertEqual(
+            errors, expected,
+            "#TBV-R01: Errors are not the same as the serializer errors"
+        )
+        for row_errors, row_expected in zip(errors, expected):
+            for name, details in row_errors.items():
+                self.assertEqual(
+                    [detail.code for detail in details],
+                    [detail.code for detail in row_expected[name]],
+                    "#TBV-R01: Error codes are not the same"
+                )
+        self.assertEqual(values[0], {
+            'name': 'Valid', 'gender': 'F',
+            'date_of_birth': datetime.date(2019, 3, 1), 'description': ''
+        })
+
+    # Test Case: #TBV-R02
+    def test_one_query_per_foreign_key(self):
+        rows = [
+            {'breed': self.breed.pk, 'owner': self.owner.pk},
+            {'breed': str(self.breed.pk), 'owner': 0},
+            {'breed': 'x', 'owner': self.owner.pk},
+        ] * 100
+        validator = BatchValidator(Cat, ('breed', 'owner'))
+        with self.assertNumQueries(2):
+            values, errors = validator.validate(rows)
+
+        self.assertEqual(values[0], {'breed_id': self.breed.pk,
+                                     'owner_id': self.owner.pk})
+        self.assertEqual(values[1]['breed_id'], self.breed.pk)
+        self.assertEqual(
+            errors[:3],
+            [{},
+             {'owner': ['Invalid pk "0" - object does not exist.']},
+             {'breed': ['Incorrect type. Expected pk value, received '
+                        'str.']}],
+            "#TBV-R02: Foreign keys are not validated"
+        )
+
+    # Test Case: #TBV-R03
+    def test_lookups_without_database(self):
+        validator = BatchValidator(Cat, ('breed', 'owner'), lookups={
+            'breed': SlugLookup(Breed, 'name', known={'Siamese': 1},
+                                allow_pk=True),
+            'owner': PrimaryKeyLookup(Human, known={2}),
+        })
+        with self.assertNumQueries(0):
+            values, errors = validator.validate([
+                {'breed': 'Siamese', 'owner': 2},
+                {'breed': 1, 'owner': '2'},
+                {'breed': 'Bengal', 'owner': 3},
+            ])
+        self.assertEqual(values[:2], [{'breed_id': 1, 'owner_id': 2}] * 2)
+        self.assertEqual(
+            errors[2],
+            {'breed': ['Object with name=Bengal does not exist.'],
+             'owner': ['Invalid pk "3" - object does not exist.']},
+            "#TBV-R03: Lookups do not use the known values"
+        )
@@ -371,3 +371,20 @@ class BreedSerializerRetrieveTests(BreedSerializerBaseTests):
                 self.sort_hyperlinks(serializer.data),
                 self.obtain_expected_result(self.data, breed_obj, read=True)
             )
+
+    # Test Case: #TBS-R03
+    def test_retrieve_breed_obj_with_prefetched_cats(self):
+        breed_objs = BreedFactory.create_batch(3)
+        for breed_obj in breed_objs:
+            CatFactory.create_batch(3, breed=breed_obj)
+        expected = self.serializer_class(
+            instance=Breed.objects.all(), many=True, context=self.context
+        ).data
+
+        breeds = list(Breed.objects.prefetch_related('cats__owner'))
+        with self.assertNumQueries(0):
+            data = self.serializer_class(
+                instance=breeds, many=True, context=self.context
+            ).data
+        self.assertEqual(data, expected,
+                         "#TBS-R03: Prefetched homes are not the same")
@@ -0,0 +1,84 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from catapp.fast_serializers import (BreedFastSerializer, CatFastSerializer,
+                                     HomeFastSerializer, HumanFastSerializer)
+from catapp.factories import BreedFactory, CatFactory, HomeFactory, HumanFactory
+from catapp.models import Breed, Cat, Home, Human
+from catapp.serializers import (BreedSerializer, CatSerializer,
+                                HomeSerializer, HumanSerializer)
+from catapp.tests.serializers.base import make_request
+
+
+class FastSerializerParityTests(TestCase):
+    '''
+    Test Case Code Format: #TFS-R00
+
+    Test cases for comparing the fast path output against the serializers
+    '''
+
+    def setUp(self):
+        homes = HomeFactory.create_batch(3)
+        humans = [HumanFactory.create(home=homes[i % 2]) for i in range(4)]
+        breeds = BreedFactory.create_batch(3)
+        for i in range(12):
+            CatFactory.create(breed=breeds[i % 2], owner=humans[i % 3])
+        # Human and breed without any cat
+        HumanFactory.create(home=homes[2])
+
+        self.context = {
+            'request': make_request()
+        }
+
+    def assertSameJSON(self, fast_class, serializer_class, queryset, code):
+        fast = fast_class(context=self.context)
+        expected = serializer_class(
+            queryset, many=True, context=self.context
+        ).data
+        result = fast.to_representation(fast.get_rows(queryset))
+        self.assertEqual(
+            JSONRenderer().render(result),
+            JSONRenderer().render(expected),
+            "#TFS-%s: Fast path output differs from %s" % (
+                code, serializer_class.__name__
+            )
+        )
+
+    # Test Case: #TFS-R01
+    def test_home_parity(self):
+        self.assertSameJSON(HomeFastSerializer, HomeSerializer,
+                            Home.objects.all(), 'R01')
+
+    # Test Case: #TFS-R02
+    def test_breed_parity(self):
+        self.assertSameJSON(BreedFastSerializer, BreedSerializer,
+                            Breed.objects.all(), 'R02')
+
+    # Test Case: #TFS-R03
+    def test_human_parity(self):
+        self.assertSameJSON(HumanFastSerializer, HumanSerializer,
+                            Human.objects.all(), 'R03')
+
+    # Test Case: #TFS-R04
+    def test_cat_parity(self):
+        self.assertSameJSON(CatFastSerializer, CatSerializer,
+                            Cat.objects.all(), 'R04')
+
+    # Test Case: #TFS-R05
+    def test_parity_on_filtered_page(self):
+        queryset = Cat.objects.filter(gender='M')[1:4]
+        self.assertSameJSON(CatFastSerializer, CatSerializer,
+                            queryset, 'R05')
+
+    # Test Case: #TFS-R06
+    def test_parity_with_format_suffix(self):
+        self.context['format'] = 'json'
+        self.assertSameJSON(HumanFastSerializer, HumanSerializer,
+                            Human.objects.all(), 'R06')
+
+    # Test Case: #TFS-R07
+    def test_constant_number_of_queries(self):
+        fast = BreedFastSerializer(context=self.context)
+        # One query for the rows, one per collected many field
+        with self.assertNumQueries(3):
+            fast.to_representation(fast.get_rows(Breed.objects.all()))
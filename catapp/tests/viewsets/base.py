@@ -4,14 +4,32 @@ from datetime import timedelta
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework.reverse import reverse
 from rest_framework.authtoken.models import Token
 
+from catapp.seeding import Seeder
+from catapp.tests.base import ViewName as vn
+
 BASE_URL = "http://testserver"
 VALID_USERNAME = "Human 1"
 VALID_EMAIL = "email@testing.com"
 
+# Most queries an anonymous GET of each endpoint may make, whatever the
+# number of rows
+QUERY_BUDGETS = {
+    vn.BREED_VIEW_LIST: 4,
+    vn.BREED_VIEW_DETAIL: 3,
+    vn.CAT_VIEW_LIST: 2,
+    vn.CAT_VIEW_DETAIL: 2,
+    vn.HOME_VIEW_LIST: 2,
+    vn.HOME_VIEW_DETAIL: 1,
+    vn.HUMAN_VIEW_LIST: 3,
+    vn.HUMAN_VIEW_DETAIL: 2,
+}
+
 
 def create_token():
     # Create a valid token
@@ -77,6 +95,8 @@ class BaseTestCase(APITestCase):
             R - Retrieve (GET)
 
     '''
+    # Users and tokens may be in their own database (`AUTH_DATABASE`)
+    databases = '__all__'
 
     def login_with_token(self, token):
         self.client.credentials(HTTP_AUTHORIZATION=token)
@@ -121,3 +141,48 @@ class BaseTestCase(APITestCase):
 
     class Meta:
         abstract = True
+
+
+class QueryBudgetTestCase(BaseTestCase):
+    '''
+    Base Test Case checking the number of queries of the endpoints against
+    `QUERY_BUDGETS`, on seeded datasets of each of `budget_sizes` cats.
+    '''
+
+    budget_sizes = (5, 60)
+
+    def seed(self, size):
+        seeder = Seeder(batch_size=100)
+        seeder.clear()
+        seeder.run(homes=max(1, size // 10), breeds=max(1, size // 5),
+                   humans=max(1, size // 3), cats=size)
+
+    def count_queries(self, url, pk=None, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.retrieve_obj(url, pk=pk, data=data)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertQueryBudget(self, url, get_pk=None, data=None, code=''):
+        """
+        Fail when the number of queries of `url` grows with the number of
+        rows or goes over its budget.
+        """
+        counts = []
+        for size in self.budget_sizes:
+            self.seed(size)
+            pk = get_pk() if get_pk else None
+            counts.append(self.count_queries(url, pk=pk, data=data))
+
+        self.assertEqual(
+            len(set(counts)), 1,
+            "%s: %s makes %s queries for %s cats" % (
+                code, url, counts, self.budget_sizes
+            )
+        )
+        self.assertLessEqual(
+            counts[0], QUERY_BUDGETS[url],
+            "%s: %s makes %d queries, over its budget of %d" % (
+                code, url, counts[0], QUERY_BUDGETS[url]
+            )
+        )
@@ -0,0 +1,170 @@
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from catapp import autocomplete, deletion
+from catapp.factories import BreedFactory, CatFactory, HumanFactory
+from catapp.models import Cat
+from catapp.tests.base import ViewName as vn, convert_id_to_hyperlink
+
+from catapp.tests.viewsets.base import BaseTestCase
+
+CAT_AUTOCOMPLETE_URL = 'catapp:cat-autocomplete'
+BREED_AUTOCOMPLETE_URL = 'catapp:breed-autocomplete'
+
+
+class AutocompleteTestMixin:
+
+    def setUp(self):
+        autocomplete.reset()
+        self.addCleanup(autocomplete.reset)
+        self.breed = BreedFactory.create(name='Siamese')
+        self.owner = HumanFactory.create()
+        self.cats = {
+            name: CatFactory.create(name=name, breed=self.breed,
+                                    owner=self.owner)
+            for name in ('Mochi', 'moka', 'Momo', 'Tofu', 'Ümit')
+        }
+
+    def complete(self, prefix, url=CAT_AUTOCOMPLETE_URL, **params):
+        response = self.client.get(reverse(url), dict(params, q=prefix))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+
+class AutocompleteTests(AutocompleteTestMixin, BaseTestCase):
+    '''
+    Test Case Code Format: #TAC-R00
+
+    Test cases for the prefix autocomplete of the names
+    '''
+
+    # Test Case: #TAC-R01
+    def test_autocomplete_prefix(self):
+        self.assertEqual(
+            self.complete('mo'),
+            [{'url': convert_id_to_hyperlink(vn.CAT_VIEW_DETAIL,
+                                             self.cats[name]),
+              'name': name}
+             for name in ('Mochi', 'moka', 'Momo')],
+            "#TAC-R01: Names are not completed"
+        )
+        self.assertEqual([c['name'] for c in self.complete('ÜM')], ['Ümit'])
+        self.assertEqual(self.complete('x'), [])
+        self.assertEqual(self.complete(' '), [])
+
+    # Test Case: #TAC-R02
+    def test_autocomplete_limit(self):
+        self.assertEqual(len(self.complete('m', limit=2)), 2,
+                         "#TAC-R02: Limit is not applied")
+        with override_settings(AUTOCOMPLETE_LIMIT=1):
+            self.assertEqual(len(self.complete('m')), 1)
+
+    # Test Case: #TAC-R03
+    def test_autocomplete_without_query(self):
+        self.complete('m')
+        with self.assertNumQueries(0):
+            self.complete('mo')
+        self.assertEqual(self.complete('si', url=BREED_AUTOCOMPLETE_URL),
+                         [{'url': convert_id_to_hyperlink(
+                             vn.BREED_VIEW_DETAIL, self.breed),
+                           'name': 'Siamese'}])
+
+    # Test Case: #TAC-R04
+    @override_settings(AUTOCOMPLETE_RELOAD_SECONDS=300)
+    def test_autocomplete_reloaded_in_background(self):
+        self.complete('m')
+        index = autocomplete.get_index(Cat)
+        self.assertIsNone(index.reload_thread,
+                          "#TAC-R04: Index reloaded too early")
+        index.loaded -= 301
+        with mock.patch.object(autocomplete.NameIndex,
+                               'run_reload') as run_reload, \
+                self.assertNumQueries(0):
+            names = [cat['name'] for cat in self.complete('m')]
+        index.reload_thread.join()
+        self.assertTrue(run_reload.called, "#TAC-R04: Index not reloaded")
+        self.assertEqual(names, ['Mochi', 'moka', 'Momo'],
+                         "#TAC-R04: Loaded index not used meanwhile")
+
+    # Test Case: #TAC-R05
+    def test_changes_during_reload_kept(self):
+        index = autocomplete.get_index(Cat)
+        read_names = index.read_names
+
+        def read_names_then_change():
+            names = read_names()
+            # Committed once the names were read
+            index.remove(self.cats['Mochi'].pk)
+            index.add(self.cats['Tofu'].pk, 'Mitsu')
+            return names
+        with mock.patch.object(index, 'read_names',
+                               side_effect=read_names_then_change):
+            index.load()
+        self.assertEqual([cat['name'] for cat in self.complete('m')],
+                         ['Mitsu', 'moka', 'Momo'],
+                         "#TAC-R05: Changes made during the reload lost")
+
+
+class AutocompleteCommitTests(AutocompleteTestMixin, TransactionTestCase):
+    '''
+    Test Case Code Format: #TAC-C00
+
+    Test cases for the index following the committed writes only
+    '''
+    databases = '__all__'
+    client_class = APIClient
+
+    # Test Case: #TAC-C01
+    def test_autocomplete_follows_saves_and_deletes(self):
+        self.complete('m')
+        self.cats['Tofu'].name = 'Mitsu'
+        self.cats['Tofu'].save()
+        self.cats['Mochi'].delete()
+        CatFactory.create(name='Mugi', breed=self.breed, owner=self.owner)
+        self.assertEqual(
+            [cat['name'] for cat in self.complete('m')],
+            ['Mitsu', 'moka', 'Momo', 'Mugi'],
+            "#TAC-C01: Index is not updated"
+        )
+        self.assertEqual(self.complete('tofu'), [])
+
+    # Test Case: #TAC-C02
+    def test_autocomplete_ignores_rollbacks(self):
+        self.complete('m')
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                CatFactory.create(name='Phantom', breed=self.breed,
+                                  owner=self.owner)
+                self.cats['Mochi'].delete()
+                raise IntegrityError
+        self.assertEqual(self.complete('pha'), [],
+                         "#TAC-C02: Rolled back cat completed")
+        self.assertEqual(len(self.complete('mochi')), 1,
+                         "#TAC-C02: Rolled back delete applied")
+
+    # Test Case: #TAC-C03
+    def test_autocomplete_follows_fast_deletes(self):
+        self.complete('m')
+        deletion.fast_delete(self.owner.home)
+        self.assertEqual(self.complete('m'), [],
+                         "#TAC-C03: Deleted cats completed")
+
+    # Test Case: #TAC-C04
+    @override_settings(AUTOCOMPLETE_RELOAD_SECONDS=300)
+    def test_autocomplete_reloaded(self):
+        self.complete('m')
+        # Written by another process
+        Cat.objects.bulk_create([CatFactory.build(
+            name='Mugi', breed=self.breed, owner=self.owner
+        )])
+        index = autocomplete.get_index(Cat)
+        index.loaded -= 301
+        self.complete('m')
+        index.reload_thread.join()
+        self.assertIn('Mugi', [cat['name'] for cat in self.complete('m')],
+                      "#TAC-C04: Index not reloaded")
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from django.test import override_settings
+from rest_framework import status
+
+from catapp import columnar
+from catapp.factories import BreedFactory, CatFactory, HomeFactory
+from catapp.models import Cat, Home
+from catapp.tests.viewsets.base import BaseTestCase
+
+CAT_EXPORT_URL = 'catapp:cat-export'
+HOME_EXPORT_URL = 'catapp:home-export'
+
+
+@override_settings(STREAM_CHUNK_SIZE=2)
+class ExportTests(BaseTestCase):
+    '''
+    Test Case Code Format: #TEX-R00
+
+    Test cases for exporting the objects of a viewset
+    '''
+
+    def setUp(self):
+        self.breed = BreedFactory.create()
+        CatFactory.create_batch(3, breed=self.breed)
+        CatFactory.create_batch(2)
+
+    def export(self, url, data=None):
+        response = self.retrieve_obj(url=url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    # Test Case: #TEX-R01
+    def test_export_cat_obj_as_csv(self):
+        response, content = self.export(CAT_EXPORT_URL)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('filename="cats.csv"', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 5, "#TEX-R01: Not every cat exported")
+        cat_obj = Cat.objects.get(pk=rows[0]['id'])
+        self.assertEqual(
+            rows[0],
+            {
+                'id': str(cat_obj.id),
+                'name': cat_obj.name,
+                'gender': cat_obj.gender,
+                'date_of_birth': str(cat_obj.date_of_birth),
+                'description': cat_obj.description,
+                'breed_id': str(cat_obj.breed_id),
+                'owner_id': str(cat_obj.owner_id),
+            },
+            "#TEX-R01: Exported row is not same as the cat object"
+        )
+
+    # Test Case: #TEX-R02
+    def test_export_cat_obj_as_ndjson(self):
+        response, content = self.export(CAT_EXPORT_URL, {'format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 5, "#TEX-R02: Not every cat exported")
+        cat_obj = Cat.objects.get(pk=rows[0]['id'])
+        self.assertEqual(rows[0]['date_of_birth'],
+                         cat_obj.date_of_birth.isoformat())
+        self.assertEqual(rows[0]['breed_id'], cat_obj.breed_id)
+
+    # Test Case: #TEX-R03
+    def test_export_honours_filter(self):
+        response, content = self.export(
+            CAT_EXPORT_URL, {'format': 'ndjson', 'breed': self.breed.pk}
+        )
+        self.assertEqual(
+            len(content.splitlines()), 3,
+            "#TEX-R03: Export does not honour the filter"
+        )
+
+    # Test Case: #TEX-R04
+    def test_export_honours_search(self):
+        cat_obj = Cat.objects.first()
+        response, content = self.export(
+            CAT_EXPORT_URL, {'format': 'ndjson', 'search': cat_obj.name}
+        )
+        ids = [json.loads(line)['id'] for line in content.splitlines()]
+        self.assertIn(cat_obj.id, ids, "#TEX-R04: Searched cat not exported")
+        self.assertLess(len(ids), 5,
+                        "#TEX-R04: Export does not honour the search")
+
+    # Test Case: #TEX-R05
+    def test_export_home_obj_as_csv(self):
+        HomeFactory.create_batch(2)
+        response, content = self.export(HOME_EXPORT_URL)
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), Home.objects.count())
+        self.assertEqual(list(rows[0].keys()),
+                         ['id', 'name', 'address', 'hometype'])
+
+    # Test Case: #TEX-R06
+    def test_export_error_as_json(self):
+        formats = ['csv', 'ndjson'] + (['arrow'] if columnar.pyarrow else [])
+        for format in formats:
+            response = self.retrieve_obj(
+                url=CAT_EXPORT_URL,
+                data={'format': format, 'description': 'x'}
+            )
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST,
+                             "#TEX-R06: Unsupported filter accepted")
+            if format != 'ndjson':
+                self.assertEqual(response['Content-Type'], 'application/json',
+                                 "#TEX-R06: Error not sent as JSON")
+            self.assertEqual(
+                json.loads(response.content),
+                {'description': ["Filtering on description is not supported."]},
+                "#TEX-R06: Unreadable error"
+            )
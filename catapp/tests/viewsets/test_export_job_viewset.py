@@ -0,0 +1,232 @@
+import csv
+import io
+import os
+import socket
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from catapp import jobs
+from catapp.factories import BreedFactory, CatFactory
+from catapp.models import ExportJob
+
+from catapp.tests.viewsets.base import BaseTestCase, get_valid_token_key
+
+EXPORT_JOB_LIST = 'catapp:exportjob-list'
+EXPORT_JOB_DETAIL = 'catapp:exportjob-detail'
+EXPORT_JOB_DOWNLOAD = 'catapp:exportjob-download'
+
+export_root = tempfile.TemporaryDirectory()
+
+
+@override_settings(EXPORT_JOB_WORKERS=0, EXPORT_JOB_ROOT=export_root.name)
+class ExportJobViewSetTests(BaseTestCase):
+    '''
+    Test Case Code Format: #TJV-X00
+
+    Where
+    =====
+        X:  A - Add (POST)
+            R - Retrieve (GET)
+    '''
+
+    def setUp(self):
+        self.breed = BreedFactory.create()
+        CatFactory.create_batch(3, breed=self.breed)
+        CatFactory.create_batch(2)
+
+    def download(self, job_data):
+        response = self.client.get(job_data['download'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode()
+
+    # Test Case: #TJV-A01
+    def test_add_export_job_with_valid_token(self):
+        response = self.add_obj(
+            url=EXPORT_JOB_LIST,
+            data={'model_name': 'cat', 'format': 'csv'},
+            token=get_valid_token_key(),
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_201_CREATED,
+            "#TJV-A01: Add export job with valid token failed"
+        )
+        data = response.json()
+        self.assertEqual(data['status'], ExportJob.Status.DONE)
+        self.assertEqual(data['num_of_rows'], 5)
+        self.assertNotIn('file', data)
+
+        rows = list(csv.DictReader(io.StringIO(self.download(data))))
+        self.assertEqual(len(rows), 5, "#TJV-A01: Not every cat exported")
+
+    # Test Case: #TJV-A02
+    def test_add_export_job_without_token(self):
+        response = self.add_obj(
+            url=EXPORT_JOB_LIST,
+            data={'model_name': 'cat', 'format': 'csv'},
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_401_UNAUTHORIZED,
+            "#TJV-A02: Able to add export job without token"
+        )
+
+    # Test Case: #TJV-A03
+    def test_add_export_job_with_query(self):
+        response = self.add_obj(
+            url=EXPORT_JOB_LIST,
+            data={'model_name': 'cat', 'format': 'ndjson',
+                  'query': 'breed=%d' % self.breed.pk},
+            token=get_valid_token_key(),
+        )
+        data = response.json()
+        self.assertEqual(
+            data['num_of_rows'], 3,
+            "#TJV-A03: Export job does not honour the query"
+        )
+        self.assertEqual(len(self.download(data).splitlines()), 3)
+
+    # Test Case: #TJV-A04
+    def test_add_export_job_with_invalid_model(self):
+        response = self.add_obj(
+            url=EXPORT_JOB_LIST,
+            data={'model_name': 'dog', 'format': 'csv'},
+            token=get_valid_token_key(),
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # Test Case: #TJV-A05
+    def test_add_export_job_with_invalid_query(self):
+        response = self.add_obj(
+            url=EXPORT_JOB_LIST,
+            data={'model_name': 'cat', 'format': 'csv',
+                  'query': 'description=x'},
+            token=get_valid_token_key(),
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST,
+            "#TJV-A05: Export job with an invalid query accepted"
+        )
+        self.assertEqual(
+            response.json(),
+            {'query': {'description': [
+                "Filtering on description is not supported."
+            ]}},
+            "#TJV-A05: Wrong error"
+        )
+        self.assertFalse(ExportJob.objects.exists(),
+                         "#TJV-A05: Invalid export job created")
+
+    # Test Case: #TJV-R01
+    def test_retrieve_pending_export_job(self):
+        job = ExportJob.objects.create(model_name='cat')
+        response = self.retrieve_obj(url=EXPORT_JOB_DETAIL, pk=job.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['status'], ExportJob.Status.PENDING)
+        self.assertIsNone(response.json()['download'])
+
+        response = self.client.get(reverse(EXPORT_JOB_DOWNLOAD, args=[job.pk]))
+        self.assertEqual(
+            response.status_code, status.HTTP_409_CONFLICT,
+            "#TJV-R01: Able to download a pending export job"
+        )
+
+
+@override_settings(EXPORT_JOB_WORKERS=0, EXPORT_JOB_ROOT=export_root.name,
+                   EXPORT_JOB_EXPIRING_HOURS=24)
+class ExportJobMaintenanceTests(TestCase):
+    '''
+    Test Case Code Format: #TJM-R00
+
+    Test cases for the recovery and the expiry of the export jobs
+    '''
+
+    # Test Case: #TJM-R01
+    def test_orphaned_jobs_resubmitted(self):
+        CatFactory.create_batch(2)
+        host = socket.gethostname()
+        orphaned = [
+            ExportJob.objects.create(model_name='cat', worker=worker,
+                                     status=status_)
+            for worker, status_ in [
+                ('', ExportJob.Status.PENDING),
+                # Out of the range of the pids
+                ('%s:%d' % (host, 2 ** 22 + 1), ExportJob.Status.RUNNING),
+            ]
+        ]
+        alive = [
+            ExportJob.objects.create(model_name='cat', worker=worker)
+            for worker in ['%s:%d' % (host, os.getppid()), 'other-host:1']
+        ]
+
+        with self.assertLogs('catapp.jobs', 'WARNING'):
+            resubmitted = jobs.resubmit_orphaned_jobs()
+        self.assertEqual([job.pk for job in resubmitted],
+                         [job.pk for job in reversed(orphaned)],
+                         "#TJM-R01: Wrong jobs resubmitted")
+        for job in orphaned:
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.num_of_rows),
+                             (ExportJob.Status.DONE, 2),
+                             "#TJM-R01: Orphaned job not written")
+        for job in alive:
+            job.refresh_from_db()
+            self.assertEqual(job.status, ExportJob.Status.PENDING,
+                             "#TJM-R01: Job of a live worker resubmitted")
+
+    # Test Case: #TJM-R02
+    def test_expired_jobs_deleted(self):
+        path = Path(export_root.name) / 'expired.csv'
+        path.write_text('id\n')
+        now = timezone.now()
+        ExportJob.objects.create(
+            model_name='cat', status=ExportJob.Status.DONE, file=str(path),
+            finished=now - timedelta(hours=25)
+        )
+        recent = ExportJob.objects.create(
+            model_name='cat', status=ExportJob.Status.DONE,
+            finished=now - timedelta(hours=23)
+        )
+        self.assertEqual(jobs.delete_expired_jobs(), 1,
+                         "#TJM-R02: Wrong number of jobs deleted")
+        self.assertFalse(path.exists(), "#TJM-R02: File of the job left")
+        self.assertEqual(list(ExportJob.objects.all()), [recent],
+                         "#TJM-R02: Wrong jobs deleted")
+
+
+@override_settings(EXPORT_JOB_WORKERS=1, EXPORT_JOB_ROOT=export_root.name)
+class ExportJobWorkerTests(TransactionTestCase):
+    '''
+    Test Case Code Format: #TJW-R00
+
+    Test cases for writing export jobs in the worker threads
+    '''
+    databases = '__all__'
+    client_class = APIClient
+
+    # Test Case: #TJW-R01
+    def test_export_job_written_by_worker(self):
+        CatFactory.create_batch(4)
+        self.client.credentials(HTTP_AUTHORIZATION=get_valid_token_key())
+        response = self.client.post(
+            reverse(EXPORT_JOB_LIST), {'model_name': 'cat', 'format': 'csv'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        url = response.json()['url']
+        for _ in range(100):
+            data = self.client.get(url).json()
+            if data['status'] == ExportJob.Status.DONE:
+                break
+            time.sleep(0.05)
+        self.assertEqual(
+            data['status'], ExportJob.Status.DONE,
+            "#TJW-R01: Export job is not written by the worker"
+        )
+        self.assertEqual(data['num_of_rows'], 4)
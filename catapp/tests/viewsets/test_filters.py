@@ -0,0 +1,78 @@
+import datetime
+
+from rest_framework import status
+
+from catapp.factories import BreedFactory, CatFactory, HumanFactory
+from catapp.tests.base import ViewName as vn
+
+from catapp.tests.viewsets.base import BaseTestCase
+
+
+class FilterTests(BaseTestCase):
+    '''
+    Test Case Code Format: #TFL-R00
+
+    Test cases for the filters of the list endpoints
+    '''
+
+    def setUp(self):
+        self.breeds = [BreedFactory.create(name=name)
+                       for name in ('Siamese', 'Sphynx', 'Bengal')]
+        owner = HumanFactory.create()
+        for i, (name, gender) in enumerate([('Mochi', 'F'), ('Moka', 'M'),
+                                            ('mori', 'F'), ('Tofu', 'O')]):
+            CatFactory.create(
+                name=name, gender=gender, breed=self.breeds[i % 3],
+                owner=owner, date_of_birth=datetime.date(2015 + i, 1, 1)
+            )
+
+    def filter(self, data, url=vn.CAT_VIEW_LIST):
+        response = self.retrieve_obj(url=url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK,
+                         response.content)
+        return sorted(obj['name'] for obj in response.json()['results'])
+
+    # Test Case: #TFL-R01
+    def test_filter_name_prefix(self):
+        self.assertEqual(self.filter({'name__startswith': 'Mo'}),
+                         ['Mochi', 'Moka'],
+                         "#TFL-R01: Prefix filter failed")
+        self.assertEqual(
+            self.filter({'name__startswith': 'S'}, url=vn.BREED_VIEW_LIST),
+            ['Siamese', 'Sphynx']
+        )
+
+    # Test Case: #TFL-R02
+    def test_filter_date_range(self):
+        self.assertEqual(
+            self.filter({'date_of_birth__gte': '2016-01-01',
+                         'date_of_birth__lt': '2018-01-01'}),
+            ['Moka', 'mori'],
+            "#TFL-R02: Date range filter failed"
+        )
+
+    # Test Case: #TFL-R03
+    def test_filter_in(self):
+        self.assertEqual(self.filter({'gender__in': 'F,O'}),
+                         ['Mochi', 'Tofu', 'mori'],
+                         "#TFL-R03: In filter on choices failed")
+        self.assertEqual(
+            self.filter({'breed__in': '%d,%d' % (self.breeds[1].pk,
+                                                 self.breeds[2].pk)}),
+            ['Moka', 'mori'],
+            "#TFL-R03: In filter on foreign keys failed"
+        )
+
+    # Test Case: #TFL-R04
+    def test_unsupported_filter(self):
+        response = self.retrieve_obj(
+            url=vn.CAT_VIEW_LIST,
+            data={'description': 'x', 'name__icontains': 'o', 'page': 1}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST,
+                         "#TFL-R04: Unsupported filters are not rejected")
+        self.assertEqual(response.json(), {
+            'description': ["Filtering on description is not supported."],
+            'name__icontains': ["Filtering on name__icontains is not "
+                                "supported."],
+        })
@@ -0,0 +1,75 @@
+from django.db.models import Count
+
+from catapp.models import Breed, Cat, Home, Human
+from catapp.tests.base import ViewName as vn
+
+from catapp.tests.viewsets.base import QueryBudgetTestCase
+
+
+def get_most_related_pk(model, related_name):
+    # The object with the most related rows, growing with the dataset
+    return model.objects.annotate(
+        num_of_related=Count(related_name)
+    ).order_by('-num_of_related', 'pk').values_list('pk', flat=True)[0]
+
+
+class QueryBudgetTests(QueryBudgetTestCase):
+    '''
+    Test Case Code Format: #TQB-R00
+
+    Test cases for the number of queries of the list and detail endpoints
+    '''
+
+    # Test Case: #TQB-R01
+    def test_home_list_queries(self):
+        self.assertQueryBudget(vn.HOME_VIEW_LIST, code="#TQB-R01")
+
+    # Test Case: #TQB-R02
+    def test_home_detail_queries(self):
+        self.assertQueryBudget(
+            vn.HOME_VIEW_DETAIL,
+            get_pk=lambda: get_most_related_pk(Home, 'human'),
+            code="#TQB-R02"
+        )
+
+    # Test Case: #TQB-R03
+    def test_breed_list_queries(self):
+        self.assertQueryBudget(vn.BREED_VIEW_LIST, code="#TQB-R03")
+
+    # Test Case: #TQB-R04
+    def test_breed_detail_queries(self):
+        self.assertQueryBudget(
+            vn.BREED_VIEW_DETAIL,
+            get_pk=lambda: get_most_related_pk(Breed, 'cats'),
+            code="#TQB-R04"
+        )
+
+    # Test Case: #TQB-R05
+    def test_human_list_queries(self):
+        self.assertQueryBudget(vn.HUMAN_VIEW_LIST, code="#TQB-R05")
+
+    # Test Case: #TQB-R06
+    def test_human_detail_queries(self):
+        self.assertQueryBudget(
+            vn.HUMAN_VIEW_DETAIL,
+            get_pk=lambda: get_most_related_pk(Human, 'cats'),
+            code="#TQB-R06"
+        )
+
+    # Test Case: #TQB-R07
+    def test_cat_list_queries(self):
+        self.assertQueryBudget(vn.CAT_VIEW_LIST, code="#TQB-R07")
+
+    # Test Case: #TQB-R08
+    def test_cat_detail_queries(self):
+        self.assertQueryBudget(
+            vn.CAT_VIEW_DETAIL,
+            get_pk=lambda: Cat.objects.order_by('pk').values_list(
+                'pk', flat=True)[0],
+            code="#TQB-R08"
+        )
+
+    # Test Case: #TQB-R09
+    def test_filtered_cat_list_queries(self):
+        self.assertQueryBudget(vn.CAT_VIEW_LIST, data={'gender': 'F'},
+                               code="#TQB-R09")
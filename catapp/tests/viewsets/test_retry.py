@@ -0,0 +1,158 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from catapp.database import retry_metrics, retry_on_busy
+from catapp.factories import HomeFactory
+from catapp.models import Home, IdempotencyKey
+from catapp.tests.base import ViewName as vn
+
+from catapp.tests.viewsets.base import BaseTestCase, get_valid_token_key
+
+WRITE_RETRY_METRICS_URL = 'catapp:write-retry-metrics'
+
+
+class RetryOnBusyTests(SimpleTestCase):
+    '''
+    Test Case Code Format: #TRT-S00
+
+    Test cases for the retries of the writes while the database is locked
+    '''
+
+    def setUp(self):
+        retry_metrics.reset()
+
+    def get_write(self, num_of_failures):
+        calls = []
+
+        def write():
+            calls.append(None)
+            if len(calls) <= num_of_failures:
+                raise OperationalError('database is locked')
+            return len(calls)
+        return write
+
+    # Test Case: #TRT-S01
+    @override_settings(WRITE_RETRIES=3)
+    @mock.patch('catapp.database.time.sleep')
+    def test_retry_until_success(self, sleep):
+        self.assertEqual(retry_on_busy(self.get_write(2)), 3,
+                         "#TRT-S01: Write not retried")
+        self.assertEqual(sleep.call_count, 2, "#TRT-S01: No backoff")
+        self.assertEqual(retry_metrics.as_dict(), {
+            'succeeded': {2: 1}, 'failed': {}, 'retries': 2,
+        }, "#TRT-S01: Wrong metrics")
+
+    # Test Case: #TRT-S02
+    @override_settings(WRITE_RETRIES=3, WRITE_RETRY_DELAY=0.1,
+                       WRITE_RETRY_MAX_DELAY=0.3)
+    @mock.patch('catapp.database.time.sleep')
+    def test_bounded_retries(self, sleep):
+        with self.assertRaises(OperationalError,
+                               msg="#TRT-S02: Error not raised"), \
+                self.assertLogs('catapp.database', 'WARNING'):
+            retry_on_busy(self.get_write(10))
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(delays), 3, "#TRT-S02: Wrong number of retries")
+        for delay, max_delay in zip(delays, [0.1, 0.2, 0.3]):
+            self.assertLessEqual(delay, max_delay,
+                                 "#TRT-S02: Backoff over its bound")
+        self.assertEqual(retry_metrics.as_dict()['failed'], {3: 1},
+                         "#TRT-S02: Wrong metrics")
+
+    # Test Case: #TRT-S03
+    @mock.patch('catapp.database.time.sleep')
+    def test_other_errors_not_retried(self, sleep):
+        def write():
+            raise OperationalError('no such table: catapp_cat')
+        with self.assertRaises(OperationalError,
+                               msg="#TRT-S03: Error not raised"):
+            retry_on_busy(write)
+        self.assertFalse(sleep.called, "#TRT-S03: Error retried")
+
+
+class RetryWriteTests(BaseTestCase):
+    '''
+    Test Case Code Format: #TRT-A00
+
+    Test cases for the writes of the viewsets retried or replayed
+    '''
+
+    def setUp(self):
+        self.token = get_valid_token_key()
+        self.data = {'name': 'Home', 'address': 'Cat Street',
+                     'hometype': 'landed'}
+
+    def post_with_key(self, key):
+        self.login_with_token(self.token)
+        return self.client.post(reverse(vn.HOME_VIEW_LIST), self.data,
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    # Test Case: #TRT-A01
+    def test_busy_database(self):
+        with mock.patch('catapp.api.HomeViewSet.perform_create',
+                        side_effect=OperationalError('database is locked')), \
+                self.assertLogs('catapp.database', 'WARNING'):
+            response = self.add_obj(vn.HOME_VIEW_LIST, self.data,
+                                    token=self.token)
+        self.assertEqual(response.status_code,
+                         status.HTTP_503_SERVICE_UNAVAILABLE,
+                         "#TRT-A01: Busy database not answered with 503")
+        self.assertEqual(response['Retry-After'], '1',
+                         "#TRT-A01: No Retry-After header")
+
+    # Test Case: #TRT-A02
+    def test_idempotency_key_replayed(self):
+        first = self.post_with_key('key-1')
+        second = self.post_with_key('key-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED,
+                         "#TRT-A02: %s" % first.content)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED,
+                         "#TRT-A02: Wrong status code of the replay")
+        self.assertEqual(second.json(), first.json(),
+                         "#TRT-A02: Wrong response of the replay")
+        self.assertEqual(second['Idempotent-Replayed'], 'true',
+                         "#TRT-A02: Replay not flagged")
+        self.assertEqual(Home.objects.count(), 1,
+                         "#TRT-A02: Write run twice")
+
+        self.post_with_key('key-2')
+        self.assertEqual(Home.objects.count(), 2,
+                         "#TRT-A02: Write with another key not run")
+
+    # Test Case: #TRT-A03
+    def test_idempotency_key_of_another_request(self):
+        home = HomeFactory.create()
+        self.post_with_key('key-1')
+        self.login_with_token(self.token)
+        response = self.client.delete(
+            reverse(vn.HOME_VIEW_DETAIL, args=[home.pk]),
+            HTTP_IDEMPOTENCY_KEY='key-1'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST,
+                         "#TRT-A03: Key reused for another request")
+        self.assertEqual(IdempotencyKey.objects.count(), 1,
+                         "#TRT-A03: Wrong number of stored keys")
+
+    # Test Case: #TRT-A04
+    def test_metrics_for_staff(self):
+        retry_metrics.reset()
+        self.addCleanup(retry_metrics.reset)
+        retry_metrics.record(2, True)
+        url = reverse(WRITE_RETRY_METRICS_URL)
+        self.login_with_token(self.token)
+        self.assertEqual(self.client.get(url).status_code,
+                         status.HTTP_403_FORBIDDEN,
+                         "#TRT-A04: Metrics shown to a user not staff")
+
+        User.objects.update(is_staff=True)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK,
+                         "#TRT-A04: Metrics not shown to the staff")
+        self.assertEqual(response.json(), {
+            'succeeded': {'2': 1}, 'failed': {}, 'retries': 2,
+        }, "#TRT-A04: Wrong metrics")
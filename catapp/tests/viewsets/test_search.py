@@ -0,0 +1,83 @@
+from unittest import mock
+
+from rest_framework import status
+
+from catapp.factories import BreedFactory, CatFactory, HumanFactory
+from catapp.models import Cat
+from catapp.tests.base import ViewName as vn
+
+from catapp.tests.viewsets.base import BaseTestCase
+
+
+class SearchTests(BaseTestCase):
+    '''
+    Test Case Code Format: #TSR-R00
+
+    Test cases for the full-text search of the list endpoints
+    '''
+
+    def setUp(self):
+        breed = BreedFactory.create(name='Siamese')
+        owner = HumanFactory.create()
+        self.mochi = CatFactory.create(
+            name='Mochi', breed=breed, owner=owner,
+            description='Likes to sleep in the sun.'
+        )
+        self.moka = CatFactory.create(
+            name='Moka', breed=breed, owner=owner,
+            description='Mochi mochi mochi, all day long.'
+        )
+        self.tofu = CatFactory.create(
+            name='Tofu', breed=breed, owner=owner,
+            description='Sleeps all day.'
+        )
+
+    def search(self, term, url=vn.CAT_VIEW_LIST):
+        response = self.retrieve_obj(url=url, data={'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [obj['name'] for obj in response.json()['results']]
+
+    # Test Case: #TSR-R01
+    def test_search_by_prefix(self):
+        self.assertEqual(sorted(self.search('mo')), ['Mochi', 'Moka'],
+                         "#TSR-R01: Prefix search failed")
+        self.assertEqual(self.search('tof'), ['Tofu'])
+
+    # Test Case: #TSR-R02
+    def test_search_description_ranked(self):
+        self.assertEqual(
+            self.search('mochi'), ['Moka', 'Mochi'],
+            "#TSR-R02: Results are not ordered by their rank"
+        )
+
+    # Test Case: #TSR-R03
+    def test_search_every_term(self):
+        self.assertEqual(self.search('sleep day'), ['Tofu'],
+                         "#TSR-R03: Every term should match")
+        self.assertEqual(sorted(self.search('"sle')), ['Mochi', 'Tofu'])
+        self.assertEqual(self.search('AND OR'), [])
+
+    # Test Case: #TSR-R04
+    def test_search_index_in_sync(self):
+        self.tofu.name = 'Natto'
+        self.tofu.save()
+        self.mochi.delete()
+        Cat.objects.bulk_create([
+            Cat(name='Nori', breed=self.tofu.breed, owner=self.tofu.owner,
+                date_of_birth='2019-01-01')
+        ])
+        self.assertEqual(sorted(self.search('n')), ['Natto', 'Nori'],
+                         "#TSR-R04: Search index is out of sync")
+        self.assertEqual(self.search('mo'), ['Moka'])
+
+    # Test Case: #TSR-R05
+    def test_search_other_models(self):
+        self.assertEqual(self.search('siam', url=vn.BREED_VIEW_LIST),
+                         ['Siamese'], "#TSR-R05: Breed search failed")
+
+    # Test Case: #TSR-R06
+    @mock.patch('catapp.search.has_fts_table', return_value=False)
+    def test_search_without_fts_table(self, has_fts_table):
+        self.assertEqual(sorted(self.search('mo')), ['Mochi', 'Moka'],
+                         "#TSR-R06: Search does not fall back to LIKE")
+        self.assertTrue(has_fts_table.called)
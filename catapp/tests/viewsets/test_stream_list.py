@@ -0,0 +1,96 @@
+import json
+from unittest import skipUnless
+
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from catapp.factories import BreedFactory, CatFactory, HumanFactory
+from catapp.models import Breed, Cat
+from catapp.renderers import msgpack
+from catapp.serializers import BreedSerializer, CatSerializer
+from catapp.tests.base import ViewName as vn
+from catapp.tests.serializers.base import make_request
+
+from catapp.tests.viewsets.base import BaseTestCase
+
+
+@override_settings(STREAM_CHUNK_SIZE=3)
+class StreamListTests(BaseTestCase):
+    '''
+    Test Case Code Format: #TSL-R00
+
+    Test cases for streaming the list endpoints as one JSON array
+    '''
+
+    def setUp(self):
+        breeds = BreedFactory.create_batch(4)
+        owners = HumanFactory.create_batch(3)
+        for i in range(10):
+            CatFactory.create(breed=breeds[i % 4], owner=owners[i % 3])
+        self.context = {
+            'request': make_request()
+        }
+
+    def retrieve_stream(self, url, data=None):
+        data = dict(data or {}, stream='true')
+        response = self.retrieve_obj(url=url, data=data)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        return response, json.loads(content.decode())
+
+    # Test Case: #TSL-R01
+    def test_stream_all_cat_obj(self):
+        response, data = self.retrieve_stream(vn.CAT_VIEW_LIST)
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK,
+            "#TSL-R01: Stream cat objects failed"
+        )
+        expected = CatSerializer(
+            Cat.objects.all(), many=True, context=self.context
+        ).data
+        self.assertEqual(
+            data, json.loads(json.dumps(expected)),
+            "#TSL-R01: Streamed data is not same as the serialized data"
+        )
+
+    # Test Case: #TSL-R02
+    def test_stream_all_breed_obj(self):
+        response, data = self.retrieve_stream(vn.BREED_VIEW_LIST)
+        expected = BreedSerializer(
+            Breed.objects.all(), many=True, context=self.context
+        ).data
+        self.assertEqual(
+            data, json.loads(json.dumps(expected)),
+            "#TSL-R02: Streamed data is not same as the serialized data"
+        )
+
+    # Test Case: #TSL-R03
+    def test_stream_filtered_cat_obj(self):
+        response, data = self.retrieve_stream(
+            vn.CAT_VIEW_LIST, data={'gender': 'M'}
+        )
+        self.assertEqual(
+            len(data), Cat.objects.filter(gender='M').count(),
+            "#TSL-R03: Streamed data does not honour the filters"
+        )
+
+    # Test Case: #TSL-R04
+    def test_stream_empty_list(self):
+        Cat.objects.all().delete()
+        response, data = self.retrieve_stream(vn.CAT_VIEW_LIST)
+        self.assertEqual(data, [], "#TSL-R04: Empty stream is not a list")
+
+    # Test Case: #TSL-R05
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_stream_only_json(self):
+        response = self.client.get(
+            reverse(vn.CAT_VIEW_LIST), data={'stream': 'true'},
+            HTTP_ACCEPT='application/msgpack'
+        )
+        self.assertFalse(response.streaming,
+                         "#TSL-R05: MessagePack response streamed")
+        self.assertEqual(response['Content-Type'], 'application/msgpack',
+                         "#TSL-R05: Content negotiation ignored")
+        self.assertEqual(msgpack.unpackb(response.content)['count'], 10,
+                         "#TSL-R05: Paginated list not returned")
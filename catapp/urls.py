@@ -8,11 +8,14 @@ app_name = 'catapp'
 router = DefaultRouter()
 router.register(r'breeds', api.BreedViewSet)
 router.register(r'cats', api.CatViewSet)
+router.register(r'export-jobs', api.ExportJobViewSet)
 router.register(r'homes', api.HomeViewSet)
 router.register(r'humans', api.HumanViewSet)
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('api/metrics/write-retries/', api.WriteRetryMetricsView.as_view(),
+         name='write-retry-metrics'),
     path('', views.index, name='index'),
     path('breeds', views.breeds, name='breeds'),
     path('cats', views.cats, name='cats'),
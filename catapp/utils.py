@@ -0,0 +1,11 @@
+from itertools import islice
+
+
+def iter_chunks(iterable, size):
+    # Split an iterable into lists of `size` items
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
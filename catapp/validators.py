@@ -0,0 +1,295 @@
+"""
+Batch validation of rows for bulk writes.
+
+`BatchValidator` checks a whole batch of rows column by column instead of
+running a serializer per row: lengths and choices are checked over the
+column, dates are parsed once per distinct value and compared against a
+single "today", and foreign keys are resolved with one `IN` query per
+column. The errors have the shape of `ListSerializer.errors`, one dict of
+`ErrorDetail` lists per row.
+"""
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import relations, serializers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.fields import get_error_detail
+
+from catapp.models import date_in_past
+
+# Largest number of parameters of one query on every SQLite version
+MAX_QUERY_PARAMS = 999
+
+MESSAGES = {
+    'required': serializers.Field.default_error_messages['required'],
+    'null': serializers.Field.default_error_messages['null'],
+    'blank': serializers.CharField.default_error_messages['blank'],
+    'max_length': serializers.CharField.default_error_messages['max_length'],
+    'invalid_choice':
+        serializers.ChoiceField.default_error_messages['invalid_choice'],
+    'invalid_date': serializers.DateField.default_error_messages['invalid'],
+    'does_not_exist':
+        relations.PrimaryKeyRelatedField.default_error_messages[
+            'does_not_exist'],
+    'incorrect_type':
+        relations.PrimaryKeyRelatedField.default_error_messages[
+            'incorrect_type'],
+    'slug_does_not_exist':
+        relations.SlugRelatedField.default_error_messages['does_not_exist'],
+    'invalid_string': serializers.CharField.default_error_messages['invalid'],
+}
+
+# Codes of the errors that do not share their name with the message
+CODES = {
+    'invalid_date': 'invalid',
+    'invalid_string': 'invalid',
+    'slug_does_not_exist': 'does_not_exist',
+}
+
+
+def error(key, **kwargs):
+    return ErrorDetail(
+        str(MESSAGES[key]).format(**kwargs), code=CODES.get(key, key)
+    )
+
+
+class PrimaryKeyLookup:
+    """
+    Resolve the values of a foreign key column given as primary keys.
+
+    The existing pks are looked up with one `IN` query, unless the set of
+    `known` pks is given (e.g. in a worker process without database).
+    """
+
+    def __init__(self, model, known=None):
+        self.model = model
+        self.known = known
+
+    def existing(self, pks):
+        if self.known is not None:
+            return {pk for pk in pks if pk in self.known}
+        pks = list(pks)
+        found = set()
+        for start in range(0, len(pks), MAX_QUERY_PARAMS):
+            found.update(self.model.objects.filter(
+                pk__in=pks[start:start + MAX_QUERY_PARAMS]
+            ).values_list('pk', flat=True))
+        return found
+
+    def resolve(self, values):
+        """
+        Return the pk of each resolved value and the error of the others.
+        """
+        resolved, errors, pks = {}, {}, {}
+        for value in values:
+            try:
+                pks[value] = int(value)
+            except (TypeError, ValueError):
+                errors[value] = error(
+                    'incorrect_type', data_type=type(value).__name__
+                )
+        existing = self.existing(set(pks.values()))
+        for value, pk in pks.items():
+            if pk in existing:
+                resolved[value] = pk
+            else:
+                errors[value] = error('does_not_exist', pk_value=value)
+        return resolved, errors
+
+
+class SlugLookup(PrimaryKeyLookup):
+    """
+    Resolve the values of a foreign key column given by a unique slug
+    field (or, when `allow_pk` is set, by their primary keys), with `known`
+    an optional {slug: pk} map.
+    """
+
+    def __init__(self, model, slug_field, known=None, allow_pk=False):
+        super().__init__(model)
+        self.slug_field = slug_field
+        self.known_slugs = known
+        self.allow_pk = allow_pk
+        if known is not None:
+            self.known = set(known.values())
+
+    def resolve(self, values):
+        values = {str(value) for value in values}
+        if self.known_slugs is not None:
+            slugs = {v: self.known_slugs[v] for v in values
+                     if v in self.known_slugs}
+        else:
+            slugs = dict(self.model.objects.filter(**{
+                self.slug_field + '__in': values
+            }).values_list(self.slug_field, 'pk'))
+
+        resolved, errors = dict(slugs), {}
+        missing = values - set(slugs)
+        if self.allow_pk and missing:
+            resolved.update(super().resolve(missing)[0])
+        for value in values - set(resolved):
+            errors[value] = error(
+                'slug_does_not_exist', slug_name=self.slug_field, value=value
+            )
+        return resolved, errors
+
+
+class BatchValidator:
+    """
+    Validate batches of rows (dicts of raw values) for `fields` of `model`.
+
+    `lookups` maps the foreign keys among `fields` to the lookup resolving
+    their values (`PrimaryKeyLookup` by default). The cleaned value of a
+    foreign key is stored as `<field>_id`.
+    """
+
+    def __init__(self, model, fields, lookups=None):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in fields]
+        self.lookups = dict(lookups or {})
+        for field in self.fields:
+            if field.is_relation and field.name not in self.lookups:
+                self.lookups[field.name] = PrimaryKeyLookup(
+                    field.related_model
+                )
+
+    def validate(self, rows):
+        """
+        Return the cleaned values and the errors of every row.
+        """
+        self.today = timezone.now().date()
+        values = [{} for _ in rows]
+        errors = [{} for _ in rows]
+        for field in self.fields:
+            column = [row.get(field.name, serializers.empty) for row in rows]
+            cleaned, column_errors = self.validate_column(field, column)
+            name = field.attname
+            for index, value in cleaned.items():
+                values[index][name] = value
+            for index, detail in column_errors.items():
+                errors[index][field.name] = [detail]
+        return values, errors
+
+    def validate_column(self, field, column):
+        """
+        Return the cleaned values and the errors of `column`, both keyed by
+        row index.
+        """
+        cleaned, errors = {}, {}
+        present = []
+        for index, value in enumerate(column):
+            if value is serializers.empty:
+                if field.has_default():
+                    cleaned[index] = field.get_default()
+                elif field.blank:
+                    cleaned[index] = ''
+                else:
+                    errors[index] = error('required')
+            elif value is None:
+                if field.null:
+                    cleaned[index] = None
+                else:
+                    errors[index] = error('null')
+            elif isinstance(value, (list, dict)):
+                errors[index] = self.invalid_type(field, value)
+            else:
+                present.append(index)
+
+        if field.is_relation:
+            check = self.check_related
+        elif field.get_internal_type() == 'DateField':
+            check = self.check_dates
+        else:
+            check = self.check_strings
+        column_cleaned, column_errors = check(
+            field, {index: column[index] for index in present}
+        )
+        cleaned.update(column_cleaned)
+        errors.update(column_errors)
+        return cleaned, errors
+
+    def invalid_type(self, field, value):
+        if field.is_relation:
+            return error('incorrect_type', data_type=type(value).__name__)
+        if field.get_internal_type() == 'DateField':
+            return error('invalid_date', format='YYYY-MM-DD')
+        return error('invalid_string')
+
+    def check_strings(self, field, column):
+        cleaned, errors = {}, {}
+        choices = {str(key) for key, label in field.choices or ()}
+        max_length = None if choices else field.max_length
+        for index, value in column.items():
+            value = str(value)
+            if choices:
+                if value not in choices:
+                    errors[index] = error('invalid_choice', input=value)
+                    continue
+            else:
+                value = value.strip()
+                if not value and not field.blank:
+                    errors[index] = error('blank')
+                    continue
+            if max_length is not None and len(value) > max_length:
+                errors[index] = error('max_length', max_length=max_length)
+                continue
+            cleaned[index] = value
+        return cleaned, errors
+
+    def check_dates(self, field, column):
+        # Each distinct value is parsed and validated only once
+        dates = {}
+        for value in set(column.values()):
+            dates[value] = self.clean_date(field, value)
+
+        cleaned, errors = {}, {}
+        for index, value in column.items():
+            date, detail = dates[value]
+            if detail is None:
+                cleaned[index] = date
+            else:
+                errors[index] = detail
+        return cleaned, errors
+
+    def clean_date(self, field, value):
+        if isinstance(value, datetime.date):
+            date = value
+        else:
+            try:
+                date = parse_date(str(value))
+            except ValueError:
+                date = None
+            if date is None:
+                return None, error('invalid_date', format='YYYY-MM-DD')
+
+        for validator in field.validators:
+            # `date_in_past` is checked against the "today" of the batch
+            # instead of calling `timezone.now()` for every value
+            if validator is date_in_past:
+                if date > self.today:
+                    return None, ErrorDetail(
+                        "Date of birth should be in the past, which is "
+                        "before %s." % self.today,
+                        code='invalid'
+                    )
+                continue
+            try:
+                validator(date)
+            except ValidationError as exc:
+                return None, get_error_detail(exc)[0]
+        return date, None
+
+    def check_related(self, field, column):
+        resolved, lookup_errors = self.lookups[field.name].resolve(
+            set(column.values())
+        )
+        cleaned, errors = {}, {}
+        for index, value in column.items():
+            key = value if value in resolved or value in lookup_errors \
+                else str(value)
+            if key in resolved:
+                cleaned[index] = resolved[key]
+            else:
+                errors[index] = lookup_errors[key]
+        return cleaned, errors
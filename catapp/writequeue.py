@@ -0,0 +1,164 @@
+"""
+Single writer of the API writes.
+
+With `WRITE_QUEUE_ENABLED`, the writes of the viewsets (see
+`QueuedWriteMixin`) are not run by the request threads but handed over to
+one writer thread per process. The writer runs the queued writes in group
+commits: up to `WRITE_QUEUE_BATCH_SIZE` writes in one transaction, each
+in its own savepoint so a failing write is rolled back alone and its
+exception raised in its request thread. The transaction is run under an
+exclusive lock on `WRITE_QUEUE_LOCK_FILE`, so the writers of several
+processes take turns instead of retrying on "database is locked".
+
+The queue is disabled by default; a write is then run inline, as it is
+when the caller is already in a transaction (its write has to be part of
+that transaction).
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock on `path` shared by the processes (only within
+    the process without `fcntl`).
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class Writer(threading.Thread):
+    """
+    Thread running the queued writes in group commits.
+    """
+
+    def __init__(self, batch_size, lock_path):
+        super().__init__(name='write-queue', daemon=True)
+        self.batch_size = batch_size
+        self.lock_path = lock_path
+        self.queue = queue.Queue()
+        self.num_of_batches = 0
+        self.num_of_writes = 0
+
+    def submit(self, func):
+        future = Future()
+        self.queue.put((func, future))
+        return future
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+    def get_batch(self):
+        """
+        Wait for a write and return it with the writes queued after it,
+        or None once stopped.
+        """
+        item = self.queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Stop once the writes queued before are run
+                self.queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def run(self):
+        try:
+            while True:
+                batch = self.get_batch()
+                if batch is None:
+                    return
+                self.run_batch([
+                    (func, future) for func, future in batch
+                    if future.set_running_or_notify_cancel()
+                ])
+                connection.close_if_unusable_or_obsolete()
+        finally:
+            connection.close()
+
+    def run_batch(self, batch):
+        results = []
+        try:
+            with file_lock(self.lock_path), transaction.atomic():
+                for func, future in batch:
+                    try:
+                        with transaction.atomic():
+                            results.append((future, func(), None))
+                    except Exception as exc:
+                        results.append((future, None, exc))
+        except Exception as exc:
+            logger.exception("Group commit of %d writes failed", len(batch))
+            for func, future in batch:
+                future.set_exception(exc)
+            return
+
+        self.num_of_batches += 1
+        self.num_of_writes += len(batch)
+        for future, result, exc in results:
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = Writer(settings.WRITE_QUEUE_BATCH_SIZE,
+                             settings.WRITE_QUEUE_LOCK_FILE)
+            _writer.start()
+        return _writer
+
+
+def shutdown():
+    """
+    Stop the writer thread once the queued writes are run.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.stop()
+            _writer = None
+
+
+def execute(func):
+    """
+    Run `func` (writing to the default database) through the writer and
+    return its result, or raise its exception, once committed.
+    """
+    if not settings.WRITE_QUEUE_ENABLED or connection.in_atomic_block:
+        return func()
+    return get_writer().submit(func).result()